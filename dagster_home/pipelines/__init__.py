@@ -3,6 +3,13 @@ Inspector Dom Pipeline Loader
 
 This module dynamically loads all deployed pipeline files from this directory.
 When you deploy a pipeline in Inspector Dom, it creates a .py file here.
+
+Deployed pipelines share the extraction components (dagster_pipelines/components),
+including the pooled clients resource.
+
+Asset specs are cached in .asset_manifest.json keyed by each file's SHA-256
+and the environment variables it reads: unchanged files are not imported when the code location loads, and their
+modules are imported only when one of their assets is executed.
 """
 
 import importlib
@@ -10,12 +17,23 @@ import sys
 from pathlib import Path
 from dagster import Definitions, load_assets_from_modules
 
-# Get all Python files in this directory (except __init__.py)
+# Make the shared components importable from deployed pipelines
 pipeline_dir = Path(__file__).parent
+components_dir = pipeline_dir.parent.parent / "dagster_pipelines"
+if str(components_dir) not in sys.path:
+    sys.path.insert(0, str(components_dir))
+
+from components.resources import ClientsResource
+from components.asset_manifest import AssetManifest, build_lazy_asset, describe_module_assets, module_cache_key
+
+MANIFEST_PATH = pipeline_dir / ".asset_manifest.json"
+
+# Get all Python files in this directory (except __init__.py)
 pipeline_files = [f for f in pipeline_dir.glob("*.py") if f.name != "__init__.py"]
 
 # Collect all assets from deployed pipelines
 all_assets = []
+manifest = AssetManifest(MANIFEST_PATH)
 
 if not pipeline_files:
     print("🔔 No pipelines deployed yet!")
@@ -27,6 +45,16 @@ else:
         module_name = f"pipelines.{pipeline_file.stem}"
 
         try:
+            cache_key = module_cache_key(pipeline_file)
+
+            # Unchanged file (and environment): rebuild its assets from the manifest without importing it
+            specs = manifest.get(pipeline_file.name, cache_key)
+            if specs is not None:
+                assets = [build_lazy_asset(spec) for spec in specs]
+                all_assets.extend(assets)
+                print(f"   ✓ {pipeline_file.name} - Loaded {len(assets)} asset(s) from manifest")
+                continue
+
             # Import the pipeline module
             if module_name in sys.modules:
                 # Reload if already imported
@@ -37,13 +65,20 @@ else:
             # Load all assets from the module
             assets = load_assets_from_modules([module])
             all_assets.extend(assets)
+            manifest.put(pipeline_file.name, cache_key, describe_module_assets(module, assets))
 
             print(f"   ✓ {pipeline_file.name} - Loaded {len(assets)} asset(s)")
 
         except Exception as e:
             print(f"   ✗ {pipeline_file.name} - Failed to load: {e}")
 
+manifest.prune([f.name for f in pipeline_files])
+manifest.save()
+
 # Create Definitions with all loaded assets
 definitions = Definitions(
     assets=all_assets,
+    resources={
+        "clients": ClientsResource(),
+    },
 )
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: Textract table grid reconstruction
+
+Compares the legacy parse_textract_tables (string concatenation per word,
+two max() passes, one string object per cell) with the current one (typed
+lookups, words joined once, repeated cell strings shared) on a synthetic
+NABCA-sized document:
+- parse throughput (blocks/s)
+- parse + record extraction through extract_table_data_multi_entity
+  (the path extract_nabca_document takes)
+- memory retained by the parsed tables
+
+Usage (from dagster_pipelines/):
+    python benchmarks/bench_parse_textract_tables.py --pages 200 --rows 60 --cols 12
+"""
+
+import sys
+import argparse
+import json
+import importlib.util
+import logging
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any
+
+PIPELINES_DIR = Path(__file__).resolve().parent.parent
+PIPELINE_PATH = PIPELINES_DIR.parent / 'dagster_home' / 'pipelines' / 'nabca_all_tables_v1.py'
+
+# The NABCA module imports components.resources from dagster_pipelines/
+sys.path.insert(0, str(PIPELINES_DIR))
+
+
+def load_pipeline_module():
+    """Load the deployed NABCA module by path (skips the code-location loader)."""
+    spec = importlib.util.spec_from_file_location('nabca_all_tables_v1', PIPELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_parse_textract_tables(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """parse_textract_tables as it was before words were joined once and strings shared."""
+    tables = []
+    block_map = {b['Id']: b for b in blocks if 'Id' in b}
+    table_blocks = [b for b in blocks if b.get('BlockType') == 'TABLE']
+
+    for table_block in table_blocks:
+        page_number = table_block.get('Page', 0)
+        cell_blocks = []
+        if 'Relationships' in table_block:
+            for rel in table_block['Relationships']:
+                if rel['Type'] == 'CHILD':
+                    for cell_id in rel['Ids']:
+                        cell_block = block_map.get(cell_id)
+                        if cell_block and cell_block.get('BlockType') == 'CELL':
+                            cell_blocks.append(cell_block)
+
+        if not cell_blocks:
+            continue
+
+        max_row = max(c.get('RowIndex', 0) for c in cell_blocks)
+        max_col = max(c.get('ColumnIndex', 0) for c in cell_blocks)
+        grid = [['' for _ in range(max_col)] for _ in range(max_row)]
+
+        for cell in cell_blocks:
+            row = cell.get('RowIndex', 1) - 1
+            col = cell.get('ColumnIndex', 1) - 1
+            cell_text = ''
+            if 'Relationships' in cell:
+                for rel in cell['Relationships']:
+                    if rel['Type'] == 'CHILD':
+                        for word_id in rel['Ids']:
+                            word_block = block_map.get(word_id)
+                            if word_block and word_block.get('BlockType') == 'WORD':
+                                cell_text += word_block.get('Text', '') + ' '
+            grid[row][col] = cell_text.strip()
+
+        tables.append({'data': grid, 'page': page_number})
+
+    return tables
+
+
+def synthetic_blocks(pages: int, rows: int, cols: int, seed: int = 7) -> List[List[Dict[str, Any]]]:
+    """One list of blocks per page, each page holding one table."""
+    rng = random.Random(seed)
+    classes = ['VODKA', 'RUM', 'TEQUILA', 'BOURBON', 'TOTAL', 'CORDIALS & LIQUEURS']
+    next_id = 0
+    document = []
+
+    for page in range(1, pages + 1):
+        blocks = []
+        cell_ids = []
+        for r in range(1, rows + 1):
+            for c in range(1, cols + 1):
+                if c == 1:
+                    words = rng.choice(classes).split()
+                elif rng.random() < 0.1:
+                    words = []
+                else:
+                    words = [f"{rng.randint(0, 99999):,}"]
+
+                word_ids = []
+                for word in words:
+                    next_id += 1
+                    blocks.append({'Id': f"w{next_id}", 'BlockType': 'WORD', 'Text': word, 'Page': page})
+                    word_ids.append(f"w{next_id}")
+
+                next_id += 1
+                cell = {'Id': f"c{next_id}", 'BlockType': 'CELL', 'RowIndex': r, 'ColumnIndex': c, 'Page': page}
+                if word_ids:
+                    cell['Relationships'] = [{'Type': 'CHILD', 'Ids': word_ids}]
+                blocks.append(cell)
+                cell_ids.append(cell['Id'])
+
+        next_id += 1
+        blocks.append({'Id': f"t{next_id}", 'BlockType': 'TABLE', 'Page': page,
+                       'Relationships': [{'Type': 'CHILD', 'Ids': cell_ids}]})
+        document.append(blocks)
+
+    return document
+
+
+class BenchContext:
+    """Stand-in for the asset context (only .log is used)."""
+    log = logging.getLogger('bench')
+
+
+def synthetic_pattern(cols: int) -> Dict[str, Any]:
+    """Identified-pattern shape for the synthetic tables (header row 0, class + numbers)."""
+    fields = [{'name': 'class', 'type': 'TEXT'}]
+    fields += [{'name': f"value_{c}", 'type': 'NUMBER'} for c in range(2, cols + 1)]
+    return {'entityName': 'bench', 'tableName': 'bench', 'headerRowIndex': 0, 'fieldSchema': fields}
+
+
+def parse_and_extract(parse, nabca, pattern):
+    """Parse a page, then extract records from every table (positional mapping)."""
+    artifact = {'id': 'bench'}
+
+    def run(page_blocks):
+        return [
+            nabca.extract_table_data_multi_entity(table['data'], pattern, '1', '2025', artifact, BenchContext)
+            for table in parse(page_blocks)
+        ]
+    return run
+
+
+def bench(label: str, fn, document, repeat: int) -> float:
+    block_count = sum(len(page) for page in document)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page_blocks in document:
+            fn(page_blocks)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{label:<40} {best * 1000:9.1f} ms   {block_count / best / 1e6:6.2f} M blocks/s")
+    return best
+
+
+def retained_bytes(fn, document) -> int:
+    """
+    Memory still held by the parsed tables of every page.
+
+    Each page is decoded from JSON inside the measurement and dropped after
+    parsing, as extract_nabca_document does, so cell strings that reuse a
+    WORD block's text are counted once the blocks are gone.
+    """
+    pages = [json.dumps(page_blocks) for page_blocks in document]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [fn(json.loads(page)) for page in pages]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Textract table reconstruction')
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=60)
+    parser.add_argument('--cols', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    nabca = load_pipeline_module()
+    document = synthetic_blocks(args.pages, args.rows, args.cols)
+
+    # Same output before timing anything
+    for page_blocks in document[:5]:
+        assert nabca.parse_textract_tables(page_blocks) == legacy_parse_textract_tables(page_blocks)
+
+    print(f"{args.pages} pages x {args.rows}x{args.cols} cells, {sum(len(p) for p in document):,} blocks")
+    legacy = bench('legacy parse_textract_tables', legacy_parse_textract_tables, document, args.repeat)
+    current = bench('parse_textract_tables', nabca.parse_textract_tables, document, args.repeat)
+    print(f"parse speedup: {legacy / current:.2f}x")
+
+    pattern = synthetic_pattern(args.cols)
+    legacy_records = parse_and_extract(legacy_parse_textract_tables, nabca, pattern)
+    current_records = parse_and_extract(nabca.parse_textract_tables, nabca, pattern)
+
+    legacy_total = bench('legacy parse + extract', legacy_records, document, args.repeat)
+    current_total = bench('parse + extract', current_records, document, args.repeat)
+    print(f"parse + extract speedup: {legacy_total / current_total:.2f}x")
+
+    legacy_bytes = retained_bytes(legacy_parse_textract_tables, document)
+    current_bytes = retained_bytes(nabca.parse_textract_tables, document)
+    print(f"retained tables: legacy {legacy_bytes / 1e6:.1f} MB, current {current_bytes / 1e6:.1f} MB "
+          f"({legacy_bytes / current_bytes:.1f}x smaller)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+CLI Cold-Start Import Benchmark
+
+Measures what run_extraction.py imports before it can start a run, using
+`python -X importtime` in a fresh interpreter, and fails when:
+- the median import time exceeds the budget, or
+- a module the CLI must not import (e.g. dagster) shows up
+
+Usage (from dagster_pipelines/):
+    python benchmarks/cli_import_time.py
+    python benchmarks/cli_import_time.py --artifact-type html --budget-ms 1500
+    CLI_IMPORT_BUDGET_MS=800 python benchmarks/cli_import_time.py --runs 10
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PIPELINES_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGET_MS = 1000
+DEFAULT_RUNS = 5
+
+# Heavy modules the CLI path must never import
+FORBIDDEN_MODULES = ('dagster',)
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def measure(artifact_type: str) -> Tuple[float, Dict[str, int], List[str]]:
+    """
+    Import run_extraction and resolve one extractor in a fresh interpreter
+
+    Returns:
+        tuple: (total ms, {module: cumulative us}, imported module names)
+    """
+    code = f"import run_extraction; run_extraction.get_extractor_class({artifact_type!r})"
+
+    # No Supabase credentials: the module-level client is not created
+    env = {k: v for k, v in os.environ.items() if not k.startswith('NEXT_PUBLIC_SUPABASE')}
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PIPELINES_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"CLI import failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, module = match.groups()
+        cumulative[module] = int(cumulative_us)
+        if not indent:
+            # Top-level imports; nested ones are included in their parent
+            total_us += int(cumulative_us)
+
+    return total_us / 1000, cumulative, list(cumulative)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check run_extraction.py cold-start import time against a budget')
+    parser.add_argument('--artifact-type', default='csv', help='Extractor resolved after import (default csv)')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('CLI_IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)), help='Median import time budget')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='Fresh interpreters to measure')
+    parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to show')
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(max(1, args.runs)):
+        total_ms, cumulative, modules = measure(args.artifact_type)
+        timings.append(total_ms)
+
+    median_ms = statistics.median(timings)
+    print(f"run_extraction cold start ({args.artifact_type}): median {median_ms:.0f} ms "
+          f"over {len(timings)} runs (min {min(timings):.0f}, max {max(timings):.0f}), budget {args.budget_ms:.0f} ms")
+
+    print("Slowest imports (last run, cumulative):")
+    for module, us in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {module}")
+
+    failures = []
+    forbidden = sorted({
+        module for module in modules
+        if any(module == name or module.startswith(name + '.') for name in FORBIDDEN_MODULES)
+    })
+    if forbidden:
+        failures.append(f"CLI imports forbidden modules: {', '.join(forbidden[:5])}")
+    if median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""
+AI Extraction Result Cache
+
+Persistent cache in front of the AI extraction API:
+- Key: SHA-256 of the normalized document plus a hash of the template's
+  fields, prompt and selectors (editing the template invalidates its entries)
+- Backends: local SQLite file (default) or Postgres table
+  ai_extraction_cache (DATABASE_URL)
+- Entries expire after a TTL; least recently used entries are evicted
+  beyond a size cap
+- Hit/miss counters for run statistics
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Any, Optional
+
+DEFAULT_AI_CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+DEFAULT_AI_CACHE_MAX_ENTRIES = 50000
+
+
+def normalize_content(content: str) -> str:
+    """Normalize line endings and trailing whitespace so cosmetic changes still hit"""
+    lines = content.replace('\r\n', '\n').replace('\r', '\n').strip().split('\n')
+    return '\n'.join(line.rstrip() for line in lines)
+
+
+def template_fingerprint(template: Dict[str, Any], endpoint: str) -> str:
+    """Hash of everything in a template that affects AI extraction output"""
+    relevant = {
+        'endpoint': endpoint,
+        'fields': template.get('fields'),
+        'prompt': template.get('prompt'),
+        'selectors': template.get('selectors'),
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cache_key(content: str, fingerprint: str) -> str:
+    digest = hashlib.sha256(normalize_content(content).encode('utf-8')).hexdigest()
+    return f"{fingerprint[:16]}:{digest}"
+
+
+class AIResultCache:
+    """Cache of AI extraction records, backed by SQLite or Postgres"""
+
+    def __init__(
+        self,
+        backend: str = 'sqlite',
+        path: Optional[str] = None,
+        dsn: Optional[str] = None,
+        ttl_seconds: int = DEFAULT_AI_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_AI_CACHE_MAX_ENTRIES,
+        logger=None,
+    ):
+        """
+        Args:
+            backend: 'sqlite' or 'postgres'
+            path: SQLite file (defaults to AI_CACHE_PATH, then $DAGSTER_HOME/ai_extraction_cache.sqlite)
+            dsn: Postgres connection string (defaults to DATABASE_URL)
+            ttl_seconds: Entries older than this are ignored and evicted
+            max_entries: Size cap enforced by evict()
+            logger: Logger for cache messages (optional)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+
+        if backend == 'postgres':
+            self._store = _PostgresStore(dsn or os.getenv('DATABASE_URL'))
+        elif backend == 'sqlite':
+            self._store = _SQLiteStore(path or os.getenv('AI_CACHE_PATH') or os.path.join(
+                os.getenv('DAGSTER_HOME', '.'), 'ai_extraction_cache.sqlite'
+            ))
+        else:
+            raise ValueError(f"Unknown AI cache backend: {backend}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        record = self._store.get(key, time.time() - self.ttl_seconds)
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]):
+        self._store.put(key, record)
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to max_entries; returns rows removed"""
+        removed = self._store.evict(time.time() - self.ttl_seconds, self.max_entries)
+        if removed and self.logger:
+            self.logger.info(f"AI cache evicted {removed} entries")
+        return removed
+
+    def close(self):
+        try:
+            self.evict()
+        finally:
+            self._store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'ai_cache_hits': self.hits,
+            'ai_cache_misses': self.misses,
+            'ai_cache_hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class _SQLiteStore:
+    def __init__(self, path: str):
+        import sqlite3
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_extraction_cache ("
+            " key TEXT PRIMARY KEY, record TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, min_created_at: float) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT record FROM ai_extraction_cache WHERE key = ? AND created_at >= ?",
+            (key, min_created_at)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._conn.execute("UPDATE ai_extraction_cache SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, record: Dict[str, Any]):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ai_extraction_cache (key, record, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(record, default=str), now, now)
+        )
+        self._conn.commit()
+
+    def evict(self, min_created_at: float, max_entries: int) -> int:
+        expired = self._conn.execute(
+            "DELETE FROM ai_extraction_cache WHERE created_at < ?", (min_created_at,)
+        ).rowcount
+        trimmed = self._conn.execute(
+            "DELETE FROM ai_extraction_cache WHERE key IN ("
+            " SELECT key FROM ai_extraction_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+            (max_entries,)
+        ).rowcount
+        self._conn.commit()
+        return expired + trimmed
+
+    def close(self):
+        self._conn.close()
+
+
+class _PostgresStore:
+    def __init__(self, dsn: Optional[str]):
+        if not dsn:
+            raise ValueError("Missing DATABASE_URL for Postgres AI cache")
+
+        import psycopg
+
+        self._conn = psycopg.connect(dsn, autocommit=True)
+
+    def get(self, key: str, min_created_at: float) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "UPDATE ai_extraction_cache SET last_used_at = NOW()"
+            " WHERE key = %s AND created_at >= to_timestamp(%s) RETURNING record",
+            (key, min_created_at)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, record: Dict[str, Any]):
+        from psycopg.types.json import Jsonb
+
+        self._conn.execute(
+            "INSERT INTO ai_extraction_cache (key, record) VALUES (%s, %s)"
+            " ON CONFLICT (key) DO UPDATE SET record = EXCLUDED.record,"
+            " created_at = NOW(), last_used_at = NOW()",
+            (key, Jsonb(record))
+        )
+
+    def evict(self, min_created_at: float, max_entries: int) -> int:
+        expired = self._conn.execute(
+            "DELETE FROM ai_extraction_cache WHERE created_at < to_timestamp(%s)", (min_created_at,)
+        ).rowcount
+        trimmed = self._conn.execute(
+            "DELETE FROM ai_extraction_cache WHERE key IN ("
+            " SELECT key FROM ai_extraction_cache ORDER BY last_used_at DESC OFFSET %s)",
+            (max_entries,)
+        ).rowcount
+        return expired + trimmed
+
+    def close(self):
+        self._conn.close()
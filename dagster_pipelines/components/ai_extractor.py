@@ -0,0 +1,303 @@
+"""
+AI Extractor Base Class
+
+Shared base for components that call the Next.js AI extraction API
+(/api/extract/*-ai). Documents are extracted concurrently:
+- One keep-alive httpx.AsyncClient for the whole run
+- At most `ai_max_in_flight` requests in flight at once
+- Per-request deadline (`ai_request_timeout` seconds)
+- Results come back in input order; a failed document is reported as an error
+  (not marked processed, so it is retried on the next run)
+- Successful results are cached by document + template hash (see AIResultCache);
+  `ai_cache` selects 'sqlite' (default), 'postgres' or 'off'
+- Subclasses can fill fields locally first (rule_extract); the API is then
+  only asked for the fields still missing
+"""
+
+import asyncio
+import sys
+from itertools import islice
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+from abc import abstractmethod
+from .base_extractor import BaseExtractor
+from .ai_cache import AIResultCache, cache_key, template_fingerprint, DEFAULT_AI_CACHE_TTL_SECONDS, DEFAULT_AI_CACHE_MAX_ENTRIES
+
+# Next.js app serving the AI extraction routes
+DEFAULT_AI_API_URL = 'http://localhost:3000'
+
+# Concurrency / deadline defaults (overridable per run via config)
+DEFAULT_AI_MAX_IN_FLIGHT = 4
+DEFAULT_AI_REQUEST_TIMEOUT = 180  # 3 minutes for AI extraction
+
+# Documents submitted per window, as a multiple of ai_max_in_flight
+AI_WINDOW_FACTOR = 4
+
+
+class AIExtractor(BaseExtractor):
+    """Base class for extractors backed by the AI extraction API"""
+
+    # API route, e.g. '/api/extract/html-ai'
+    ai_endpoint: str = ''
+
+    # Used in log lines ("AI extracted 5/8 fields from email")
+    ai_label: str = 'document'
+
+    # Payload key holding the document text (hashed for the result cache)
+    ai_content_key: str = ''
+
+    _ai_loop: Optional[asyncio.AbstractEventLoop] = None
+    _ai_client = None
+    _ai_cache: Optional[AIResultCache] = None
+    _ai_cache_disabled = False
+    _ai_cache_stats: Optional[Dict[str, Any]] = None
+
+    @abstractmethod
+    def ai_payload(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON request body for one artifact"""
+        pass
+
+    def rule_extract(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Fill what can be filled without AI
+
+        Returns:
+            tuple: (record with locally extracted values,
+                    payload for the remaining fields, or None if nothing is left)
+        """
+        return {}, payload
+
+    def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Extract data from one artifact using AI
+
+        Returns:
+            List of records (one record per document)
+
+        Raises:
+            Exception: if the AI call failed, so the document is not marked processed
+        """
+        result = self._extract_window([artifact])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def extract_many(self, artifacts: Iterator[Dict[str, Any]], lazy: bool = False) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Extract artifacts concurrently, yielding (artifact, records, error) in input order
+
+        Artifacts are read in windows so only a bounded number of documents
+        is held in memory while their requests are in flight. Records are
+        always lists (one response per document), so `lazy` has no effect.
+        A failed API call is yielded as an error, even when local rules
+        filled some fields, so the document is retried on the next run.
+        """
+        window_size = self._ai_max_in_flight() * AI_WINDOW_FACTOR
+        artifacts = iter(artifacts)
+
+        while True:
+            window = list(islice(artifacts, window_size))
+            if not window:
+                return
+
+            payloads = []
+            for artifact in window:
+                try:
+                    payloads.append(self.ai_payload(artifact))
+                except Exception as e:
+                    payloads.append(e)
+
+            results = self._post_window(payloads, [a.get('filename', 'unknown') for a in window])
+
+            for artifact, result in zip(window, results):
+                if isinstance(result, Exception):
+                    yield artifact, [], result
+                else:
+                    yield artifact, result, None
+
+    def run(self) -> Dict[str, Any]:
+        try:
+            result = super().run()
+        finally:
+            self._close_ai_client()
+        return self._with_ai_stats(result)
+
+    def run_streaming(self) -> Dict[str, Any]:
+        try:
+            result = super().run_streaming()
+        finally:
+            self._close_ai_client()
+        return self._with_ai_stats(result)
+
+    def ai_run_stats(self) -> Dict[str, Any]:
+        """Extra statistics added to the run result (subclass hook)"""
+        return {}
+
+    def _with_ai_stats(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if self._ai_cache_stats:
+            result.update(self._ai_cache_stats)
+        result.update(self.ai_run_stats())
+        return result
+
+    def _get_ai_cache(self) -> Optional[AIResultCache]:
+        """Open the result cache on first use (None if disabled or unavailable)"""
+        if self._ai_cache is None and not self._ai_cache_disabled:
+            backend = self.config.get('ai_cache') or 'sqlite'
+            if backend == 'off':
+                self._ai_cache_disabled = True
+                return None
+
+            try:
+                self._ai_cache = AIResultCache(
+                    backend=backend,
+                    ttl_seconds=int(self.config.get('ai_cache_ttl_seconds') or DEFAULT_AI_CACHE_TTL_SECONDS),
+                    max_entries=int(self.config.get('ai_cache_max_entries') or DEFAULT_AI_CACHE_MAX_ENTRIES),
+                    logger=self.logger,
+                )
+            except Exception as e:
+                self.logger.warning(f"AI result cache unavailable, calling the API for every document: {e}")
+                self._ai_cache_disabled = True
+
+        return self._ai_cache
+
+    def _ai_max_in_flight(self) -> int:
+        return max(1, int(self.config.get('ai_max_in_flight') or DEFAULT_AI_MAX_IN_FLIGHT))
+
+    def _extract_window(self, artifacts: List[Dict[str, Any]]) -> List[Union[List[Dict[str, Any]], Exception]]:
+        payloads = [self.ai_payload(artifact) for artifact in artifacts]
+        return self._post_window(payloads, [a.get('filename', 'unknown') for a in artifacts])
+
+    def _post_window(self, payloads: List[Any], filenames: List[str]) -> List[Union[List[Dict[str, Any]], Exception]]:
+        """
+        Resolve one window: local rules first, then cached results, then the
+        API for the rest
+
+        Returns one entry per payload: the records, or the exception if the
+        payload could not be built or the API call failed.
+        """
+        results: List[Union[List[Dict[str, Any]], Exception]] = [[] for _ in payloads]
+        prefilled: List[Dict[str, Any]] = [{} for _ in payloads]
+        keys: List[Optional[str]] = [None] * len(payloads)
+        to_send = []
+
+        for idx, payload in enumerate(payloads):
+            if isinstance(payload, Exception):
+                results[idx] = payload
+                continue
+
+            prefilled[idx], payload = self.rule_extract(payload)
+            if payload is None:
+                results[idx] = [prefilled[idx]]
+                continue
+            payloads[idx] = payload
+
+            cache = self._get_ai_cache()
+            if cache is not None:
+                fingerprint = template_fingerprint(payload.get('template') or self.template, self.ai_endpoint)
+                keys[idx] = cache_key(payload[self.ai_content_key] or '', fingerprint)
+                cached = cache.get(keys[idx])
+                if cached is not None:
+                    results[idx] = [self._merge_record(cached, prefilled[idx])]
+                    continue
+
+            to_send.append(idx)
+
+        if not to_send:
+            return results
+
+        # One event loop per run, so the client's keep-alive connections survive between windows
+        if self._ai_loop is None:
+            self._ai_loop = asyncio.new_event_loop()
+
+        records = self._ai_loop.run_until_complete(self._post_all(
+            [payloads[idx] for idx in to_send],
+            [filenames[idx] for idx in to_send],
+        ))
+
+        cache = self._get_ai_cache()
+        for idx, record in zip(to_send, records):
+            if isinstance(record, Exception):
+                # Not merged with the rule values: a partial row would be
+                # loaded and the document never retried
+                results[idx] = record
+                continue
+
+            results[idx] = [self._merge_record(record, prefilled[idx])]
+            if cache is not None:
+                cache.put(keys[idx], record)
+
+        return results
+
+    def _merge_record(self, ai_record: Dict[str, Any], prefilled: Dict[str, Any]) -> Dict[str, Any]:
+        """AI values for the missing fields, rule values for the rest"""
+        if not prefilled:
+            return ai_record
+        merged = dict(ai_record)
+        merged.update((k, v) for k, v in prefilled.items() if v is not None)
+        return merged
+
+    async def _post_all(self, payloads: List[Dict[str, Any]], filenames: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        import httpx
+
+        max_in_flight = self._ai_max_in_flight()
+        timeout = float(self.config.get('ai_request_timeout') or DEFAULT_AI_REQUEST_TIMEOUT)
+
+        if self._ai_client is None:
+            self._ai_client = httpx.AsyncClient(
+                base_url=self.config.get('ai_api_url') or DEFAULT_AI_API_URL,
+                timeout=httpx.Timeout(timeout, connect=10.0),
+                limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+            )
+
+        client = self._ai_client
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def post(payload: Dict[str, Any], filename: str) -> Union[Dict[str, Any], Exception]:
+            async with semaphore:
+                print(f"Calling AI {self.ai_label} extraction for file: {filename}", file=sys.stderr, flush=True)
+                try:
+                    # Hard deadline per request, including time spent waiting for a connection
+                    response = await asyncio.wait_for(client.post(self.ai_endpoint, json=payload), timeout)
+                    return self._ai_record(response)
+                except Exception as e:
+                    print(f"❌ Error calling AI {self.ai_label} extraction API: {e!r}", file=sys.stderr, flush=True)
+                    return e
+
+        # gather() keeps results in input order
+        return await asyncio.gather(*(post(p, f) for p, f in zip(payloads, filenames)))
+
+    def _close_ai_client(self):
+        if self._ai_cache is not None:
+            self._ai_cache_stats = self._ai_cache.stats()
+            try:
+                self._ai_cache.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close AI result cache: {e}")
+            self._ai_cache = None
+
+        if self._ai_loop is None:
+            return
+
+        if self._ai_client is not None:
+            self._ai_loop.run_until_complete(self._ai_client.aclose())
+            self._ai_client = None
+
+        self._ai_loop.close()
+        self._ai_loop = None
+
+    def _ai_record(self, response) -> Dict[str, Any]:
+        """Turn an API response into a record (raises RuntimeError on failure)"""
+        if response.status_code != 200:
+            raise RuntimeError(f"AI {self.ai_label} extraction failed ({response.status_code}): {response.text}")
+
+        result = response.json()
+
+        if not result.get('success'):
+            raise RuntimeError(f"AI {self.ai_label} extraction failed: {result.get('error')}")
+
+        record = result.get('data', {})
+        fields_with_values = result.get('fieldsWithValues', 0)
+        total_fields = result.get('fieldsExtracted', 0)
+
+        print(f"✅ AI extracted {fields_with_values}/{total_fields} fields from {self.ai_label}", file=sys.stderr, flush=True)
+
+        return record
@@ -0,0 +1,274 @@
+"""
+Deployed Pipeline Asset Manifest
+
+Lets the dagster_home/pipelines code location load without importing every
+deployed module:
+- Each module's asset specs (key, description, partitions, retry policy,
+  resources, ...) are cached in a JSON manifest keyed by the file's SHA-256
+  and the environment variables the file reads (e.g. a partition start month
+  from os.getenv changes the specs without changing the file)
+- Unchanged modules are rebuilt from the manifest as lazy assets whose compute
+  function imports the real module only when the asset is executed
+- Modules with anything the manifest cannot describe are always imported
+"""
+
+import os
+import re
+import json
+import inspect
+import hashlib
+import importlib
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+from dagster import (
+    asset,
+    AssetKey,
+    AssetsDefinition,
+    RetryPolicy,
+    StaticPartitionsDefinition,
+    TimeWindowPartitionsDefinition,
+    __version__ as dagster_version,
+)
+
+# Bump when the spec format changes; entries from other versions are ignored
+MANIFEST_VERSION = 2
+COMPUTE_KIND_TAG = 'dagster/compute_kind'
+
+# os.getenv("X") / os.environ["X"] / os.environ.get("X") with a literal name
+_ENV_NAME_RE = re.compile(r'''os\.(?:getenv\(|environ\.get\(|environ\[)\s*['"]([A-Za-z_][A-Za-z0-9_]*)['"]''')
+
+_compute_fns: Dict[tuple, Callable] = {}
+_compute_fns_lock = threading.Lock()
+
+
+def module_cache_key(path: Path) -> str:
+    """
+    Manifest key for a pipeline file: its SHA-256 plus the current values of
+    the environment variables it reads (values are hashed, never stored)
+    """
+    source = Path(path).read_bytes()
+    names = sorted(set(_ENV_NAME_RE.findall(source.decode('utf-8', errors='replace'))))
+
+    digest = hashlib.sha256(source)
+    digest.update(json.dumps([(name, os.environ.get(name)) for name in names]).encode())
+    return digest.hexdigest()
+
+
+class AssetManifest:
+    """JSON manifest of asset specs per deployed pipeline file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._files: Dict[str, Any] = {}
+        self._dirty = False
+
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get('version') == MANIFEST_VERSION and data.get('dagster_version') == dagster_version:
+                self._files = data.get('files') or {}
+        except (OSError, ValueError):
+            pass
+
+    def get(self, filename: str, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached specs for a file, or None if missing or the file or its environment changed"""
+        entry = self._files.get(filename)
+        if entry and entry.get('cache_key') == cache_key:
+            return entry['assets']
+        return None
+
+    def put(self, filename: str, cache_key: str, specs: Optional[List[Dict[str, Any]]]):
+        """Store specs for a file (None drops its entry, e.g. not describable)"""
+        if specs is None:
+            self._dirty |= self._files.pop(filename, None) is not None
+        else:
+            self._files[filename] = {'cache_key': cache_key, 'assets': specs}
+            self._dirty = True
+
+    def prune(self, filenames: List[str]):
+        """Drop entries for files that are no longer deployed"""
+        for filename in set(self._files) - set(filenames):
+            del self._files[filename]
+            self._dirty = True
+
+    def save(self):
+        """Write atomically (webserver and daemon may load at the same time)"""
+        if not self._dirty:
+            return
+
+        data = {'version': MANIFEST_VERSION, 'dagster_version': dagster_version, 'files': self._files}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"   ⚠️  Could not write asset manifest: {e}")
+
+
+def describe_module_assets(module, assets: List[AssetsDefinition]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Manifest specs for a module's assets
+
+    Returns:
+        One spec per asset, or None if any asset cannot be rebuilt lazily
+        (multi-assets, asset inputs, custom partitions, non-JSON metadata, ...)
+    """
+    # load_assets_from_modules returns copies, so match module attributes by key
+    attributes = {
+        value.key: name for name, value in vars(module).items()
+        if isinstance(value, AssetsDefinition) and len(value.keys) == 1
+    }
+
+    specs = []
+    for assets_def in assets:
+        attribute = attributes.get(assets_def.key) if len(assets_def.keys) == 1 else None
+        spec = _describe_asset(assets_def) if attribute else None
+        if spec is None:
+            return None
+        spec['module'] = module.__name__
+        spec['attribute'] = attribute
+        specs.append(spec)
+
+    try:
+        json.dumps(specs)
+    except (TypeError, ValueError):
+        return None
+    return specs
+
+
+def _describe_asset(assets_def: AssetsDefinition) -> Optional[Dict[str, Any]]:
+    if len(assets_def.keys) != 1 or assets_def.keys_by_input_name:
+        return None
+
+    asset_spec = next(iter(assets_def.specs))
+    if asset_spec.automation_condition is not None or asset_spec.skippable:
+        return None
+    if getattr(asset_spec, 'freshness_policy', None) is not None or getattr(asset_spec, 'legacy_freshness_policy', None) is not None:
+        return None
+
+    partitions = _describe_partitions(assets_def.partitions_def)
+    retry_policy = _describe_retry_policy(assets_def.op.retry_policy)
+    if partitions is False or retry_policy is False:
+        return None
+
+    # Parameters other than context are Pythonic resources (no asset inputs)
+    has_context = assets_def.op.compute_fn.has_context_arg()
+    params = list(inspect.signature(assets_def.op.compute_fn.decorated_fn).parameters)
+    resource_params = params[1:] if has_context else params
+
+    op_tags = dict(assets_def.op.tags or {})
+    compute_kind = op_tags.pop(COMPUTE_KIND_TAG, None)
+
+    return {
+        'key': list(asset_spec.key.path),
+        'description': asset_spec.description,
+        'group_name': asset_spec.group_name,
+        'metadata': dict(asset_spec.metadata or {}),
+        'tags': dict(asset_spec.tags or {}),
+        'owners': list(asset_spec.owners or []),
+        'code_version': asset_spec.code_version,
+        'deps': [list(dep.asset_key.path) for dep in asset_spec.deps],
+        'compute_kind': compute_kind,
+        'op_tags': op_tags,
+        'partitions': partitions,
+        'retry_policy': retry_policy,
+        'has_context': has_context,
+        'resource_params': resource_params,
+    }
+
+
+def _describe_partitions(partitions_def):
+    """JSON form of a partitions definition, None if unpartitioned, False if unsupported"""
+    if partitions_def is None:
+        return None
+
+    if isinstance(partitions_def, TimeWindowPartitionsDefinition):
+        return {
+            'type': 'time_window',
+            'start': partitions_def.start.timestamp(),
+            'end': partitions_def.end.timestamp() if partitions_def.end else None,
+            'timezone': partitions_def.timezone,
+            'fmt': partitions_def.fmt,
+            'end_offset': partitions_def.end_offset,
+            'cron_schedule': partitions_def.cron_schedule,
+        }
+
+    if isinstance(partitions_def, StaticPartitionsDefinition):
+        return {'type': 'static', 'keys': list(partitions_def.get_partition_keys())}
+
+    return False
+
+
+def _build_partitions(partitions: Optional[Dict[str, Any]]):
+    if partitions is None:
+        return None
+
+    if partitions['type'] == 'static':
+        return StaticPartitionsDefinition(partitions['keys'])
+
+    def to_datetime(timestamp):
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+
+    return TimeWindowPartitionsDefinition(
+        start=to_datetime(partitions['start']),
+        end=to_datetime(partitions['end']),
+        timezone=partitions['timezone'],
+        fmt=partitions['fmt'],
+        end_offset=partitions['end_offset'],
+        cron_schedule=partitions['cron_schedule'],
+    )
+
+
+def _describe_retry_policy(retry_policy):
+    """JSON form of a retry policy, None if absent, False if unsupported (backoff/jitter)"""
+    if retry_policy is None:
+        return None
+    if retry_policy.backoff is not None or retry_policy.jitter is not None:
+        return False
+    return {'max_retries': retry_policy.max_retries, 'delay': retry_policy.delay}
+
+
+def _load_compute_fn(module_name: str, attribute: str) -> Callable:
+    """Import a deployed module on first execution and return the asset's function"""
+    cache_key = (module_name, attribute)
+    compute_fn = _compute_fns.get(cache_key)
+    if compute_fn is None:
+        with _compute_fns_lock:
+            compute_fn = _compute_fns.get(cache_key)
+            if compute_fn is None:
+                assets_def = getattr(importlib.import_module(module_name), attribute)
+                compute_fn = _compute_fns[cache_key] = assets_def.op.compute_fn.decorated_fn
+    return compute_fn
+
+
+def build_lazy_asset(spec: Dict[str, Any]) -> AssetsDefinition:
+    """Asset with the cached spec whose body imports the real module when executed"""
+    module_name = spec['module']
+    attribute = spec['attribute']
+    resource_params = spec['resource_params']
+    has_context = spec['has_context']
+    retry_policy = spec['retry_policy']
+
+    @asset(
+        key=AssetKey(spec['key']),
+        description=spec['description'],
+        group_name=spec['group_name'],
+        metadata=spec['metadata'] or None,
+        tags=spec['tags'] or None,
+        owners=spec['owners'] or None,
+        code_version=spec['code_version'],
+        deps=[AssetKey(path) for path in spec['deps']] or None,
+        compute_kind=spec['compute_kind'],
+        op_tags=spec['op_tags'] or None,
+        partitions_def=_build_partitions(spec['partitions']),
+        retry_policy=RetryPolicy(**retry_policy) if retry_policy else None,
+        required_resource_keys=set(resource_params),
+    )
+    def _lazy_asset(context):
+        compute_fn = _load_compute_fn(module_name, attribute)
+        resources = {name: getattr(context.resources, name) for name in resource_params}
+        return compute_fn(context, **resources) if has_context else compute_fn(**resources)
+
+    return _lazy_asset
@@ -3,23 +3,52 @@ Base Extractor Class
 
 Abstract base class for all extraction components.
 Provides common functionality:
-- Supabase connection
+- Supabase connection (shared, pooled clients; ClientsResource under Dagster)
 - Artifact fetching (from S3 or Supabase Storage)
-- GraphQL data loading
+  - S3 listings are paginated and objects are downloaded concurrently
+    (or opened lazily for extractors that parse the body incrementally)
+  - Artifacts table is read in keyset-paginated, column-projected pages
+- Incremental runs: items already in the extraction ledger are skipped
+- GraphQL data loading (or Postgres COPY when DATABASE_URL is set)
 - Error handling
+- Streaming mode: fetch → extract → load as generator stages
 """
 
-import os
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from abc import ABC, abstractmethod
-from supabase import create_client, Client
-import boto3
-from dagster import get_dagster_logger
+from supabase import Client
+from .clients import ClientAccessors, SharedClients
+from .logger import get_logger
+from .pg_loader import PostgresCopyLoader, copy_loader_available
+from .ledger import ExtractionLedger, ledger_entry
+from .streams import DEFAULT_SPOOL_MAX_BYTES, RecordSpool
+
+# S3 fetch defaults (overridable per run via config)
+DEFAULT_S3_MAX_CONCURRENCY = 8
+DEFAULT_S3_MAX_OBJECT_BYTES = 512 * 1024 * 1024  # 512 MB
+S3_LIST_PAGE_SIZE = 1000
+
+# Rows per artifacts-table page (manual uploads)
+DEFAULT_ARTIFACT_PAGE_SIZE = 100
+
+# Records per load batch
+DEFAULT_LOAD_BATCH_SIZE = 1000
 
 class BaseExtractor(ABC):
     """Base class for all extraction components"""
 
-    def __init__(self, config: Dict[str, Any]):
+    # Columns read from the artifacts table for manual uploads.
+    # Subclasses narrow or extend this to what extract() actually uses.
+    artifact_columns: List[str] = ['id', 'source_id', 'original_filename', 'updated_at', 'raw_content']
+
+    # Subclasses that parse S3 bodies incrementally set this: objects are then
+    # yielded with an 'open_body' callable instead of downloaded 'content',
+    # and s3_max_object_bytes does not apply.
+    stream_s3_bodies: bool = False
+
+    def __init__(self, config: Dict[str, Any], clients: Optional[ClientAccessors] = None):
         """
         Initialize extractor with configuration
 
@@ -28,21 +57,28 @@ class BaseExtractor(ABC):
                 - entity_id: Target entity ID
                 - template_id: Template with extraction rules
                 - source_id: Source to fetch data from
+                - s3_max_concurrency: (optional) Parallel S3 downloads
+                - s3_max_object_bytes: (optional) Skip S3 objects larger than this
+                - streaming: (optional) Load records batch by batch while extracting
+                - load_batch_size: (optional) Records per load batch
+                - artifact_spool_bytes: (optional) Buffered records per artifact before spilling to disk
+                - artifact_page_size: (optional) Rows per artifacts-table page
+                - loader: (optional) 'auto' (default), 'copy' or 'postgrest'
+                - full_refresh: (optional) Reprocess items already in the extraction ledger
+            clients: ClientsResource or SharedClients (defaults to process-wide clients)
         """
         self.config = config
         self.entity_id = config['entity_id']
         self.template_id = config['template_id']
         self.source_id = config['source_id']
-        self.logger = get_dagster_logger()
-
-        # Initialize Supabase client
-        supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        self.logger = get_logger()
 
-        if not supabase_url or not supabase_key:
-            raise ValueError("Missing Supabase credentials")
-
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        # Shared Supabase client (one keep-alive pool per process)
+        self.clients = clients or SharedClients()
+        self.supabase: Client = self.clients.supabase()
+        self._copy_loader: Optional[PostgresCopyLoader] = None
+        self._ledger: Optional[ExtractionLedger] = None
+        self.artifacts_skipped = 0
 
         # Load entity, template, and source
         self._load_configuration()
@@ -63,67 +99,270 @@ class BaseExtractor(ABC):
 
         self.logger.info(f"Configuration loaded: entity={self.entity['name']}, template={self.template['name']}, source={self.source['name']}")
 
+    def _get_ledger(self) -> ExtractionLedger:
+        """Load the processed-item ledger for this (entity, template, source)"""
+        if self._ledger is None:
+            self._ledger = ExtractionLedger(
+                self.supabase, self.entity_id, self.template_id, self.source_id, self.logger
+            ).load()
+        return self._ledger
+
+    def _skip_ledger(self) -> bool:
+        """True if unchanged items should be skipped (default unless full_refresh)"""
+        return not self.config.get('full_refresh') and self._get_ledger().enabled
+
+    def _mark_processed(self, artifact: Dict[str, Any], records_extracted: int):
+        entry = ledger_entry(artifact)
+        if entry:
+            self._get_ledger().mark(*entry, records_extracted)
+
+    def _commit_ledger(self, records_extracted: int, records_loaded: int):
+        """Persist processed items only if every extracted record was loaded"""
+        ledger = self._get_ledger()
+        if records_loaded < records_extracted:
+            self.logger.warning(
+                f"Not updating extraction ledger: {records_loaded}/{records_extracted} records loaded"
+            )
+            ledger.discard()
+            return
+
+        written = ledger.commit()
+        if written:
+            self.logger.info(f"Extraction ledger updated: {written} items")
+
     def fetch_artifacts(self) -> List[Dict[str, Any]]:
         """
         Fetch artifacts from source
         Returns list of artifacts with content
         """
+        return list(self.iter_artifacts())
+
+    def iter_artifacts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield artifacts from source as they become available
+
+        S3 objects are yielded as soon as their download completes, so
+        extraction can start before the whole bucket has been fetched.
+        Items already in the extraction ledger with the same version are
+        skipped unless config['full_refresh'] is set.
+        """
         if self.source['source_type'] == 's3_bucket':
-            return self._fetch_from_s3()
+            return self._iter_from_s3()
         elif self.source['source_type'] == 'manual_upload':
-            return self._fetch_from_artifacts()
+            return self._iter_from_artifacts()
         else:
             raise ValueError(f"Unknown source type: {self.source['source_type']}")
 
     def _fetch_from_s3(self) -> List[Dict[str, Any]]:
         """Fetch files directly from S3"""
+        return list(self._iter_from_s3())
+
+    def _iter_from_s3(self) -> Iterator[Dict[str, Any]]:
+        """
+        Download S3 objects with a bounded thread pool
+
+        At most `s3_max_concurrency` downloads are in flight at once; listing
+        pauses while the pool is full so memory stays bounded by
+        concurrency x object size rather than by bucket size.
+        """
         config = self.source['configuration']
+        bucket = config['bucket']
+        prefix = config.get('prefix', '').lstrip('/')
+
+        max_concurrency = max(1, int(self.config.get('s3_max_concurrency') or DEFAULT_S3_MAX_CONCURRENCY))
+        max_object_bytes = int(self.config.get('s3_max_object_bytes') or DEFAULT_S3_MAX_OBJECT_BYTES)
+
+        # Shared S3 client (pool at least as large as download concurrency)
+        s3 = self.clients.s3(config.get('region', 'us-east-1'), min_pool_size=max_concurrency)
+
+        ledger = self._get_ledger()
+        skip_ledger = self._skip_ledger()
 
-        # Initialize S3 client
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=config.get('region', 'us-east-1')
+        fetched = 0
+        skipped = 0
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='s3-fetch')
+        pending = set()
+
+        try:
+            for obj in self._list_s3_objects(s3, bucket, prefix):
+                if not self.stream_s3_bodies and obj['Size'] > max_object_bytes:
+                    self.logger.warning(
+                        f"Skipping {obj['Key']}: {obj['Size']} bytes exceeds limit of {max_object_bytes}"
+                    )
+                    skipped += 1
+                    continue
+
+                if skip_ledger and ledger.is_processed(*ledger_entry(self._s3_artifact_meta(obj))):
+                    self.artifacts_skipped += 1
+                    continue
+
+                if self.stream_s3_bodies:
+                    # Nothing is downloaded here; extract() reads the body as it parses
+                    fetched += 1
+                    yield {
+                        **self._s3_artifact_meta(obj),
+                        'open_body': partial(self._open_s3_body, s3, bucket, obj['Key']),
+                    }
+                    continue
+
+                pending.add(pool.submit(self._download_s3_object, s3, bucket, obj))
+
+                # Wait for a free slot before listing further
+                if len(pending) >= max_concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        artifact = self._s3_download_result(future)
+                        if artifact is None:
+                            skipped += 1
+                            continue
+                        fetched += 1
+                        yield artifact
+
+            # Drain remaining downloads
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    artifact = self._s3_download_result(future)
+                    if artifact is None:
+                        skipped += 1
+                        continue
+                    fetched += 1
+                    yield artifact
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        self.logger.info(
+            f"Fetched {fetched} files from S3 ({skipped} skipped, {self.artifacts_skipped} unchanged)"
         )
 
-        # List objects
-        prefix = config.get('prefix', '').lstrip('/')
-        response = s3.list_objects_v2(
-            Bucket=config['bucket'],
-            Prefix=prefix
+    def _list_s3_objects(self, s3, bucket: str, prefix: str) -> Iterator[Dict[str, Any]]:
+        """Yield every object under prefix, following list_objects_v2 continuation tokens"""
+        paginator = s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': S3_LIST_PAGE_SIZE}
         )
 
-        artifacts = []
-        for obj in response.get('Contents', []):
-            # Skip folders
-            if obj['Key'].endswith('/'):
-                continue
+        for page in pages:
+            for obj in page.get('Contents', []):
+                # Skip folders
+                if obj['Key'].endswith('/'):
+                    continue
+                yield obj
 
-            # Download file content
-            file_obj = s3.get_object(Bucket=config['bucket'], Key=obj['Key'])
-            content = file_obj['Body'].read()
+    def _download_s3_object(self, s3, bucket: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Download a single S3 object (runs on a worker thread)"""
+        file_obj = s3.get_object(Bucket=bucket, Key=obj['Key'])
+        content = file_obj['Body'].read()
 
-            artifacts.append({
-                's3_key': obj['Key'],
-                'filename': obj['Key'].split('/')[-1],
-                'content': content,
-                'size': obj['Size']
-            })
+        return {
+            **self._s3_artifact_meta(obj),
+            'content': content,
+        }
+
+    def _open_s3_body(self, s3, bucket: str, key: str):
+        """Open an S3 object for incremental reading (botocore StreamingBody)"""
+        return s3.get_object(Bucket=bucket, Key=key)['Body']
+
+    def _s3_artifact_meta(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Artifact fields derived from a list_objects_v2 entry"""
+        last_modified = obj.get('LastModified')
+
+        return {
+            's3_key': obj['Key'],
+            'filename': obj['Key'].split('/')[-1],
+            'size': obj['Size'],
+            'etag': obj.get('ETag', '').strip('"'),
+            'last_modified': last_modified.isoformat() if hasattr(last_modified, 'isoformat') else str(last_modified or ''),
+        }
 
-        self.logger.info(f"Fetched {len(artifacts)} files from S3")
-        return artifacts
+    def _s3_download_result(self, future) -> Optional[Dict[str, Any]]:
+        """Unwrap a download future, logging failures instead of aborting the fetch"""
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.error(f"Error downloading from S3: {e}")
+            return None
 
     def _fetch_from_artifacts(self) -> List[Dict[str, Any]]:
         """Fetch from artifacts table (manual uploads)"""
+        return list(self._iter_from_artifacts())
+
+    def _iter_from_artifacts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield artifacts table rows (manual uploads) one page at a time
+
+        Pages are keyset-paginated on (created_at, id) so each request is an
+        index range scan regardless of depth, and only `artifact_columns`
+        are selected so large raw_content bodies are pulled page by page.
+
+        When the ledger has entries, each page is first read with just the
+        keyset/version columns and content is fetched only for changed rows.
+        """
+        page_size = max(1, int(self.config.get('artifact_page_size') or DEFAULT_ARTIFACT_PAGE_SIZE))
+
+        # Keyset columns are always needed to fetch the next page
+        columns = list(dict.fromkeys(['id', 'created_at', 'updated_at', *self.artifact_columns]))
+        select = ','.join(columns)
+
+        ledger = self._get_ledger()
+        skip_ledger = self._skip_ledger() and len(ledger) > 0
+        page_select = 'id,created_at,updated_at' if skip_ledger else select
+
+        last_created_at = None
+        last_id = None
+        fetched = 0
+
+        while True:
+            query = self.supabase.table('artifacts')\
+                .select(page_select)\
+                .eq('source_id', self.source_id)\
+                .eq('extraction_status', 'completed')
+
+            if last_id is not None:
+                query = query.or_(
+                    f'created_at.gt."{last_created_at}",'
+                    f'and(created_at.eq."{last_created_at}",id.gt.{last_id})'
+                )
+
+            response = query\
+                .order('created_at')\
+                .order('id')\
+                .limit(page_size)\
+                .execute()
+
+            rows = response.data or []
+            page_rows = self._changed_artifacts(rows, select, ledger) if skip_ledger else rows
+
+            for row in page_rows:
+                row.setdefault('filename', row.get('original_filename'))
+                yield row
+
+            fetched += len(page_rows)
+            if len(rows) < page_size:
+                break
+
+            last_created_at = rows[-1]['created_at']
+            last_id = rows[-1]['id']
+
+        self.logger.info(f"Fetched {fetched} artifacts from database ({self.artifacts_skipped} unchanged)")
+
+    def _changed_artifacts(self, rows: List[Dict[str, Any]], select: str, ledger: ExtractionLedger) -> List[Dict[str, Any]]:
+        """Fetch full rows for the subset of a page not already in the ledger (keeps page order)"""
+        changed_ids = [row['id'] for row in rows if not ledger.is_processed(*ledger_entry(row))]
+        self.artifacts_skipped += len(rows) - len(changed_ids)
+
+        if not changed_ids:
+            return []
+
         response = self.supabase.table('artifacts')\
-            .select('*')\
-            .eq('source_id', self.source_id)\
-            .eq('extraction_status', 'completed')\
+            .select(select)\
+            .in_('id', changed_ids)\
             .execute()
 
-        self.logger.info(f"Fetched {len(response.data)} artifacts from database")
-        return response.data
+        by_id = {row['id']: row for row in response.data or []}
+        return [by_id[artifact_id] for artifact_id in changed_ids if artifact_id in by_id]
 
     @abstractmethod
     def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -139,10 +378,40 @@ class BaseExtractor(ABC):
         """
         pass
 
+    def iter_extract(self, artifact: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield an artifact's records lazily
+
+        Defaults to extract(); subclasses that can parse incrementally override
+        this so records reach the load stage before the artifact is fully read.
+        """
+        yield from self.extract(artifact)
+
+    def extract_many(self, artifacts: Iterator[Dict[str, Any]], lazy: bool = False) -> Iterator[Tuple[Dict[str, Any], Iterable[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Extract a stream of artifacts, yielding (artifact, records, error) in input order
+
+        Extraction is sequential by default; subclasses may override this to
+        extract several artifacts concurrently.
+
+        Args:
+            artifacts: Artifacts to extract
+            lazy: Yield records as an iterator (iter_extract) instead of a list;
+                  errors raised while iterating are then the caller's to handle
+        """
+        for artifact in artifacts:
+            try:
+                yield artifact, (self.iter_extract(artifact) if lazy else self.extract(artifact)), None
+            except Exception as e:
+                yield artifact, [], e
+
     def load_data(self, records: List[Dict[str, Any]]) -> int:
         """
         Load extracted records into entity table using GraphQL
 
+        With the COPY loader all records go in one COPY; otherwise they are
+        inserted through PostgREST in batches.
+
         Args:
             records: List of dicts matching entity schema
 
@@ -152,24 +421,67 @@ class BaseExtractor(ABC):
         if not records:
             return 0
 
-        table_name = self.entity['name']
-
-        # Batch insert (1000 at a time)
-        batch_size = 1000
+        # Batch insert (1000 at a time unless COPY can take everything)
+        batch_size = len(records) if self._get_copy_loader() else self._load_batch_size()
         total_loaded = 0
 
         for i in range(0, len(records), batch_size):
             batch = records[i:i + batch_size]
+            total_loaded += self._load_batch(batch, i // batch_size + 1)
+
+        return total_loaded
+
+    def _load_batch_size(self) -> int:
+        return max(1, int(self.config.get('load_batch_size') or DEFAULT_LOAD_BATCH_SIZE))
+
+    def _get_copy_loader(self) -> Optional[PostgresCopyLoader]:
+        """Return the COPY loader if configured and available, else None (PostgREST)"""
+        mode = self.config.get('loader', 'auto')
+        if mode == 'postgrest':
+            return None
 
+        if self._copy_loader is None:
+            if not copy_loader_available():
+                if mode == 'copy':
+                    raise ValueError("COPY loader requested but DATABASE_URL/psycopg is not available")
+                return None
+            self._copy_loader = PostgresCopyLoader(logger=self.logger)
+
+        return self._copy_loader
+
+    def _close_loader(self):
+        if self._copy_loader is not None:
+            self._copy_loader.close()
+            self._copy_loader = None
+
+    def _load_batch(self, batch: List[Dict[str, Any]], batch_number: int) -> int:
+        """Insert one batch, returning the number of records loaded"""
+        table_name = self.entity['name']
+
+        loader = self._get_copy_loader()
+        if loader:
             try:
-                response = self.supabase.table(table_name).insert(batch).execute()
-                total_loaded += len(batch)
-                self.logger.info(f"Loaded batch {i//batch_size + 1}: {len(batch)} records")
+                loaded = loader.load(table_name, batch)
+                self.logger.info(f"Loaded batch {batch_number}: {loaded} records (COPY)")
+                return loaded
+            except Exception as e:
+                self.logger.warning(f"COPY load failed, falling back to PostgREST: {e}")
+
+        # PostgREST insert, chunked so a large COPY batch doesn't become one request
+        chunk_size = self._load_batch_size()
+        loaded = 0
+
+        for i in range(0, len(batch), chunk_size):
+            chunk = batch[i:i + chunk_size]
+            try:
+                response = self.supabase.table(table_name).insert(chunk).execute()
+                loaded += len(chunk)
+                self.logger.info(f"Loaded batch {batch_number}: {len(chunk)} records")
             except Exception as e:
                 self.logger.error(f"Error loading batch: {e}")
                 # Continue with next batch
 
-        return total_loaded
+        return loaded
 
     def run(self) -> Dict[str, Any]:
         """
@@ -178,6 +490,9 @@ class BaseExtractor(ABC):
         Returns:
             Dict with run statistics
         """
+        if self.config.get('streaming'):
+            return self.run_streaming()
+
         self.logger.info(f"Starting pipeline run for entity: {self.entity['name']}")
 
         # Fetch artifacts
@@ -187,31 +502,146 @@ class BaseExtractor(ABC):
         # Extract data from each artifact
         all_records = []
         total_artifacts = len(artifacts)
-
-        for idx, artifact in enumerate(artifacts, 1):
-            try:
-                # Update progress if callback provided
-                if hasattr(self, 'update_progress'):
-                    self.update_progress(
-                        idx,
-                        total_artifacts,
-                        f"Processing {artifact.get('filename', 'unknown')} ({idx}/{total_artifacts})"
-                    )
-
-                records = self.extract(artifact)
-                all_records.extend(records)
-                self.logger.info(f"Extracted {len(records)} records from {artifact.get('filename', 'unknown')}")
-            except Exception as e:
-                self.logger.error(f"Error extracting from artifact: {e}")
+        failed = 0
+
+        for idx, (artifact, records, error) in enumerate(self.extract_many(artifacts), 1):
+            # Update progress if callback provided
+            self._report_progress(
+                idx,
+                total_artifacts,
+                f"Processed {artifact.get('filename', 'unknown')} ({idx}/{total_artifacts})",
+                len(all_records)
+            )
+
+            if error is not None:
+                self.logger.error(f"Error extracting from artifact: {error}")
+                failed += 1
                 # Continue with next artifact
+                continue
+
+            all_records.extend(records)
+            self._mark_processed(artifact, len(records))
+            self.logger.info(f"Extracted {len(records)} records from {artifact.get('filename', 'unknown')}")
 
         # Load data
-        loaded_count = self.load_data(all_records)
+        try:
+            loaded_count = self.load_data(all_records)
+        finally:
+            self._close_loader()
+
+        self._commit_ledger(len(all_records), loaded_count)
 
         return {
             'artifacts_processed': len(artifacts),
+            'artifacts_skipped': self.artifacts_skipped,
+            'artifacts_failed': failed,
             'records_extracted': len(all_records),
             'records_loaded': loaded_count,
             'entity': self.entity['name'],
             'template': self.template['name'],
         }
+
+    def run_streaming(self) -> Dict[str, Any]:
+        """
+        Execute pipeline as chained generator stages: fetch → extract → batch → load
+
+        Only one artifact and one load batch are held at a time, and each
+        batch is loaded as soon as it fills instead of after the last file.
+
+        Returns:
+            Dict with run statistics (same shape as run())
+        """
+        self.logger.info(f"Starting streaming pipeline run for entity: {self.entity['name']}")
+
+        stats = {'artifacts_processed': 0, 'artifacts_failed': 0, 'records_extracted': 0}
+
+        artifacts = self.iter_artifacts()
+        records = self._extract_stage(artifacts, stats)
+        batches = self._batch_stage(records, self._load_batch_size())
+
+        loaded_count = 0
+        try:
+            for batch_number, batch in enumerate(batches, 1):
+                loaded_count += self._load_batch(batch, batch_number)
+        finally:
+            self._close_loader()
+
+        self._commit_ledger(stats['records_extracted'], loaded_count)
+
+        return {
+            'artifacts_processed': stats['artifacts_processed'],
+            'artifacts_skipped': self.artifacts_skipped,
+            'artifacts_failed': stats['artifacts_failed'],
+            'records_extracted': stats['records_extracted'],
+            'records_loaded': loaded_count,
+            'entity': self.entity['name'],
+            'template': self.template['name'],
+        }
+
+    def _extract_stage(self, artifacts: Iterator[Dict[str, Any]], stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield records artifact by artifact, dropping each artifact once extracted
+
+        Records are pulled lazily (see iter_extract) into a RecordSpool, which
+        spills to disk past artifact_spool_bytes, and are only passed on once
+        the artifact has been read to the end. An artifact that fails part-way
+        loads nothing and stays out of the ledger, so a retry cannot duplicate
+        the records it had already produced.
+        """
+        spool_bytes = int(self.config.get('artifact_spool_bytes') or DEFAULT_SPOOL_MAX_BYTES)
+
+        for idx, (artifact, records, error) in enumerate(self.extract_many(artifacts, lazy=True), 1):
+            filename = artifact.get('filename', 'unknown')
+            stats['artifacts_processed'] += 1
+
+            # Update progress if callback provided (total unknown while streaming)
+            self._report_progress(idx, 0, f"Processed {filename} ({idx})", stats['records_extracted'])
+
+            if error is not None:
+                self.logger.error(f"Error extracting from artifact: {error}")
+                stats['artifacts_failed'] += 1
+                # Continue with next artifact
+                continue
+
+            with RecordSpool(spool_bytes) as spool:
+                try:
+                    for record in records:
+                        spool.append(record)
+                except Exception as e:
+                    self.logger.error(f"Error extracting from {filename} after {spool.count} records, discarding them: {e}")
+                    stats['artifacts_failed'] += 1
+                    continue
+
+                stats['records_extracted'] += spool.count
+                yield from spool
+
+            self._mark_processed(artifact, spool.count)
+
+            # Release raw content before the next artifact
+            artifact = None
+            records = None
+
+            self.logger.info(f"Extracted {spool.count} records from {filename}")
+
+    def _report_progress(self, current: int, total: int, message: str, records: int):
+        """
+        Forward progress to the update_progress callback, if one was set
+
+        The callback is called once per artifact from the extraction loop, so it
+        must be cheap (see ProgressReporter, which coalesces writes in the background).
+        """
+        update_progress = getattr(self, 'update_progress', None)
+        if update_progress is not None:
+            update_progress(current, total, message, records=records)
+
+    def _batch_stage(self, records: Iterator[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Group a record stream into lists of at most batch_size"""
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
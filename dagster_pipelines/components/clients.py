@@ -0,0 +1,138 @@
+"""
+Shared Clients
+
+Process-wide Supabase, S3 and Textract clients:
+- Created lazily on first use, then reused by every extractor, run_extraction.py
+  and deployed pipeline in the process
+- Each client keeps one keep-alive HTTP connection pool (no per-call TLS handshakes)
+- Pool sizes are tuned for concurrent S3 downloads and Textract polling
+- SharedClients hands them out without importing Dagster (CLI, worker);
+  ClientsResource (resources.py) exposes them to Dagster ops and assets
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple, Callable
+
+# Connections kept alive per client
+DEFAULT_HTTP_POOL_SIZE = 32
+DEFAULT_AWS_REGION = 'us-east-1'
+
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared(key: Tuple, factory: Callable[[], Any]) -> Any:
+    """Return the client cached under key, creating it once per process"""
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory()
+    return client
+
+
+def get_supabase_client(url: Optional[str] = None, key: Optional[str] = None,
+                        pool_size: int = DEFAULT_HTTP_POOL_SIZE):
+    """
+    Shared Supabase client
+
+    Args:
+        url: Supabase URL (defaults to NEXT_PUBLIC_SUPABASE_URL)
+        key: API key (defaults to SUPABASE_SERVICE_ROLE_KEY)
+        pool_size: Keep-alive connections in the underlying httpx pool
+    """
+    url = url or os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = key or os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise ValueError("Missing Supabase credentials")
+
+    return _shared(('supabase', url, key, pool_size), lambda: _create_supabase_client(url, key, pool_size))
+
+
+def _create_supabase_client(url: str, key: str, pool_size: int):
+    import httpx
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=httpx.Timeout(120.0, connect=10.0),
+    )
+
+    try:
+        options = SyncClientOptions(httpx_client=http_client)
+    except TypeError:
+        # supabase < 2.10 has no httpx_client option; use its default pools
+        http_client.close()
+        return create_client(url, key)
+
+    return create_client(url, key, options=options)
+
+
+def get_aws_client(service: str, region_name: Optional[str] = None,
+                   pool_size: int = DEFAULT_HTTP_POOL_SIZE):
+    """
+    Shared boto3 client (boto3 clients are thread-safe)
+
+    Args:
+        service: AWS service name ('s3', 'textract', ...)
+        region_name: Region (defaults to AWS_REGION, then us-east-1)
+        pool_size: max_pool_connections for the client
+    """
+    region_name = region_name or os.getenv('AWS_REGION', DEFAULT_AWS_REGION)
+
+    def create():
+        import boto3
+        from botocore.config import Config as BotoConfig
+
+        return boto3.client(
+            service,
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            region_name=region_name,
+            config=BotoConfig(
+                max_pool_connections=pool_size,
+                tcp_keepalive=True,
+                retries={'mode': 'adaptive', 'max_attempts': 5},
+            ),
+        )
+
+    return _shared(('aws', service, region_name, pool_size), create)
+
+
+class ClientAccessors:
+    """Client getters shared by SharedClients and ClientsResource (which set the fields)"""
+
+    http_pool_size: int
+    aws_region: Optional[str]
+
+    def supabase(self):
+        return get_supabase_client(pool_size=self.http_pool_size)
+
+    def s3(self, region_name: Optional[str] = None, min_pool_size: int = 0):
+        pool_size = max(self.http_pool_size, min_pool_size)
+        return get_aws_client('s3', region_name or self.aws_region, pool_size)
+
+    def textract(self, region_name: Optional[str] = None, min_pool_size: int = 0):
+        pool_size = max(self.http_pool_size, min_pool_size)
+        return get_aws_client('textract', region_name or self.aws_region, pool_size)
+
+
+class SharedClients(ClientAccessors):
+    """Shared clients for code running outside Dagster"""
+
+    def __init__(self, http_pool_size: int = DEFAULT_HTTP_POOL_SIZE, aws_region: Optional[str] = None):
+        self.http_pool_size = http_pool_size
+        self.aws_region = aws_region
+
+
+def __getattr__(name: str):
+    # ClientsResource moved to resources.py so importing this module doesn't
+    # import Dagster; deployed pipelines still import it from here
+    if name == 'ClientsResource':
+        from .resources import ClientsResource
+        return ClientsResource
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
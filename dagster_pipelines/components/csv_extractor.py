@@ -2,34 +2,141 @@
 CSV Extractor Component
 
 Extracts data from CSV files using column mappings defined in templates
+
+CSV files are parsed as a stream:
+- S3 bodies are read in chunks through an incremental UTF-8 decoder
+  (objects are opened lazily, so multi-gigabyte drops are never held in memory)
+- Column mappings are compiled once into (index, field, converter) tuples
+- Records are yielded row by row (see iter_extract)
 """
 
 import csv
 import io
-from typing import Dict, List, Any
-from dagster import op, job, Config, Out
+import sys
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
 from .base_extractor import BaseExtractor
+from .streams import open_byte_chunks, iter_decoded_lines
+
+# Column index for fields without a mapping (never present in a row)
+_UNMAPPED = sys.maxsize
+
+_TRUE_VALUES = frozenset(['true', 'yes', '1'])
+
+ColumnPlan = List[Tuple[int, str, Callable[[str], Any]]]
+
+
+def _convert_numeric(value: str) -> Optional[str]:
+    value = value.strip()
+    try:
+        return str(float(value)) if value else None
+    except ValueError:
+        return value
+
+
+def _convert_boolean(value: str) -> bool:
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def _convert_text(value: str) -> Optional[str]:
+    return value.strip() or None
+
+
+CONVERTERS = {
+    'numeric': _convert_numeric,
+    'boolean': _convert_boolean,
+}
+
+
+def compile_column_plan(selectors: Dict[str, Any]) -> ColumnPlan:
+    """
+    Compile template field selectors into (column index, field, converter) tuples
+
+    Fields keep template order; fields without a columnIndex always yield None.
+    """
+    plan = []
+    for field_name, selector in selectors.items():
+        column_index = selector.get('columnIndex')
+        format_type = (selector.get('validation') or {}).get('format', 'text')
+        plan.append((
+            _UNMAPPED if column_index is None else column_index,
+            field_name,
+            CONVERTERS.get(format_type, _convert_text),
+        ))
+    return plan
 
 
 class CSVExtractorComponent(BaseExtractor):
     """Extract data from CSV files using column mappings"""
 
+    # S3 objects are parsed straight off the response body
+    stream_s3_bodies = True
+
+    _column_plan: Optional[ColumnPlan] = None
+
     def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Extract data from CSV artifact using column mappings from template
 
         Args:
             artifact: Dict containing either:
+                - 'open_body': callable returning a streaming S3 body
                 - 'content': bytes (from S3)
                 - 'raw_content': dict/str (from artifacts table)
 
         Returns:
             List of records matching entity schema
         """
-        # Parse CSV content
-        if 'content' in artifact:
-            # From S3 - decode bytes
-            csv_text = artifact['content'].decode('utf-8')
+        return list(self.iter_extract(artifact))
+
+    def iter_extract(self, artifact: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield one record per data row without materializing the file"""
+        plan = self._get_column_plan()
+        if not plan:
+            self.logger.warning("No selectors defined in template")
+            return
+
+        lines, body = self._open_lines(artifact)
+        try:
+            csv_reader = csv.reader(lines)
+
+            # Assume first row is headers
+            if next(csv_reader, None) is None:
+                self.logger.warning("CSV file is empty")
+                return
+
+            count = 0
+            for row in csv_reader:
+                row_length = len(row)
+                yield {
+                    field_name: convert(row[column_index]) if column_index < row_length else None
+                    for column_index, field_name, convert in plan
+                }
+                count += 1
+        finally:
+            # Also runs when the consumer abandons the generator early
+            if body is not None:
+                body.close()
+
+        self.logger.info(f"Extracted {count} records from CSV")
+
+    def _get_column_plan(self) -> ColumnPlan:
+        """Column plan for this run's template (compiled on first use)"""
+        if self._column_plan is None:
+            selectors = (self.template.get('selectors') or {}).get('fields') or {}
+            self._column_plan = compile_column_plan(selectors)
+        return self._column_plan
+
+    def _open_lines(self, artifact: Dict[str, Any]) -> Tuple[Iterator[str], Any]:
+        """
+        Line iterator over the artifact's CSV text
+
+        Returns:
+            tuple: (lines, S3 body to close when done or None)
+        """
+        if 'open_body' in artifact or 'content' in artifact:
+            # From S3 - streamed response body or downloaded bytes
+            chunks, body = open_byte_chunks(artifact)
+            return iter_decoded_lines(chunks), body
         elif 'raw_content' in artifact:
             # From artifacts table
             if isinstance(artifact['raw_content'], dict):
@@ -38,83 +145,6 @@ class CSVExtractorComponent(BaseExtractor):
                 csv_text = artifact['raw_content']
             else:
                 raise ValueError(f"Unknown raw_content format: {type(artifact['raw_content'])}")
+            return io.StringIO(csv_text), None
         else:
             raise ValueError("Artifact missing content")
-
-        # Parse CSV
-        csv_reader = csv.reader(io.StringIO(csv_text))
-        rows = list(csv_reader)
-
-        if len(rows) == 0:
-            self.logger.warning("CSV file is empty")
-            return []
-
-        # Assume first row is headers
-        headers = rows[0]
-        data_rows = rows[1:]
-
-        # Get field selectors from template
-        selectors = self.template.get('selectors', {}).get('fields', {})
-
-        if not selectors:
-            self.logger.warning("No selectors defined in template")
-            return []
-
-        # Extract data using column mappings
-        records = []
-
-        for row in data_rows:
-            record = {}
-
-            for field_name, selector in selectors.items():
-                column_index = selector.get('columnIndex')
-
-                if column_index is not None and column_index < len(row):
-                    value = row[column_index].strip()
-
-                    # Type conversion based on validation format
-                    validation = selector.get('validation', {})
-                    format_type = validation.get('format', 'text')
-
-                    if format_type == 'numeric':
-                        try:
-                            record[field_name] = str(float(value)) if value else None
-                        except ValueError:
-                            record[field_name] = value
-                    elif format_type == 'boolean':
-                        record[field_name] = value.lower() in ['true', 'yes', '1']
-                    else:
-                        record[field_name] = value or None
-                else:
-                    record[field_name] = None
-
-            records.append(record)
-
-        self.logger.info(f"Extracted {len(records)} records from CSV")
-        return records
-
-
-# Dagster job configuration
-class CSVExtractionConfig(Config):
-    """Configuration for CSV extraction job"""
-    entity_id: str
-    template_id: str
-    source_id: str
-
-
-@op(out=Out(Dict[str, Any]))
-def run_csv_extraction(config: CSVExtractionConfig) -> Dict[str, Any]:
-    """Dagster op to run CSV extraction"""
-    extractor = CSVExtractorComponent({
-        'entity_id': config.entity_id,
-        'template_id': config.template_id,
-        'source_id': config.source_id,
-    })
-
-    return extractor.run()
-
-
-@job
-def csv_extraction_job():
-    """Dagster job for CSV extraction"""
-    run_csv_extraction()
@@ -3,21 +3,30 @@ Email Extractor Component
 
 Extracts data from email files using AI-based extraction
 Parses RFC822/MIME format and uses Claude to extract structured data
+(documents are sent to the API concurrently, see AIExtractor)
+
+Emails are reduced before the API call (headers, cleaned body, attachment
+summaries; see email_preprocessor), so payload size doesn't grow with attachments.
 """
 
-import sys
-import requests
-from typing import Dict, List, Any
-from dagster import op, job, Config, Out
-from .base_extractor import BaseExtractor
+from typing import Dict, Any
+from .ai_extractor import AIExtractor
+from .email_preprocessor import reduce_email
 
 
-class EmailExtractorComponent(BaseExtractor):
+class EmailExtractorComponent(AIExtractor):
     """Extract data from email files using AI"""
 
-    def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
+    ai_endpoint = '/api/extract/email-ai'
+    ai_label = 'email'
+    ai_content_key = 'email_content'
+
+    payload_bytes_before = 0
+    payload_bytes_after = 0
+
+    def ai_payload(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Extract data from email artifact using AI
+        Build the AI extraction request for an email artifact
 
         Args:
             artifact: Dict containing either:
@@ -25,12 +34,12 @@ class EmailExtractorComponent(BaseExtractor):
                 - 'raw_content': dict/str (from artifacts table)
 
         Returns:
-            List of records (typically just 1 record per email)
+            Request body (one record is extracted per email)
         """
         # Get email content
         if 'content' in artifact:
-            # From S3 - decode bytes
-            email_content = artifact['content'].decode('utf-8')
+            # From S3 - raw bytes (the MIME parser handles charsets)
+            email_content = artifact['content']
         elif 'raw_content' in artifact:
             # From artifacts table
             if isinstance(artifact['raw_content'], dict):
@@ -42,66 +51,23 @@ class EmailExtractorComponent(BaseExtractor):
         else:
             raise ValueError("Artifact missing content")
 
-        # Call Next.js AI extraction API
-        api_url = 'http://localhost:3000'
-
-        try:
-            print(f"Calling AI email extraction for file: {artifact.get('filename', 'unknown')}", file=sys.stderr, flush=True)
-
-            response = requests.post(
-                f'{api_url}/api/extract/email-ai',
-                json={
-                    'email_content': email_content,
-                    'template': self.template
-                },
-                timeout=180  # 3 minutes for AI extraction
-            )
-
-            if response.status_code != 200:
-                error_text = response.text
-                print(f"❌ AI email extraction failed: {error_text}", file=sys.stderr, flush=True)
-                return [{}]
-
-            result = response.json()
-
-            if not result.get('success'):
-                print(f"❌ Extraction failed: {result.get('error')}", file=sys.stderr, flush=True)
-                return [{}]
-
-            record = result.get('data', {})
-            fields_with_values = result.get('fieldsWithValues', 0)
-            total_fields = result.get('fieldsExtracted', 0)
-
-            print(f"✅ AI extracted {fields_with_values}/{total_fields} fields from email", file=sys.stderr, flush=True)
-
-            return [record]
-
-        except Exception as e:
-            print(f"❌ Error calling AI email extraction API: {e}", file=sys.stderr, flush=True)
-            return [{}]
-
-
-# Dagster job configuration
-class EmailExtractionConfig(Config):
-    """Configuration for email extraction job"""
-    entity_id: str
-    template_id: str
-    source_id: str
-
-
-@op(out=Out(Dict[str, Any]))
-def run_email_extraction(config: EmailExtractionConfig) -> Dict[str, Any]:
-    """Dagster op to run email extraction"""
-    extractor = EmailExtractorComponent({
-        'entity_id': config.entity_id,
-        'template_id': config.template_id,
-        'source_id': config.source_id,
-    })
-
-    return extractor.run()
-
-
-@job
-def email_extraction_job():
-    """Dagster job for email extraction"""
-    run_email_extraction()
+        if self.config.get('email_preprocess', True):
+            reduced = reduce_email(email_content)
+            self.payload_bytes_before += reduced['bytes_before']
+            self.payload_bytes_after += reduced['bytes_after']
+            email_content = reduced['content']
+        elif isinstance(email_content, bytes):
+            email_content = email_content.decode('utf-8')
+
+        return {
+            'email_content': email_content,
+            'template': self.template
+        }
+
+    def ai_run_stats(self) -> Dict[str, Any]:
+        if not self.payload_bytes_before:
+            return {}
+        return {
+            'email_payload_bytes_before': self.payload_bytes_before,
+            'email_payload_bytes_after': self.payload_bytes_after,
+        }
@@ -0,0 +1,141 @@
+"""
+Email Pre-processor
+
+Reduces a raw RFC822/MIME email to what AI extraction actually reads,
+using the stdlib `email` package:
+- Headers: From, To, Cc, Subject, Date, Message-ID
+- Body: text/plain part (or text/html converted to text) with signatures,
+  mobile footers and confidentiality disclaimers removed
+- Attachments: summarized by name, type and size instead of sending their bytes
+
+The result is still a valid RFC822 message, so /api/extract/email-ai
+parses it exactly like the original.
+"""
+
+import re
+from email import message_from_bytes, message_from_string, policy
+from email.message import EmailMessage
+from typing import Dict, List, Any, Union
+
+KEPT_HEADERS = ('From', 'To', 'Cc', 'Subject', 'Date', 'Message-ID')
+
+# Boilerplate removed from bodies
+_SIGNATURE_RE = re.compile(r'^-- $', re.MULTILINE)  # RFC 3676 signature delimiter
+_MOBILE_FOOTER_RE = re.compile(r'^\s*Sent from my .+$', re.MULTILINE | re.IGNORECASE)
+_DISCLAIMER_RE = re.compile(
+    r'^\s*(CONFIDENTIALITY NOTICE|DISCLAIMER|This (e-?mail|message) and any attachments?)\b.*?(?:\n\s*\n|\Z)',
+    re.MULTILINE | re.IGNORECASE | re.DOTALL
+)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_HTML_BLOCK_TAGS = ('p', 'div', 'br', 'tr', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table')
+
+
+def reduce_email(raw: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Build the reduced message sent to AI extraction
+
+    Returns:
+        Dict with:
+            - content: reduced RFC822 message (str)
+            - bytes_before: size of the raw email
+            - bytes_after: size of the reduced message
+            - attachments: [{filename, content_type, size}]
+    """
+    if isinstance(raw, bytes):
+        message = message_from_bytes(raw, policy=policy.default)
+        bytes_before = len(raw)
+    else:
+        message = message_from_string(raw, policy=policy.default)
+        bytes_before = len(raw.encode('utf-8', errors='replace'))
+
+    attachments = summarize_attachments(message)
+    body = clean_body(extract_body_text(message))
+
+    if attachments:
+        lines = [f"- {a['filename']} ({a['content_type']}, {a['size']} bytes)" for a in attachments]
+        body = f"{body}\n\nAttachments:\n" + '\n'.join(lines)
+
+    reduced = EmailMessage()
+    for header in KEPT_HEADERS:
+        value = message.get(header)
+        if value:
+            reduced[header] = str(value)
+    reduced.set_content(body or '')
+
+    content = reduced.as_string()
+    return {
+        'content': content,
+        'bytes_before': bytes_before,
+        'bytes_after': len(content.encode('utf-8')),
+        'attachments': attachments,
+    }
+
+
+def extract_body_text(message) -> str:
+    """Text of the main body part (plain text preferred, HTML converted otherwise)"""
+    part = message.get_body(preferencelist=('plain', 'html'))
+    if part is None:
+        return ''
+
+    try:
+        content = part.get_content()
+    except (LookupError, UnicodeDecodeError):
+        # Unknown or wrong charset: decode leniently
+        payload = part.get_payload(decode=True) or b''
+        content = payload.decode('utf-8', errors='replace')
+
+    if part.get_content_subtype() == 'html':
+        return html_to_text(content)
+    return content
+
+
+def html_to_text(html: str) -> str:
+    """Visible text of an HTML body, one line per block element"""
+    from lxml import html as lxml_html
+
+    if not html.strip():
+        return ''
+
+    doc = lxml_html.document_fromstring(html)
+    for element in doc.xpath('//script|//style|//head'):
+        element.drop_tree()
+    for element in doc.iter(*_HTML_BLOCK_TAGS):
+        element.tail = '\n' + (element.tail or '')
+
+    lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in doc.text_content().split('\n'))
+    return '\n'.join(lines)
+
+
+def clean_body(text: str) -> str:
+    """Drop signature, mobile footer and disclaimer boilerplate"""
+    text = text.replace('\r\n', '\n')
+
+    signature = _SIGNATURE_RE.search(text)
+    if signature:
+        text = text[:signature.start()]
+
+    text = _MOBILE_FOOTER_RE.sub('', text)
+    text = _DISCLAIMER_RE.sub('', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()
+
+
+def summarize_attachments(message) -> List[Dict[str, Any]]:
+    """Name, type and decoded size of every attachment"""
+    attachments = []
+    for part in message.walk():
+        if part.is_multipart():
+            continue
+
+        # Attachments, plus inline files such as embedded images
+        disposition = part.get_content_disposition()
+        if disposition != 'attachment' and not (disposition == 'inline' and part.get_filename()):
+            continue
+
+        payload = part.get_payload(decode=True)
+        attachments.append({
+            'filename': part.get_filename() or 'unnamed',
+            'content_type': part.get_content_type(),
+            'size': len(payload) if payload else 0,
+        })
+    return attachments
@@ -3,22 +3,30 @@ HTML Extractor Component
 
 Extracts data from HTML files using AI-based extraction
 Uses Claude to understand HTML structure and extract field values
+(documents are sent to the API concurrently, see AIExtractor)
+
+Templates with cascade selectors (xpath → css → regex) are first run through
+the local RuleEngine; only fields the rules cannot fill go to the AI route.
 """
 
-import sys
-import os
-import requests
-from typing import Dict, List, Any
-from dagster import op, job, Config, Out
-from .base_extractor import BaseExtractor
+from typing import Dict, Any, Optional, Tuple
+from .ai_extractor import AIExtractor
+from .rule_engine import RuleEngine, template_field_names
 
 
-class HTMLExtractorComponent(BaseExtractor):
+class HTMLExtractorComponent(AIExtractor):
     """Extract data from HTML files using AI"""
 
-    def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
+    ai_endpoint = '/api/extract/html-ai'
+    ai_label = 'HTML'
+    ai_content_key = 'html'
+
+    _rules: Optional[RuleEngine] = None
+    _rules_compiled = False
+
+    def ai_payload(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Extract data from HTML artifact using AI
+        Build the AI extraction request for an HTML artifact
 
         Args:
             artifact: Dict containing either:
@@ -26,7 +34,7 @@ class HTMLExtractorComponent(BaseExtractor):
                 - 'raw_content': dict (from artifacts table with 'html' key)
 
         Returns:
-            List of records (typically just 1 record per HTML file)
+            Request body (one record is extracted per HTML file)
         """
         # Get HTML content
         if 'content' in artifact:
@@ -43,66 +51,39 @@ class HTMLExtractorComponent(BaseExtractor):
         else:
             raise ValueError("Artifact missing content")
 
-        # Call Next.js AI extraction API
-        api_url = 'http://localhost:3000'
-
-        try:
-            print(f"Calling AI extraction API for file: {artifact.get('filename', 'unknown')}", file=sys.stderr, flush=True)
-
-            response = requests.post(
-                f'{api_url}/api/extract/html-ai',
-                json={
-                    'html': html_content,
-                    'template': self.template  # Pass full template with fields + selectors
-                },
-                timeout=180  # 3 minutes for AI extraction
-            )
-
-            if response.status_code != 200:
-                error_text = response.text
-                print(f"❌ AI extraction failed: {error_text}", file=sys.stderr, flush=True)
-                return [{}]
-
-            result = response.json()
-
-            if not result.get('success'):
-                print(f"❌ Extraction failed: {result.get('error')}", file=sys.stderr, flush=True)
-                return [{}]
-
-            record = result.get('data', {})
-            fields_with_values = result.get('fieldsWithValues', 0)
-            total_fields = result.get('fieldsExtracted', 0)
-
-            print(f"✅ AI extracted {fields_with_values}/{total_fields} fields with values", file=sys.stderr, flush=True)
-
-            return [record]
-
-        except Exception as e:
-            print(f"❌ Error calling AI extraction API: {e}", file=sys.stderr, flush=True)
-            return [{}]
-
-
-# Dagster job configuration
-class HTMLExtractionConfig(Config):
-    """Configuration for HTML extraction job"""
-    entity_id: str
-    template_id: str
-    source_id: str
-
-
-@op(out=Out(Dict[str, Any]))
-def run_html_extraction(config: HTMLExtractionConfig) -> Dict[str, Any]:
-    """Dagster op to run HTML extraction"""
-    extractor = HTMLExtractorComponent({
-        'entity_id': config.entity_id,
-        'template_id': config.template_id,
-        'source_id': config.source_id,
-    })
-
-    return extractor.run()
-
-
-@job
-def html_extraction_job():
-    """Dagster job for HTML extraction"""
-    run_html_extraction()
+        return {
+            'html': html_content,
+            'template': self.template  # Pass full template with fields + selectors
+        }
+
+    def rule_extract(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Run the template's cascade selectors locally; AI gets only the unfilled fields"""
+        # Compile selectors once per run
+        if not self._rules_compiled:
+            self._rules = RuleEngine.from_template(self.template)
+            self._rules_compiled = True
+
+        if self._rules is None:
+            return {}, payload
+
+        values, _ = self._rules.extract(payload['html'])
+
+        field_names = template_field_names(self.template) or list(values)
+        record = {name: values.get(name) for name in field_names}
+        missing = {name for name in field_names if not record[name]}
+
+        self.logger.info(
+            f"Rules filled {len(field_names) - len(missing)}/{len(field_names)} fields"
+            + (f", asking AI for: {', '.join(sorted(missing))}" if missing else "")
+        )
+
+        if not missing:
+            return record, None
+
+        # Ask AI only for the missing fields
+        template = dict(self.template)
+        template['fields'] = [
+            field for field in self.template.get('fields') or list(values)
+            if (field.get('name') if isinstance(field, dict) else field) in missing
+        ]
+        return record, {**payload, 'template': template}
@@ -0,0 +1,184 @@
+"""
+Pipeline Job Queue
+
+Claims queued rows from pipeline_jobs for the persistent extraction worker
+(run_extraction.py --worker) over a direct Postgres connection (DATABASE_URL):
+- Each claim locks the oldest queued job with FOR UPDATE SKIP LOCKED and
+  marks it running in the same statement, so concurrent workers never
+  pick up the same job and never wait on each other's locks
+- Claimed rows carry everything needed to build the extractor config;
+  queued rows without template_id/source_id/artifact_type (jobs created for
+  a spawned run_extraction.py process) are never claimed
+- Claims are leases: the worker refreshes heartbeat_at on its running jobs,
+  and a running job whose heartbeat is older than the lease (its worker
+  crashed or was killed) is claimed again, up to max_claims times, after
+  which fail_expired() marks it failed
+"""
+
+import os
+from typing import Dict, Any, Iterable, List, Optional
+
+# Per-job options copied from pipeline_jobs.options into the run config
+JOB_OPTION_KEYS = (
+    'streaming',
+    'load_batch_size',
+    'full_refresh',
+    'ai_max_in_flight',
+    'ai_request_timeout',
+    'ai_cache',
+    'progress_interval',
+)
+
+# Seconds without a heartbeat before a running job is claimed again
+DEFAULT_LEASE_SECONDS = 300
+# Claims per job before an expired lease fails it instead
+DEFAULT_MAX_CLAIMS = 3
+
+CLAIM_SQL = """
+UPDATE pipeline_jobs
+SET status = 'running',
+    worker_id = %(worker_id)s,
+    started_at = NOW(),
+    heartbeat_at = NOW(),
+    claim_count = claim_count + 1,
+    updated_at = NOW(),
+    progress_message = CASE WHEN status = 'running'
+        THEN 'Restarting extraction (previous worker lost)...'
+        ELSE 'Starting extraction...' END
+WHERE id = (
+    SELECT id FROM pipeline_jobs
+    WHERE (
+        status = 'queued'
+        OR (status = 'running'
+            AND heartbeat_at < NOW() - make_interval(secs => %(lease_seconds)s)
+            AND claim_count < %(max_claims)s)
+    )
+      AND template_id IS NOT NULL
+      AND source_id IS NOT NULL
+      AND artifact_type IS NOT NULL
+    ORDER BY created_at
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, entity_id, template_id, source_id, artifact_type, options, claim_count
+"""
+
+HEARTBEAT_SQL = """
+UPDATE pipeline_jobs
+SET heartbeat_at = NOW()
+WHERE id = ANY(%(job_ids)s::uuid[])
+  AND worker_id = %(worker_id)s
+  AND status = 'running'
+RETURNING id
+"""
+
+FAIL_EXPIRED_SQL = """
+UPDATE pipeline_jobs
+SET status = 'failed',
+    error = 'Worker lost while running the job (claimed ' || claim_count || ' times)',
+    completed_at = NOW(),
+    updated_at = NOW()
+WHERE status = 'running'
+  AND heartbeat_at < NOW() - make_interval(secs => %(lease_seconds)s)
+  AND claim_count >= %(max_claims)s
+RETURNING id
+"""
+
+
+class PipelineJobQueue:
+    """Claim queued pipeline jobs (or jobs whose lease expired), one at a time"""
+
+    def __init__(
+        self,
+        worker_id: str,
+        dsn: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_claims: int = DEFAULT_MAX_CLAIMS,
+    ):
+        """
+        Args:
+            worker_id: Recorded on claimed jobs (pipeline_jobs.worker_id)
+            dsn: Postgres connection string (defaults to DATABASE_URL)
+            lease_seconds: Heartbeat age after which a running job is claimed again
+            max_claims: Claims per job before an expired lease fails it
+        """
+        self.dsn = dsn or os.getenv('DATABASE_URL')
+        if not self.dsn:
+            raise ValueError("Missing DATABASE_URL for pipeline job queue")
+
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.max_claims = max_claims
+        self._conn = None
+
+    def _connect(self):
+        import psycopg
+        from psycopg.rows import dict_row
+
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg.connect(self.dsn, autocommit=True, row_factory=dict_row)
+        return self._conn
+
+    def _execute(self, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            return self._connect().execute(sql, params).fetchall()
+        except Exception:
+            # Reconnect on the next call (e.g. after a database restart)
+            self.close()
+            raise
+
+    def _lease_params(self) -> Dict[str, Any]:
+        return {'lease_seconds': self.lease_seconds, 'max_claims': self.max_claims}
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest queued job, or the oldest running job whose lease expired
+
+        Returns:
+            Dict with id, entity_id, template_id, source_id, artifact_type,
+            claim_count and config (extractor config), or None if there is
+            nothing to claim
+        """
+        rows = self._execute(CLAIM_SQL, {'worker_id': self.worker_id, **self._lease_params()})
+        row = rows[0] if rows else None
+
+        if row is None:
+            return None
+
+        options = row.get('options') or {}
+        config = {
+            'entity_id': str(row['entity_id']),
+            'template_id': str(row['template_id']),
+            'source_id': str(row['source_id']),
+            **{key: options[key] for key in JOB_OPTION_KEYS if key in options},
+        }
+
+        return {
+            'id': str(row['id']),
+            'artifact_type': row['artifact_type'],
+            'claim_count': row['claim_count'],
+            'config': config,
+        }
+
+    def heartbeat(self, job_ids: Iterable[str]) -> List[str]:
+        """
+        Renew the lease on this worker's running jobs
+
+        Returns:
+            IDs still held by this worker (a job missing from the result was
+            finished, cancelled or claimed by another worker)
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        rows = self._execute(HEARTBEAT_SQL, {'job_ids': job_ids, 'worker_id': self.worker_id})
+        return [str(row['id']) for row in rows]
+
+    def fail_expired(self) -> List[str]:
+        """Mark jobs failed whose lease expired after their last allowed claim"""
+        return [str(row['id']) for row in self._execute(FAIL_EXPIRED_SQL, self._lease_params())]
+
+    def close(self):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
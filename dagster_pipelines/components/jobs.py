@@ -0,0 +1,157 @@
+"""
+Dagster Job Definitions
+
+Config, op and job for each extraction component, plus the code location's
+Definitions (workspace.yaml loads this module). Extraction logic lives in
+the *_extractor modules, which do not import Dagster, so run_extraction.py
+can use them without paying Dagster's import time.
+"""
+
+from typing import Dict, Any
+from dagster import Definitions, op, job, Config, Out
+from .ai_extractor import DEFAULT_AI_MAX_IN_FLIGHT, DEFAULT_AI_REQUEST_TIMEOUT
+from .resources import ClientsResource
+from .json_extractor import JSONExtractorComponent
+from .csv_extractor import CSVExtractorComponent
+from .html_extractor import HTMLExtractorComponent
+from .email_extractor import EmailExtractorComponent
+
+
+# JSON extraction
+class JSONExtractionConfig(Config):
+    """Configuration for JSON extraction job"""
+    entity_id: str
+    template_id: str
+    source_id: str
+    full_refresh: bool = False
+
+
+@op(out=Out(Dict[str, Any]))
+def run_json_extraction(config: JSONExtractionConfig, clients: ClientsResource) -> Dict[str, Any]:
+    """Dagster op to run JSON extraction"""
+    extractor = JSONExtractorComponent({
+        'entity_id': config.entity_id,
+        'template_id': config.template_id,
+        'source_id': config.source_id,
+        'full_refresh': config.full_refresh,
+    }, clients=clients)
+
+    return extractor.run()
+
+
+@job
+def json_extraction_job():
+    """Dagster job for JSON extraction"""
+    run_json_extraction()
+
+
+# CSV extraction
+class CSVExtractionConfig(Config):
+    """Configuration for CSV extraction job"""
+    entity_id: str
+    template_id: str
+    source_id: str
+    full_refresh: bool = False
+
+
+@op(out=Out(Dict[str, Any]))
+def run_csv_extraction(config: CSVExtractionConfig, clients: ClientsResource) -> Dict[str, Any]:
+    """Dagster op to run CSV extraction"""
+    extractor = CSVExtractorComponent({
+        'entity_id': config.entity_id,
+        'template_id': config.template_id,
+        'source_id': config.source_id,
+        'full_refresh': config.full_refresh,
+    }, clients=clients)
+
+    return extractor.run()
+
+
+@job
+def csv_extraction_job():
+    """Dagster job for CSV extraction"""
+    run_csv_extraction()
+
+
+# HTML extraction
+class HTMLExtractionConfig(Config):
+    """Configuration for HTML extraction job"""
+    entity_id: str
+    template_id: str
+    source_id: str
+    full_refresh: bool = False
+    ai_max_in_flight: int = DEFAULT_AI_MAX_IN_FLIGHT
+    ai_request_timeout: int = DEFAULT_AI_REQUEST_TIMEOUT
+    ai_cache: str = 'sqlite'  # 'sqlite', 'postgres' or 'off'
+
+
+@op(out=Out(Dict[str, Any]))
+def run_html_extraction(config: HTMLExtractionConfig, clients: ClientsResource) -> Dict[str, Any]:
+    """Dagster op to run HTML extraction"""
+    extractor = HTMLExtractorComponent({
+        'entity_id': config.entity_id,
+        'template_id': config.template_id,
+        'source_id': config.source_id,
+        'full_refresh': config.full_refresh,
+        'ai_max_in_flight': config.ai_max_in_flight,
+        'ai_request_timeout': config.ai_request_timeout,
+        'ai_cache': config.ai_cache,
+    }, clients=clients)
+
+    return extractor.run()
+
+
+@job
+def html_extraction_job():
+    """Dagster job for HTML extraction"""
+    run_html_extraction()
+
+
+# Email extraction
+class EmailExtractionConfig(Config):
+    """Configuration for email extraction job"""
+    entity_id: str
+    template_id: str
+    source_id: str
+    full_refresh: bool = False
+    ai_max_in_flight: int = DEFAULT_AI_MAX_IN_FLIGHT
+    ai_request_timeout: int = DEFAULT_AI_REQUEST_TIMEOUT
+    ai_cache: str = 'sqlite'  # 'sqlite', 'postgres' or 'off'
+    email_preprocess: bool = True
+
+
+@op(out=Out(Dict[str, Any]))
+def run_email_extraction(config: EmailExtractionConfig, clients: ClientsResource) -> Dict[str, Any]:
+    """Dagster op to run email extraction"""
+    extractor = EmailExtractorComponent({
+        'entity_id': config.entity_id,
+        'template_id': config.template_id,
+        'source_id': config.source_id,
+        'full_refresh': config.full_refresh,
+        'ai_max_in_flight': config.ai_max_in_flight,
+        'ai_request_timeout': config.ai_request_timeout,
+        'ai_cache': config.ai_cache,
+        'email_preprocess': config.email_preprocess,
+    }, clients=clients)
+
+    return extractor.run()
+
+
+@job
+def email_extraction_job():
+    """Dagster job for email extraction"""
+    run_email_extraction()
+
+
+# Define all Dagster assets and jobs
+defs = Definitions(
+    jobs=[
+        json_extraction_job,
+        csv_extraction_job,
+        html_extraction_job,
+        email_extraction_job,
+    ],
+    resources={
+        "clients": ClientsResource(),
+    },
+)
@@ -2,35 +2,175 @@
 JSON Extractor Component
 
 Extracts data from JSON files using JSONPath expressions defined in templates
+
+- JSONPath expressions are compiled once (compile_jsonpath is cached)
+- In multi-record mode, fields evaluated on the root document are computed
+  once per document rather than once per array element
+- Documents whose records are the top-level array itself (array field path
+  '$', no other root fields) are parsed incrementally from S3, one element
+  at a time, so the whole document is never held in memory
 """
 
+import re
 import json
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from jsonpath_ng import parse
-from dagster import op, job, In, Out, Config
-from .base_extractor import BaseExtractor
+from .base_extractor import BaseExtractor, DEFAULT_S3_MAX_OBJECT_BYTES
+from .streams import open_byte_chunks, iter_decoded_text
+
+# Array field path selecting the document itself
+ROOT_PATH = '$'
+
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+
+@lru_cache(maxsize=1024)
+def compile_jsonpath(json_path: str):
+    """Parse a JSONPath expression once per process"""
+    return parse(json_path)
+
+
+def iter_json_array(text_chunks: Iterator[str]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array from text chunks
+
+    Elements are decoded one at a time with json.JSONDecoder.raw_decode, so
+    memory is bounded by the largest element rather than the document.
+    Nothing is yielded if the document is not an array.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(text_chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def skip_whitespace() -> bool:
+        """Advance pos to the next token, reading chunks as needed; False at end of input"""
+        nonlocal buffer, pos, eof
+        while True:
+            pos = _WHITESPACE_RE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return True
+            if eof:
+                return False
+            buffer = next(chunks, None)
+            pos = 0
+            if buffer is None:
+                buffer = ''
+                eof = True
+
+    if not skip_whitespace() or buffer[pos] != '[':
+        return
+    pos += 1
+
+    expect_value = True
+    first = True
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of JSON array")
+
+        if buffer[pos] == ']' and (first or not expect_value):
+            return
+
+        if not expect_value:
+            if buffer[pos] != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {buffer[pos]!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        # Decode the next element. A number cut at a chunk boundary still
+        # decodes ("-2.5e" as -2.5), so only accept a value once the ',' or
+        # ']' that must follow it has been read.
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                follow = _WHITESPACE_RE.match(buffer, end).end()
+                if eof or (follow < len(buffer) and buffer[follow] in ',]'):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+
+        yield value
+        pos = end
+        expect_value = False
+        first = False
+
+        # Drop consumed text
+        if pos > len(buffer) // 2:
+            buffer = buffer[pos:]
+            pos = 0
 
 
 class JSONExtractorComponent(BaseExtractor):
     """Extract data from JSON files using JSONPath"""
 
+    # S3 objects are opened lazily; top-level arrays are parsed straight off the body
+    stream_s3_bodies = True
+
+    _field_plan: Optional[List[Tuple[str, Dict[str, Any], Any]]] = None
+
     def extract(self, artifact: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Extract data from JSON artifact using JSONPath selectors from template
 
         Args:
             artifact: Dict containing either:
+                - 'open_body': callable returning a streaming S3 body
                 - 'content': bytes (from S3)
                 - 'raw_content': dict/str (from artifacts table)
 
         Returns:
             List of records matching entity schema
         """
-        # Parse JSON content
-        if 'content' in artifact:
-            # From S3 - decode bytes
-            json_text = artifact['content'].decode('utf-8')
-            json_data = json.loads(json_text)
+        return list(self.iter_extract(artifact))
+
+    def iter_extract(self, artifact: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield records, parsing top-level arrays incrementally when possible"""
+        # Get field selectors from template
+        selectors = self.template.get('selectors', {}).get('fields', {})
+
+        if not selectors:
+            self.logger.warning("No selectors defined in template")
+            return
+
+        if self._can_stream_array(artifact):
+            records = self._iter_streamed_records(artifact)
+        else:
+            records = self._iter_records(self._load_json(artifact))
+
+        count = 0
+        for record in records:
+            count += 1
+            yield record
+
+        self.logger.info(f"Extracted {count} records from JSON")
+
+    def _load_json(self, artifact: Dict[str, Any]) -> Any:
+        """Parse the whole JSON document"""
+        if 'open_body' in artifact or 'content' in artifact:
+            # From S3 - whole-document parse keeps the download size limit
+            max_object_bytes = int(self.config.get('s3_max_object_bytes') or DEFAULT_S3_MAX_OBJECT_BYTES)
+            if 'open_body' in artifact and (artifact.get('size') or 0) > max_object_bytes:
+                raise ValueError(
+                    f"{artifact.get('s3_key')}: {artifact['size']} bytes exceeds limit of {max_object_bytes}"
+                )
+
+            chunks, body = open_byte_chunks(artifact)
+            try:
+                json_text = ''.join(iter_decoded_text(chunks))
+            finally:
+                if body is not None:
+                    body.close()
+            return json.loads(json_text)
         elif 'raw_content' in artifact:
             # From artifacts table
             if isinstance(artifact['raw_content'], dict):
@@ -38,79 +178,114 @@ class JSONExtractorComponent(BaseExtractor):
                 if 'content' in artifact['raw_content']:
                     # Wrapped format: {content: "..."}
                     content = artifact['raw_content']['content']
-                    json_data = json.loads(content) if isinstance(content, str) else content
-                else:
-                    json_data = artifact['raw_content']
+                    return json.loads(content) if isinstance(content, str) else content
+                return artifact['raw_content']
             elif isinstance(artifact['raw_content'], str):
-                json_data = json.loads(artifact['raw_content'])
+                return json.loads(artifact['raw_content'])
             else:
                 raise ValueError(f"Unknown raw_content format: {type(artifact['raw_content'])}")
         else:
             raise ValueError("Artifact missing content")
 
-        # Get field selectors from template
-        selectors = self.template.get('selectors', {}).get('fields', {})
-
-        if not selectors:
-            self.logger.warning("No selectors defined in template")
-            return []
+    def _get_field_plan(self) -> List[Tuple[str, Dict[str, Any], Any]]:
+        """
+        (field name, selector, compiled JSONPath or None) for every template field
 
-        # Extract data using JSONPath
-        records = []
+        Compiled once per run; invalid non-array paths are reported once and
+        extract as None. Array paths are compiled when used, so an invalid one
+        fails each artifact as before.
+        """
+        if self._field_plan is None:
+            selectors = self.template.get('selectors', {}).get('fields', {})
+            plan = []
+            for field_name, selector in selectors.items():
+                json_path = selector.get('jsonPath', '')
+                expr = None
+                if json_path and not selector.get('isArray', False):
+                    try:
+                        expr = compile_jsonpath(json_path)
+                    except Exception as e:
+                        self.logger.warning(f"Error extracting field with path {json_path}: {e}")
+                plan.append((field_name, selector, expr))
+            self._field_plan = plan
+        return self._field_plan
 
-        # Check if any field is an array (indicates multiple records)
-        is_multi_record = any(
-            selector.get('isArray', False)
-            for selector in selectors.values()
+    def _array_selector(self) -> Optional[Dict[str, Any]]:
+        """Selector of the first array field (indicates multiple records)"""
+        return next(
+            (selector for _, selector, _ in self._get_field_plan() if selector.get('isArray', False)),
+            None
         )
 
-        if is_multi_record:
-            # Extract array of records
-            # Find the array field and determine record count
-            array_field = next(
-                (name for name, sel in selectors.items() if sel.get('isArray', False)),
-                None
-            )
-
-            if array_field:
-                array_path = selectors[array_field]['jsonPath']
-                jsonpath_expr = parse(array_path)
-                matches = jsonpath_expr.find(json_data)
-
-                if matches:
-                    array_values = matches[0].value
-                    if isinstance(array_values, list):
-                        # Create one record per array element
-                        for i, item in enumerate(array_values):
-                            record = {}
-                            for field_name, selector in selectors.items():
-                                if selector.get('isArray', False):
-                                    # Use the array item directly
-                                    record[field_name] = item
-                                else:
-                                    # Evaluate path on root JSON
-                                    record[field_name] = self._extract_field(json_data, selector)
-                            records.append(record)
-        else:
+    def _can_stream_array(self, artifact: Dict[str, Any]) -> bool:
+        """True if records are the top-level array of an S3 document and nothing else reads the root"""
+        if 'open_body' not in artifact and 'content' not in artifact:
+            return False
+
+        array_selector = self._array_selector()
+        if array_selector is None or array_selector.get('jsonPath', '').strip() != ROOT_PATH:
+            return False
+
+        return all(expr is None for _, _, expr in self._get_field_plan())
+
+    def _iter_records(self, json_data: Any) -> Iterator[Dict[str, Any]]:
+        """Yield records from a parsed document"""
+        plan = self._get_field_plan()
+        array_selector = self._array_selector()
+
+        if array_selector is None:
             # Extract single record
-            record = {}
-            for field_name, selector in selectors.items():
-                record[field_name] = self._extract_field(json_data, selector)
-            records.append(record)
+            yield {
+                field_name: self._extract_field(json_data, expr, selector)
+                for field_name, selector, expr in plan
+            }
+            return
+
+        # Extract array of records
+        matches = compile_jsonpath(array_selector['jsonPath']).find(json_data)
+        if not matches or not isinstance(matches[0].value, list):
+            return
 
-        self.logger.info(f"Extracted {len(records)} records from JSON")
-        return records
+        # Root-level fields are the same for every element
+        constants = {
+            field_name: self._extract_field(json_data, expr, selector)
+            for field_name, selector, expr in plan
+            if not selector.get('isArray', False)
+        }
+        yield from self._element_records(matches[0].value, constants)
+
+    def _iter_streamed_records(self, artifact: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield one record per element of a top-level array read incrementally"""
+        # No root-level field has a path, so every non-array field is None
+        constants = {
+            field_name: None
+            for field_name, selector, _ in self._get_field_plan()
+            if not selector.get('isArray', False)
+        }
+
+        chunks, body = open_byte_chunks(artifact)
+        try:
+            yield from self._element_records(iter_json_array(iter_decoded_text(chunks)), constants)
+        finally:
+            if body is not None:
+                body.close()
 
-    def _extract_field(self, json_data: Any, selector: Dict[str, Any]) -> Any:
-        """Extract a single field value using JSONPath"""
-        json_path = selector.get('jsonPath', '')
+    def _element_records(self, items, constants: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Create one record per array element"""
+        plan = self._get_field_plan()
+        for item in items:
+            yield {
+                field_name: constants[field_name] if field_name in constants else item
+                for field_name, _, _ in plan
+            }
 
-        if not json_path:
+    def _extract_field(self, json_data: Any, expr: Any, selector: Dict[str, Any]) -> Any:
+        """Extract a single field value using a compiled JSONPath"""
+        if expr is None:
             return None
 
         try:
-            jsonpath_expr = parse(json_path)
-            matches = jsonpath_expr.find(json_data)
+            matches = expr.find(json_data)
 
             if matches:
                 value = matches[0].value
@@ -119,31 +294,5 @@ class JSONExtractorComponent(BaseExtractor):
             else:
                 return None
         except Exception as e:
-            self.logger.warning(f"Error extracting field with path {json_path}: {e}")
+            self.logger.warning(f"Error extracting field with path {selector.get('jsonPath', '')}: {e}")
             return None
-
-
-# Dagster job configuration
-class JSONExtractionConfig(Config):
-    """Configuration for JSON extraction job"""
-    entity_id: str
-    template_id: str
-    source_id: str
-
-
-@op(out=Out(Dict[str, Any]))
-def run_json_extraction(config: JSONExtractionConfig) -> Dict[str, Any]:
-    """Dagster op to run JSON extraction"""
-    extractor = JSONExtractorComponent({
-        'entity_id': config.entity_id,
-        'template_id': config.template_id,
-        'source_id': config.source_id,
-    })
-
-    return extractor.run()
-
-
-@job
-def json_extraction_job():
-    """Dagster job for JSON extraction"""
-    run_json_extraction()
@@ -0,0 +1,119 @@
+"""
+Extraction Ledger
+
+Tracks which source items have already been extracted for an
+(entity, template, source) combination so incremental runs can skip them:
+- S3 objects are keyed by object key, versioned by ETag + LastModified
+- Artifacts are keyed by artifact id, versioned by updated_at
+
+Backed by the extraction_ledger table (migration 013).
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+LEDGER_TABLE = 'extraction_ledger'
+LEDGER_PAGE_SIZE = 1000
+
+
+def ledger_entry(artifact: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Return (item_key, item_version) for an S3 object or artifact row, or None"""
+    if 's3_key' in artifact:
+        return (artifact['s3_key'], f"{artifact.get('etag', '')}@{artifact.get('last_modified', '')}")
+
+    if artifact.get('id'):
+        return (str(artifact['id']), str(artifact.get('updated_at', '')))
+
+    return None
+
+
+class ExtractionLedger:
+    """Processed-item ledger for one (entity, template, source)"""
+
+    def __init__(self, supabase, entity_id: str, template_id: str, source_id: str, logger):
+        self.supabase = supabase
+        self.entity_id = entity_id
+        self.template_id = template_id
+        self.source_id = source_id
+        self.logger = logger
+
+        self._seen: Dict[str, str] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self.enabled = True
+
+    def load(self) -> 'ExtractionLedger':
+        """Read previously processed items; disables the ledger if the table is missing"""
+        offset = 0
+
+        try:
+            while True:
+                response = self.supabase.table(LEDGER_TABLE)\
+                    .select('item_key,item_version')\
+                    .eq('entity_id', self.entity_id)\
+                    .eq('template_id', self.template_id)\
+                    .eq('source_id', self.source_id)\
+                    .order('item_key')\
+                    .range(offset, offset + LEDGER_PAGE_SIZE - 1)\
+                    .execute()
+
+                rows = response.data or []
+                for row in rows:
+                    self._seen[row['item_key']] = row['item_version']
+
+                if len(rows) < LEDGER_PAGE_SIZE:
+                    break
+                offset += LEDGER_PAGE_SIZE
+        except Exception as e:
+            self.logger.warning(f"Extraction ledger unavailable, processing all items: {e}")
+            self.enabled = False
+
+        self.logger.info(f"Extraction ledger: {len(self._seen)} items previously processed")
+        return self
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def is_processed(self, item_key: str, item_version: str) -> bool:
+        return self.enabled and self._seen.get(item_key) == item_version
+
+    def mark(self, item_key: str, item_version: str, records_extracted: int):
+        """Stage an item as processed (written on commit)"""
+        if not self.enabled:
+            return
+
+        self._pending[item_key] = {
+            'entity_id': self.entity_id,
+            'template_id': self.template_id,
+            'source_id': self.source_id,
+            'item_key': item_key,
+            'item_version': item_version,
+            'records_extracted': records_extracted,
+            'processed_at': 'now()',
+        }
+
+    def commit(self) -> int:
+        """Upsert staged items, returning the number written"""
+        if not self.enabled or not self._pending:
+            return 0
+
+        rows: List[Dict[str, Any]] = list(self._pending.values())
+        written = 0
+
+        for i in range(0, len(rows), LEDGER_PAGE_SIZE):
+            batch = rows[i:i + LEDGER_PAGE_SIZE]
+            try:
+                self.supabase.table(LEDGER_TABLE)\
+                    .upsert(batch, on_conflict='entity_id,template_id,source_id,item_key')\
+                    .execute()
+                written += len(batch)
+            except Exception as e:
+                self.logger.error(f"Error writing extraction ledger: {e}")
+
+        for row in rows:
+            self._seen[row['item_key']] = row['item_version']
+        self._pending.clear()
+
+        return written
+
+    def discard(self):
+        """Drop staged items (e.g. when loading failed)"""
+        self._pending.clear()
@@ -0,0 +1,20 @@
+"""
+Pipeline Logger
+
+Components log through Dagster's logger when running inside Dagster and
+through a standard library logger otherwise, so the CLI never imports
+Dagster just to log.
+"""
+
+import sys
+import logging
+
+LOGGER_NAME = 'inspector_dom.pipelines'
+
+
+def get_logger():
+    """Dagster's logger if Dagster is loaded, else the 'inspector_dom.pipelines' logger"""
+    if 'dagster' in sys.modules:
+        from dagster import get_dagster_logger
+        return get_dagster_logger()
+    return logging.getLogger(LOGGER_NAME)
@@ -0,0 +1,159 @@
+"""
+PostgreSQL COPY Loader
+
+Bulk-loads extracted records straight into Postgres (DATABASE_URL),
+bypassing PostgREST:
+- Records are streamed with COPY ... FROM STDIN into a temp staging table
+- Staging rows are merged into the entity table in one INSERT ... SELECT
+- Optional ON CONFLICT handling on a natural key
+- Optional delete of the rows being replaced (replace_where), committed
+  together with the insert
+
+PostgREST (supabase.table(...).insert()) remains the fallback when
+DATABASE_URL is not set or psycopg is not installed.
+"""
+
+import os
+from typing import Dict, List, Any, Optional, Sequence
+
+
+def copy_loader_available(dsn: Optional[str] = None) -> bool:
+    """True if a direct Postgres connection can be used for loading"""
+    if not (dsn or os.getenv('DATABASE_URL')):
+        return False
+
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+class PostgresCopyLoader:
+    """Load records into entity tables with COPY + merge"""
+
+    def __init__(self, dsn: Optional[str] = None, logger=None):
+        """
+        Args:
+            dsn: Postgres connection string (defaults to DATABASE_URL)
+            logger: Logger for progress messages (optional)
+        """
+        self.dsn = dsn or os.getenv('DATABASE_URL')
+        if not self.dsn:
+            raise ValueError("Missing DATABASE_URL for COPY loader")
+
+        self.logger = logger
+        self._conn = None
+
+    def _connect(self):
+        import psycopg
+
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg.connect(self.dsn)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def load(
+        self,
+        table_name: str,
+        records: List[Dict[str, Any]],
+        conflict_columns: Optional[Sequence[str]] = None,
+        replace_where: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        COPY records into a staging table and merge them into table_name
+
+        Args:
+            table_name: Target entity table
+            records: List of dicts keyed by column name
+            conflict_columns: Natural key; if given, existing rows are updated
+                              (ON CONFLICT ... DO UPDATE) instead of duplicated
+            replace_where: Column -> value filter; matching rows are deleted in
+                           the same transaction as the insert, so readers never
+                           see the table without them
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not records:
+            return 0
+
+        from psycopg import sql
+        from psycopg.types.json import Jsonb
+
+        # Column order: first appearance across the batch
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        if not columns:
+            # Only empty records: nothing to COPY (an empty column list is invalid SQL)
+            if self.logger:
+                self.logger.warning(f"Skipped {len(records)} empty records for {table_name}")
+            return 0
+
+        table = sql.Identifier(table_name)
+        stage = sql.Identifier(f"_stage_{table_name}")
+        column_list = sql.SQL(', ').join(sql.Identifier(c) for c in columns)
+
+        conn = self._connect()
+        with conn.transaction():
+            with conn.cursor() as cur:
+                # Staging table mirrors the target's column types
+                cur.execute(sql.SQL(
+                    "CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                ).format(stage=stage, table=table))
+
+                with cur.copy(sql.SQL("COPY {stage} ({columns}) FROM STDIN").format(
+                    stage=stage, columns=column_list
+                )) as copy:
+                    for record in records:
+                        copy.write_row([
+                            Jsonb(value) if isinstance(value, (dict, list)) else value
+                            for value in (record.get(c) for c in columns)
+                        ])
+
+                merge = sql.SQL("INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage}").format(
+                    table=table, columns=column_list, stage=stage
+                )
+
+                if conflict_columns:
+                    updates = [c for c in columns if c not in conflict_columns]
+                    conflict = sql.SQL(', ').join(sql.Identifier(c) for c in conflict_columns)
+                    if updates:
+                        merge += sql.SQL(" ON CONFLICT ({conflict}) DO UPDATE SET {updates}").format(
+                            conflict=conflict,
+                            updates=sql.SQL(', ').join(
+                                sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(c))
+                                for c in updates
+                            ),
+                        )
+                    else:
+                        merge += sql.SQL(" ON CONFLICT ({conflict}) DO NOTHING").format(conflict=conflict)
+
+                if replace_where:
+                    cur.execute(
+                        sql.SQL("DELETE FROM {table} WHERE {condition}").format(
+                            table=table,
+                            condition=sql.SQL(' AND ').join(
+                                sql.SQL("{col} = %s").format(col=sql.Identifier(c)) for c in replace_where
+                            ),
+                        ),
+                        list(replace_where.values()),
+                    )
+
+                cur.execute(merge)
+                loaded = cur.rowcount
+
+        if self.logger:
+            self.logger.info(f"COPY loaded {loaded} records into {table_name}")
+
+        return loaded
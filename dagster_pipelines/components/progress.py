@@ -0,0 +1,111 @@
+"""
+Progress Reporter
+
+Coalesces extractor progress callbacks into background writes:
+- update() only records the latest state and never blocks the extraction loop
+- A daemon thread writes at most one update per interval; close() flushes the last one
+- Messages are suffixed with throughput (artifacts/s, records/s) and ETA
+"""
+
+import time
+import threading
+from typing import Callable, Optional
+
+DEFAULT_PROGRESS_INTERVAL_SECONDS = 2.0
+
+
+def format_duration(seconds: float) -> str:
+    """Compact duration: 42s, 3m05s, 1h02m"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class ProgressReporter:
+    """Write the latest progress in the background, at most once per interval"""
+
+    def __init__(
+        self,
+        write: Callable[[int, int, str], None],
+        interval: float = DEFAULT_PROGRESS_INTERVAL_SECONDS,
+        logger=None,
+    ):
+        """
+        Args:
+            write: Called as write(current, total, message) from the reporter thread
+            interval: Minimum seconds between writes
+            logger: Logger for write failures (optional)
+        """
+        self.write = write
+        self.interval = max(0.0, interval)
+        self.logger = logger
+        self.writes = 0
+
+        self._started_at = time.monotonic()
+        self._state = None  # (current, total, message, records) not yet written
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def update(self, current: int, total: int, message: str, records: Optional[int] = None):
+        """Record progress; returns immediately (extractor update_progress callback)"""
+        with self._lock:
+            self._state = (current, total, message, records)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='progress-reporter', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def close(self):
+        """Stop the reporter thread and write any update it has not written yet"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            self._flush()
+
+            # Coalesce everything reported during the interval into the next write
+            self._stop.wait(self.interval)
+
+    def _flush(self):
+        with self._lock:
+            state, self._state = self._state, None
+        if state is None:
+            return
+
+        current, total, message, records = state
+        try:
+            self.write(current, total, self.format_message(current, total, message, records))
+            self.writes += 1
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Failed to report progress: {e}")
+
+    def format_message(self, current: int, total: int, message: str, records: Optional[int] = None) -> str:
+        """Message with throughput and, when the total is known, ETA"""
+        elapsed = time.monotonic() - self._started_at
+        if elapsed <= 0 or current <= 0:
+            return message
+
+        artifact_rate = current / elapsed
+        stats = [f"{artifact_rate:.1f} artifacts/s"]
+        if records is not None:
+            stats.append(f"{records / elapsed:.0f} records/s")
+        if total and current < total:
+            stats.append(f"ETA {format_duration((total - current) / artifact_rate)}")
+
+        return f"{message} · {', '.join(stats)}"
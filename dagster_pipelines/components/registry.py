@@ -0,0 +1,58 @@
+"""
+Extractor Registry
+
+Maps artifact types to extractor classes and imports each extractor module
+only when its type is first requested, so a CSV run never imports the
+HTML/email/JSON extractors (or their lxml, httpx and jsonpath dependencies).
+"""
+
+from importlib import import_module
+from typing import Dict, List, Tuple, Type
+
+# artifact type -> (module relative to this package, class name)
+EXTRACTORS: Dict[str, Tuple[str, str]] = {
+    'json': ('.json_extractor', 'JSONExtractorComponent'),
+    'csv': ('.csv_extractor', 'CSVExtractorComponent'),
+    'html': ('.html_extractor', 'HTMLExtractorComponent'),
+    'email': ('.email_extractor', 'EmailExtractorComponent'),
+}
+
+# Artifact types with no extractor here, and where they are extracted instead
+UNSUPPORTED: Dict[str, str] = {
+    'pdf': 'PDFs are extracted with Textract by the generated Dagster pipelines, not by run_extraction.py',
+}
+
+_loaded: Dict[str, Type] = {}
+
+
+def artifact_types() -> List[str]:
+    """Artifact types with a registered extractor"""
+    return list(EXTRACTORS)
+
+
+def is_supported(artifact_type: str) -> bool:
+    return artifact_type in EXTRACTORS
+
+
+def unsupported_message(artifact_type: str) -> str:
+    """Error for an artifact type without an extractor (with the reason, if known)"""
+    reason = UNSUPPORTED.get(artifact_type)
+    return f'Unsupported artifact type: {artifact_type}' + (f' ({reason})' if reason else '')
+
+
+def get_extractor_class(artifact_type: str) -> Type:
+    """
+    Extractor class for an artifact type, importing its module on first use
+
+    Raises:
+        ValueError: if no extractor is registered for the type
+    """
+    extractor_class = _loaded.get(artifact_type)
+    if extractor_class is None:
+        if artifact_type not in EXTRACTORS:
+            raise ValueError(unsupported_message(artifact_type))
+
+        module_name, class_name = EXTRACTORS[artifact_type]
+        extractor_class = getattr(import_module(module_name, __package__), class_name)
+        _loaded[artifact_type] = extractor_class
+    return extractor_class
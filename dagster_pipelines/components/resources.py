@@ -0,0 +1,17 @@
+"""
+Dagster Resources
+
+- ClientsResource: the shared Supabase/S3/Textract clients (see clients.py)
+  as a configurable resource for ops and assets
+"""
+
+from typing import Optional
+from dagster import ConfigurableResource
+from .clients import ClientAccessors, DEFAULT_HTTP_POOL_SIZE
+
+
+class ClientsResource(ConfigurableResource, ClientAccessors):
+    """Dagster resource handing out the shared clients"""
+
+    http_pool_size: int = DEFAULT_HTTP_POOL_SIZE
+    aws_region: Optional[str] = None
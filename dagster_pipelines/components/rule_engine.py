@@ -0,0 +1,226 @@
+"""
+Cascade Rule Extraction Engine
+
+Python port of the xpath → css → regex cascade in src/lib/rule-extraction.ts:
+- Layer 1: Structural (XPath, then CSS selector translated to XPath)
+- Layer 2: Pattern (primary regex, then fallback regex)
+- Layer 3: AI fallback, triggered by the caller for fields still empty
+
+Selectors are compiled once per template (XPath objects, CSS → XPath,
+compiled regexes); each document is parsed once and shared by every field.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from lxml import etree, html as lxml_html
+from .logger import get_logger
+
+logger = get_logger()
+
+# JS named groups (?<name>...) → Python (?P<name>...)
+_JS_NAMED_GROUP_RE = re.compile(r'\(\?<(?![=!])')
+
+
+def compile_js_regex(pattern: str):
+    """Compile a JavaScript regex source with the 'i' flag used by the TS engine"""
+    return re.compile(_JS_NAMED_GROUP_RE.sub('(?P<', pattern), re.IGNORECASE)
+
+
+def template_field_names(template: Dict[str, Any]) -> List[str]:
+    """Field names from template['fields'] (names or {name, ...} dicts)"""
+    names = []
+    for field in template.get('fields') or []:
+        name = field.get('name') if isinstance(field, dict) else field
+        if name:
+            names.append(name)
+    return names
+
+
+class CompiledField:
+    """One field's cascade, compiled"""
+
+    def __init__(self, name: str, selector: Dict[str, Any]):
+        self.name = name
+        self.xpath = None
+        self.css = None
+        self.checkbox_input_type = None
+        self.patterns: List[Tuple[Any, str]] = []
+        self.group = 1
+
+        structural = selector.get('structural') or {}
+        checkbox_config = structural.get('checkboxConfig')
+
+        # For checkbox/radio fields, skip XPath and use CSS directly (more reliable)
+        if structural.get('xpath') and not checkbox_config:
+            try:
+                self.xpath = etree.XPath(structural['xpath'])
+            except etree.XPathSyntaxError as e:
+                logger.warning(f"⚠️  [{name}] Invalid XPath {structural['xpath']!r}: {e}")
+
+        if structural.get('cssSelector'):
+            try:
+                from lxml.cssselect import CSSSelector
+                self.css = CSSSelector(structural['cssSelector'], translator='html')
+                if checkbox_config:
+                    self.checkbox_input_type = checkbox_config.get('inputType', 'checkbox')
+            except Exception as e:
+                logger.warning(f"⚠️  [{name}] CSS selector unusable {structural['cssSelector']!r}: {e}")
+
+        pattern = selector.get('pattern') or {}
+        self.group = pattern.get('group', 1)
+        for key, method in (('primary', 'regex'), ('fallback', 'regex_fallback')):
+            if pattern.get(key):
+                try:
+                    self.patterns.append((compile_js_regex(pattern[key]), method))
+                except re.error as e:
+                    logger.warning(f"⚠️  [{name}] Invalid {key} regex: {e}")
+
+    def extract(self, doc, content: str) -> Tuple[Optional[str], str]:
+        """Run the cascade; returns (value, method) with method 'failed' if nothing matched"""
+        # ═════ LAYER 1: STRUCTURAL (XPath/CSS) ═════
+        if self.xpath is not None and doc is not None:
+            try:
+                value = _first_text(self.xpath(doc))
+                if value:
+                    return value, 'xpath'
+            except etree.XPathEvalError as e:
+                logger.warning(f"⚠️  [{self.name}] XPath failed: {e}")
+
+        if self.css is not None and doc is not None:
+            matches = self.css(doc)
+            if self.checkbox_input_type:
+                value = _checkbox_labels(doc, matches, self.checkbox_input_type)
+            else:
+                value = matches[0].text_content().strip() if matches else None
+            if value:
+                return value, 'css'
+
+        # ═════ LAYER 2: PATTERN (Regex) ═════
+        for regex, method in self.patterns:
+            match = regex.search(content)
+            if match:
+                try:
+                    value = match.group(self.group)
+                except IndexError:
+                    value = None
+                if value:
+                    return value.strip(), method
+
+        return None, 'failed'
+
+
+class RuleEngine:
+    """Compiled cascade rules for one template"""
+
+    def __init__(self, selectors: Dict[str, Any]):
+        self.fields = [
+            CompiledField(name, selector or {})
+            for name, selector in (selectors.get('fields') or {}).items()
+        ]
+
+    @classmethod
+    def from_template(cls, template: Dict[str, Any]) -> Optional['RuleEngine']:
+        """RuleEngine for a template, or None if it has no cascade field selectors"""
+        selectors = template.get('selectors') or {}
+        if not isinstance(selectors, dict) or not selectors.get('fields'):
+            return None
+        return cls(selectors)
+
+    def extract(self, content: str) -> Tuple[Dict[str, Optional[str]], Dict[str, str]]:
+        """
+        Extract every field with a selector from an HTML document
+
+        Returns:
+            tuple: ({field: value or None}, {field: method})
+        """
+        doc = parse_html(content)
+
+        values = {}
+        methods = {}
+        for field in self.fields:
+            values[field.name], methods[field.name] = field.extract(doc, content)
+
+        return values, methods
+
+
+def parse_html(content: str):
+    """Parse an HTML document once (None if it cannot be parsed)"""
+    if not content or not content.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        # ValueError: str input with an XML encoding declaration
+        try:
+            return lxml_html.document_fromstring(content.encode('utf-8'))
+        except etree.ParserError:
+            return None
+
+
+def _first_text(result) -> Optional[str]:
+    """Text of the first XPath result (element, attribute or string)"""
+    if isinstance(result, list):
+        if not result:
+            return None
+        result = result[0]
+
+    if hasattr(result, 'text_content'):
+        return result.text_content().strip()
+    if isinstance(result, etree._Element):
+        return ''.join(result.itertext()).strip()
+    if result is None or isinstance(result, bool):
+        return None
+    return str(result).strip()
+
+
+def _checkbox_labels(doc, inputs: List[Any], input_type: str) -> Optional[str]:
+    """
+    Label text of checked checkbox/radio inputs (same lookup order as the TS engine)
+    """
+    labels = []
+
+    for element in inputs:
+        label_text = ''
+
+        # Method 1: <label for="id">
+        input_id = element.get('id')
+        if input_id:
+            for label in doc.iter('label'):
+                if label.get('for') == input_id:
+                    label_text = label.text_content().strip()
+                    break
+
+        # Method 2: input inside a <label>
+        if not label_text:
+            parent_label = next((a for a in element.iterancestors('label')), None)
+            if parent_label is not None:
+                label_text = parent_label.text_content().strip()
+
+        # Method 3: adjacent label or short text in the next sibling element
+        if not label_text:
+            sibling = element.getnext()
+            if sibling is not None and isinstance(sibling.tag, str):
+                sibling_text = sibling.text_content().strip()
+                if sibling.tag == 'label' or (sibling_text and len(sibling_text) < 100):
+                    label_text = sibling_text
+
+        # Method 4: short text of the parent element
+        if not label_text:
+            parent = element.getparent()
+            if parent is not None:
+                parent_text = parent.text_content().strip()
+                if parent_text and len(parent_text) < 100:
+                    label_text = parent_text
+
+        # Method 5: value / name attribute
+        if not label_text:
+            label_text = element.get('value') or element.get('name') or ''
+
+        if label_text:
+            labels.append(label_text)
+
+    if not labels:
+        return None
+
+    # Radio buttons yield one value, checkboxes a comma-separated list
+    return labels[0] if input_type == 'radio' else ', '.join(labels)
@@ -0,0 +1,105 @@
+"""
+Incremental Artifact Readers
+
+Shared by extractors that parse while reading (CSV, JSON):
+- S3 bodies and in-memory bytes are read as fixed-size byte chunks
+- Chunks are decoded with an incremental UTF-8 decoder, so characters split
+  across chunk boundaries are kept whole
+- RecordSpool holds one artifact's records (in memory, spilling to a temp
+  file past a size limit) until the artifact has been read to the end
+"""
+
+import codecs
+import pickle
+import tempfile
+from typing import Any, Dict, Iterator, Tuple
+
+# Bytes read from an S3 body per chunk
+READ_CHUNK_BYTES = 1024 * 1024  # 1 MB
+
+# Spooled records kept in memory before spilling to disk
+DEFAULT_SPOOL_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+
+def open_byte_chunks(artifact: Dict[str, Any]) -> Tuple[Iterator[bytes], Any]:
+    """
+    Byte chunks of an S3 artifact ('open_body' or downloaded 'content')
+
+    Returns:
+        tuple: (chunks, S3 body to close when done or None)
+    """
+    if 'open_body' in artifact:
+        body = artifact['open_body']()
+        return body.iter_chunks(READ_CHUNK_BYTES), body
+    return iter_byte_chunks(artifact['content']), None
+
+
+def iter_byte_chunks(content: bytes) -> Iterator[memoryview]:
+    """Slice an in-memory body into read-sized chunks without copying it"""
+    view = memoryview(content)
+    for offset in range(0, len(view), READ_CHUNK_BYTES):
+        yield view[offset:offset + READ_CHUNK_BYTES]
+
+
+def iter_decoded_text(chunks: Iterator[bytes]) -> Iterator[str]:
+    """Decode UTF-8 byte chunks incrementally into text chunks"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_decoded_lines(chunks: Iterator[bytes]) -> Iterator[str]:
+    """
+    Decode UTF-8 byte chunks incrementally and yield lines (with line endings)
+
+    Lines are split on newline characters only, as io.StringIO does for csv.reader.
+    """
+    tail = ''
+    for text in iter_decoded_text(chunks):
+        lines = (tail + text).split('\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line + '\n'
+
+    if tail:
+        yield tail
+
+
+class RecordSpool:
+    """
+    Write-once buffer of records, replayed in order
+
+    Records are pickled into a SpooledTemporaryFile, so a large artifact is
+    held on disk rather than in memory once it passes max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_SPOOL_MAX_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_bytes)
+        self._max_bytes = max_bytes
+        self.count = 0
+        self.spilled = False
+
+    def append(self, record: Dict[str, Any]):
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+        self.spilled = self.spilled or self._file.tell() > self._max_bytes
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._file.seek(0)
+        for _ in range(self.count):
+            yield pickle.load(self._file)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
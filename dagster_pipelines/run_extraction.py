@@ -7,22 +7,45 @@ Called by Next.js API to run pipelines
 
 Usage:
     python run_extraction.py --entity-id UUID --template-id UUID --source-id UUID
+    python run_extraction.py ... --streaming --load-batch-size 500
+    python run_extraction.py ... --full-refresh
+    python run_extraction.py ... --ai-max-in-flight 8 --ai-request-timeout 120
+    python run_extraction.py ... --ai-cache off
+    python run_extraction.py ... --job-id UUID --progress-interval 5
+
+Worker mode (long-lived process with warm clients, claims queued pipeline_jobs
+rows from DATABASE_URL instead of being spawned per run):
+    python run_extraction.py --worker --concurrency 4 --health-port 8081
+    python run_extraction.py --worker --health-host 0.0.0.0   # probe from outside the host/container
+    python run_extraction.py --worker --lease-seconds 300
 """
 
 import sys
 import json
+import time
+import socket
+import signal
 import argparse
+import logging
 import os
-from supabase import create_client, Client
-from components.json_extractor import JSONExtractorComponent
-from components.csv_extractor import CSVExtractorComponent
-from components.html_extractor import HTMLExtractorComponent
-from components.email_extractor import EmailExtractorComponent
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from supabase import Client
+from components.clients import SharedClients, get_supabase_client
+from components.logger import LOGGER_NAME
+from components.progress import ProgressReporter, DEFAULT_PROGRESS_INTERVAL_SECONDS
+from components.registry import get_extractor_class, is_supported, unsupported_message
+from components.job_queue import PipelineJobQueue, DEFAULT_LEASE_SECONDS
+
+# Shared, pooled clients for this process (extractors reuse the same pools)
+clients = SharedClients()
 
-# Initialize Supabase client for progress updates
+# Supabase client for progress updates
 SUPABASE_URL = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
 SUPABASE_KEY = os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+supabase: Client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
 
 def update_job_progress(job_id, current, total, message, status='running'):
     """Update pipeline job progress in database"""
@@ -41,61 +64,53 @@ def update_job_progress(job_id, current, total, message, status='running'):
         print(f"Warning: Failed to update job progress: {e}", file=sys.stderr)
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Run data extraction pipeline')
-    parser.add_argument('--entity-id', required=True, help='Target entity ID')
-    parser.add_argument('--template-id', required=True, help='Template ID with extraction rules')
-    parser.add_argument('--source-id', required=True, help='Source ID to fetch data from')
-    parser.add_argument('--artifact-type', required=True, help='Artifact type (json, csv, html, pdf, email)')
-    parser.add_argument('--job-id', required=False, help='Pipeline job ID for progress tracking')
+# Worker defaults
+DEFAULT_WORKER_CONCURRENCY = 4
+DEFAULT_WORKER_POLL_INTERVAL = 2.0  # seconds between claims when the queue is empty
+DEFAULT_WORKER_HEALTH_HOST = '127.0.0.1'  # set 0.0.0.0 to expose /health beyond the host
+DEFAULT_WORKER_HEALTH_PORT = 8081
 
-    args = parser.parse_args()
 
-    config = {
-        'entity_id': args.entity_id,
-        'template_id': args.template_id,
-        'source_id': args.source_id,
-    }
-
-    # Select appropriate extractor based on artifact type
-    extractor_map = {
-        'json': JSONExtractorComponent,
-        'csv': CSVExtractorComponent,
-        'html': HTMLExtractorComponent,
-        'email': EmailExtractorComponent,
-        # TODO: Add PDF when ready
-    }
-
-    extractor_class = extractor_map.get(args.artifact_type)
-
-    if not extractor_class:
-        print(json.dumps({
-            'success': False,
-            'error': f'Unsupported artifact type: {args.artifact_type}'
-        }))
-        sys.exit(1)
+def run_job(config: Dict[str, Any], artifact_type: str, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one extraction and record its outcome on the pipeline job
 
+    Raises:
+        Exception from the extractor, after the job has been marked failed
+    """
     try:
         # Update job status to running
-        if args.job_id:
-            update_job_progress(args.job_id, 0, 0, 'Starting extraction...', 'running')
+        if job_id:
+            update_job_progress(job_id, 0, 0, 'Starting extraction...', 'running')
+
+        # Unsupported types (e.g. pdf, or a job row without one) fail the job
+        extractor_class = get_extractor_class(artifact_type)
 
         # Create extractor and run
-        extractor = extractor_class(config)
+        extractor = extractor_class(config, clients=clients)
 
-        # Pass job_id to extractor for progress updates
-        if args.job_id:
-            extractor.job_id = args.job_id
-            extractor.update_progress = lambda current, total, msg: update_job_progress(
-                args.job_id, current, total, msg, 'running'
+        # Pass job_id to extractor for progress updates (written in the
+        # background, at most once per progress_interval)
+        reporter = None
+        if job_id:
+            extractor.job_id = job_id
+            reporter = ProgressReporter(
+                lambda current, total, msg: update_job_progress(job_id, current, total, msg, 'running'),
+                interval=float(config.get('progress_interval') or DEFAULT_PROGRESS_INTERVAL_SECONDS),
             )
+            extractor.update_progress = reporter.update
 
-        result = extractor.run()
+        try:
+            result = extractor.run()
+        finally:
+            # Final progress lands before the completed/failed status below
+            if reporter is not None:
+                reporter.close()
 
         # Mark job as completed
-        if args.job_id:
+        if job_id:
             update_job_progress(
-                args.job_id,
+                job_id,
                 result.get('artifacts_processed', 0),
                 result.get('artifacts_processed', 0),
                 f"Completed: {result.get('records_loaded', 0)} records loaded",
@@ -106,26 +121,284 @@ def main():
             supabase.table('pipeline_jobs').update({
                 'completed_at': 'now()',
                 'result': result
-            }).eq('id', args.job_id).execute()
+            }).eq('id', job_id).execute()
 
-        # Return success result as JSON
-        print(json.dumps({
-            'success': True,
-            **result
-        }))
-        sys.exit(0)
+        return result
 
     except Exception as e:
         # Mark job as failed
-        if args.job_id:
+        if job_id:
             update_job_progress(
-                args.job_id, 0, 0, f'Error: {str(e)}', 'failed'
+                job_id, 0, 0, f'Error: {str(e)}', 'failed'
             )
             supabase.table('pipeline_jobs').update({
                 'completed_at': 'now()',
                 'error': str(e)
-            }).eq('id', args.job_id).execute()
+            }).eq('id', job_id).execute()
+        raise
+
+
+class WorkerState:
+    """Counters shared by the worker loop, job threads and the health endpoint"""
+
+    def __init__(self, worker_id: str, concurrency: int, poll_interval: float):
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.started_at = time.time()
+        self.last_poll_at = time.time()
+        self.last_error: Optional[str] = None
+        self.active_jobs: Dict[str, str] = {}  # job id -> artifact type
+        self.completed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+    def health(self) -> Dict[str, Any]:
+        """Health snapshot; unhealthy if the claim loop has stalled"""
+        now = time.time()
+        with self.lock:
+            healthy = now - self.last_poll_at < max(60.0, 5 * self.poll_interval)
+            return {
+                'status': 'ok' if healthy else 'stalled',
+                'worker_id': self.worker_id,
+                'uptime_seconds': round(now - self.started_at),
+                'concurrency': self.concurrency,
+                'active_jobs': list(self.active_jobs),
+                'jobs_completed': self.completed,
+                'jobs_failed': self.failed,
+                'seconds_since_poll': round(now - self.last_poll_at, 1),
+                'last_error': self.last_error,
+            }
+
+
+def start_health_server(state: WorkerState, port: int, host: str = DEFAULT_WORKER_HEALTH_HOST) -> ThreadingHTTPServer:
+    """Serve GET /health (200 while the claim loop is alive, 503 otherwise)"""
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/health'):
+                self.send_error(404)
+                return
+
+            health = state.health()
+            body = json.dumps(health).encode('utf-8')
+            self.send_response(200 if health['status'] == 'ok' else 503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Health probes are too frequent to log
+            pass
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, name='health', daemon=True).start()
+    return server
+
+
+def process_claimed_job(job: Dict[str, Any], state: WorkerState):
+    """Run a claimed job on a worker thread (failures are recorded on the job)"""
+    job_id = job['id']
+    with state.lock:
+        state.active_jobs[job_id] = job['artifact_type']
+
+    try:
+        result = run_job(job['config'], job['artifact_type'], job_id)
+        print(f"Job {job_id} completed: {result.get('records_loaded', 0)} records loaded", file=sys.stderr)
+        with state.lock:
+            state.completed += 1
+    except Exception as e:
+        print(f"Job {job_id} failed: {e}", file=sys.stderr)
+        with state.lock:
+            state.failed += 1
+    finally:
+        with state.lock:
+            state.active_jobs.pop(job_id, None)
+
+
+def renew_leases(queue, state: WorkerState):
+    """
+    Heartbeat this worker's running jobs and fail jobs whose lease ran out
+    for the last time (their workers died on every claim)
+    """
+    with state.lock:
+        job_ids = list(state.active_jobs)
+
+    held = set(queue.heartbeat(job_ids))
+    for job_id in job_ids:
+        if job_id not in held:
+            print(f"Warning: Lost lease on job {job_id} (finished, cancelled or reclaimed)", file=sys.stderr)
+
+    for job_id in queue.fail_expired():
+        print(f"Job {job_id} failed: worker lost on its last allowed claim", file=sys.stderr)
 
+
+def run_worker(
+    concurrency: int,
+    poll_interval: float,
+    health_port: int,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    health_host: str = DEFAULT_WORKER_HEALTH_HOST,
+):
+    """
+    Claim and run queued pipeline jobs until SIGTERM/SIGINT
+
+    Up to `concurrency` jobs run at once on threads sharing this process's
+    warm clients. On shutdown no new jobs are claimed and running jobs finish.
+    Running jobs are heartbeated every lease_seconds / 3, so if this process
+    dies another worker claims them again once the lease expires.
+    """
+    if not supabase:
+        raise ValueError("Worker mode needs NEXT_PUBLIC_SUPABASE_URL and NEXT_PUBLIC_SUPABASE_ANON_KEY for job updates")
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = PipelineJobQueue(worker_id, lease_seconds=lease_seconds)
+    state = WorkerState(worker_id, concurrency, poll_interval)
+    heartbeat_interval = lease_seconds / 3
+    last_heartbeat = 0.0
+    wait_interval = min(poll_interval, heartbeat_interval)
+    server = start_health_server(state, health_port, health_host) if health_port else None
+
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    print(
+        f"Worker {worker_id} started (concurrency={concurrency}"
+        + (f", health on {health_host}:{health_port}" if health_port else '') + ")",
+        file=sys.stderr
+    )
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='pipeline-job')
+    running = set()
+
+    try:
+        while not stop.is_set():
+            with state.lock:
+                state.last_poll_at = time.time()
+
+            if time.time() - last_heartbeat >= heartbeat_interval:
+                try:
+                    renew_leases(queue, state)
+                    last_heartbeat = time.time()
+                except Exception as e:
+                    print(f"Warning: Failed to renew job leases: {e}", file=sys.stderr)
+                    with state.lock:
+                        state.last_error = str(e)
+
+            # Fill free slots
+            job = None
+            try:
+                while len(running) < concurrency:
+                    job = queue.claim()
+                    if job is None:
+                        break
+                    print(f"Claimed job {job['id']} ({job['artifact_type']})", file=sys.stderr)
+                    running.add(pool.submit(process_claimed_job, job, state))
+                with state.lock:
+                    state.last_error = None
+            except Exception as e:
+                print(f"Warning: Failed to claim pipeline job: {e}", file=sys.stderr)
+                with state.lock:
+                    state.last_error = str(e)
+                job = None  # back off before retrying
+
+            if len(running) >= concurrency:
+                # Wake as soon as a slot frees up
+                done, running = wait(running, timeout=wait_interval, return_when=FIRST_COMPLETED)
+            else:
+                running = {future for future in running if not future.done()}
+                if job is None:
+                    stop.wait(wait_interval)
+    finally:
+        print(f"Worker {worker_id} stopping, waiting for {len(running)} running jobs", file=sys.stderr)
+        pool.shutdown(wait=True)
+        queue.close()
+        if server is not None:
+            server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run data extraction pipeline')
+    parser.add_argument('--worker', action='store_true', help='Run as a persistent worker claiming queued pipeline_jobs (needs DATABASE_URL)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_WORKER_CONCURRENCY, help='Jobs run at once in worker mode')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_WORKER_POLL_INTERVAL, help='Seconds between claims when the queue is empty')
+    parser.add_argument('--health-host', default=os.getenv('WORKER_HEALTH_HOST', DEFAULT_WORKER_HEALTH_HOST), help='Address the /health server binds to in worker mode')
+    parser.add_argument('--health-port', type=int, default=int(os.getenv('WORKER_HEALTH_PORT', DEFAULT_WORKER_HEALTH_PORT)), help='Port for GET /health in worker mode (0 disables)')
+    parser.add_argument('--lease-seconds', type=float, default=DEFAULT_LEASE_SECONDS, help='Heartbeat age after which another worker reclaims a running job')
+    parser.add_argument('--entity-id', help='Target entity ID')
+    parser.add_argument('--template-id', help='Template ID with extraction rules')
+    parser.add_argument('--source-id', help='Source ID to fetch data from')
+    parser.add_argument('--artifact-type', help='Artifact type (json, csv, html, pdf, email)')
+    parser.add_argument('--job-id', required=False, help='Pipeline job ID for progress tracking')
+    parser.add_argument('--streaming', action='store_true', help='Load records in batches while extracting (bounded memory)')
+    parser.add_argument('--load-batch-size', type=int, required=False, help='Records per load batch')
+    parser.add_argument('--full-refresh', action='store_true', help='Reprocess items already extracted in previous runs')
+    parser.add_argument('--ai-max-in-flight', type=int, required=False, help='Concurrent AI extraction requests (html, email)')
+    parser.add_argument('--ai-request-timeout', type=int, required=False, help='Deadline in seconds per AI extraction request')
+    parser.add_argument('--progress-interval', type=float, required=False, help='Minimum seconds between job progress writes (default 2)')
+    parser.add_argument('--ai-cache', choices=['sqlite', 'postgres', 'off'], required=False, help='AI extraction result cache backend (default sqlite)')
+
+    args = parser.parse_args()
+
+    # Extractor logs to stderr (stdout carries the JSON result)
+    logging.basicConfig(stream=sys.stderr, format='%(asctime)s %(levelname)s %(message)s')
+    logging.getLogger(LOGGER_NAME).setLevel(logging.INFO)
+
+    if args.worker:
+        run_worker(max(1, args.concurrency), args.poll_interval, args.health_port, args.lease_seconds, args.health_host)
+        return
+
+    missing = [
+        flag for flag, value in (
+            ('--entity-id', args.entity_id),
+            ('--template-id', args.template_id),
+            ('--source-id', args.source_id),
+            ('--artifact-type', args.artifact_type),
+        )
+        if not value
+    ]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+
+    config = {
+        'entity_id': args.entity_id,
+        'template_id': args.template_id,
+        'source_id': args.source_id,
+        'streaming': args.streaming,
+        'full_refresh': args.full_refresh,
+    }
+
+    if args.load_batch_size:
+        config['load_batch_size'] = args.load_batch_size
+    if args.ai_max_in_flight:
+        config['ai_max_in_flight'] = args.ai_max_in_flight
+    if args.ai_request_timeout:
+        config['ai_request_timeout'] = args.ai_request_timeout
+    if args.ai_cache:
+        config['ai_cache'] = args.ai_cache
+    if args.progress_interval is not None:
+        config['progress_interval'] = args.progress_interval
+
+    if not is_supported(args.artifact_type):
+        print(json.dumps({
+            'success': False,
+            'error': unsupported_message(args.artifact_type)
+        }))
+        sys.exit(1)
+
+    try:
+        result = run_job(config, args.artifact_type, args.job_id)
+
+        # Return success result as JSON
+        print(json.dumps({
+            'success': True,
+            **result
+        }))
+        sys.exit(0)
+
+    except Exception as e:
         # Return error as JSON
         print(json.dumps({
             'success': False,
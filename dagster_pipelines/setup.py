@@ -10,8 +10,11 @@ setup(
         "supabase",
         "boto3",
         "requests",
+        "httpx",
         "beautifulsoup4",
         "lxml",
+        "cssselect",
         "jsonpath-ng",
+        "psycopg[binary]",
     ],
 )
@@ -0,0 +1,78 @@
+"""
+Shared fixtures
+
+Database tests run against the Postgres in TEST_DATABASE_URL (a local or
+throwaway database; tables are dropped and recreated) and are skipped when
+it is not set.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# run_extraction.py and components/ live in dagster_pipelines/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "supabase" / "migrations"
+
+
+@pytest.fixture(scope="session")
+def pg_dsn():
+    dsn = os.getenv("TEST_DATABASE_URL")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL not set")
+    pytest.importorskip("psycopg")
+    return dsn
+
+
+@pytest.fixture
+def pg_conn(pg_dsn):
+    import psycopg
+
+    with psycopg.connect(pg_dsn, autocommit=True) as conn:
+        yield conn
+
+
+def apply_migration(conn, filename: str):
+    conn.execute((MIGRATIONS_DIR / filename).read_text())
+
+
+class FakeSupabase:
+    """Records table(...).update(...).eq(...) and table(...).insert(...) calls on execute()"""
+
+    def __init__(self):
+        self.updates = []
+        self.inserts = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class _FakeQuery:
+    def __init__(self, supabase, table):
+        self.supabase = supabase
+        self.table_name = table
+        self.values = None
+        self.rows = None
+        self.filters = {}
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def insert(self, rows):
+        self.rows = rows
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        if self.rows is not None:
+            self.supabase.inserts.append((self.table_name, list(self.rows)))
+        else:
+            self.supabase.updates.append((self.table_name, self.values, dict(self.filters)))
+        return self
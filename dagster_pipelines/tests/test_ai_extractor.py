@@ -0,0 +1,87 @@
+"""AI extractor failure handling: failed API calls are errors, not empty records"""
+
+import logging
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from components.ai_extractor import AIExtractor
+
+
+class FakeAIExtractor(AIExtractor):
+    ai_endpoint = '/api/extract/test-ai'
+    ai_content_key = 'text'
+
+    def ai_payload(self, artifact):
+        if artifact.get('broken'):
+            raise ValueError("Artifact missing content")
+        return {'text': artifact['text'], 'template': {}}
+
+    def rule_extract(self, payload):
+        # Rules always find 'source', the API is asked for the rest
+        return {'source': 'rules'}, payload
+
+
+def make_extractor(handler):
+    extractor = FakeAIExtractor.__new__(FakeAIExtractor)
+    extractor.config = {'ai_cache': 'off'}
+    extractor.template = {}
+    extractor.logger = logging.getLogger(__name__)
+    extractor._ai_client = httpx.AsyncClient(base_url='http://test', transport=httpx.MockTransport(handler))
+    extractor.processed = []
+    extractor._mark_processed = lambda artifact, count: extractor.processed.append(artifact['filename'])
+    return extractor
+
+
+def handler(request):
+    text = request.read().decode()
+    if '"fail"' in text:
+        return httpx.Response(500, text="upstream error")
+    if '"unsuccessful"' in text:
+        return httpx.Response(200, json={'success': False, 'error': 'no fields'})
+    return httpx.Response(200, json={'success': True, 'data': {'title': 'ok'}})
+
+
+ARTIFACTS = [
+    {'filename': 'good.html', 'text': 'good'},
+    {'filename': 'fail.html', 'text': 'fail'},
+    {'filename': 'unsuccessful.html', 'text': 'unsuccessful'},
+    {'filename': 'broken.html', 'broken': True},
+]
+
+
+def test_failed_calls_are_yielded_as_errors():
+    extractor = make_extractor(handler)
+    try:
+        results = {a['filename']: (records, error) for a, records, error in extractor.extract_many(iter(ARTIFACTS))}
+    finally:
+        extractor._close_ai_client()
+
+    assert results['good.html'] == ([{'title': 'ok', 'source': 'rules'}], None)
+    for filename in ('fail.html', 'unsuccessful.html', 'broken.html'):
+        records, error = results[filename]
+        assert records == []
+        assert isinstance(error, Exception)
+
+
+def test_failed_documents_are_not_marked_processed():
+    extractor = make_extractor(handler)
+    stats = {'artifacts_processed': 0, 'artifacts_failed': 0, 'records_extracted': 0}
+    try:
+        records = list(extractor._extract_stage(iter(ARTIFACTS), stats))
+    finally:
+        extractor._close_ai_client()
+
+    assert records == [{'title': 'ok', 'source': 'rules'}]
+    assert extractor.processed == ['good.html']
+    assert stats == {'artifacts_processed': 4, 'artifacts_failed': 3, 'records_extracted': 1}
+
+
+def test_extract_raises_on_failed_call():
+    extractor = make_extractor(handler)
+    try:
+        with pytest.raises(RuntimeError):
+            extractor.extract({'filename': 'fail.html', 'text': 'fail'})
+    finally:
+        extractor._close_ai_client()
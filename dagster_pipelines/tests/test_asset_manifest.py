@@ -0,0 +1,79 @@
+"""Asset manifest cache keys: file contents and the environment the file reads"""
+
+import importlib
+import sys
+
+import pytest
+
+pytest.importorskip("dagster")
+
+from dagster import load_assets_from_modules
+
+from components.asset_manifest import AssetManifest, build_lazy_asset, describe_module_assets, module_cache_key
+
+MODULE_SOURCE = '''
+import os
+from dagster import asset, MonthlyPartitionsDefinition
+
+monthly = MonthlyPartitionsDefinition(start_date=os.getenv("MANIFEST_TEST_START_MONTH", "2024-01"), fmt="%Y-%m")
+
+
+@asset(partitions_def=monthly)
+def monthly_report(context):
+    return context.partition_key
+'''
+
+
+@pytest.fixture
+def pipeline_module(tmp_path, monkeypatch):
+    path = tmp_path / "manifest_test_pipeline.py"
+    path.write_text(MODULE_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delenv("MANIFEST_TEST_START_MONTH", raising=False)
+    yield path
+    sys.modules.pop("manifest_test_pipeline", None)
+
+
+def describe(path):
+    module = importlib.import_module(path.stem)
+    module = importlib.reload(module)
+    return describe_module_assets(module, load_assets_from_modules([module]))
+
+
+def partitions_start(spec):
+    return build_lazy_asset(spec).partitions_def.start.strftime("%Y-%m")
+
+
+def test_cache_key_follows_file_contents(pipeline_module):
+    key = module_cache_key(pipeline_module)
+    assert module_cache_key(pipeline_module) == key
+
+    pipeline_module.write_text(MODULE_SOURCE + "\n# redeployed\n")
+    assert module_cache_key(pipeline_module) != key
+
+
+def test_env_change_invalidates_cached_specs(pipeline_module, tmp_path, monkeypatch):
+    manifest = AssetManifest(tmp_path / "manifest.json")
+    key = module_cache_key(pipeline_module)
+    manifest.put(pipeline_module.name, key, describe(pipeline_module))
+    manifest.save()
+
+    specs = AssetManifest(tmp_path / "manifest.json").get(pipeline_module.name, key)
+    assert partitions_start(specs[0]) == "2024-01"
+
+    # Same file, different partition start: the cached spec must not be served
+    monkeypatch.setenv("MANIFEST_TEST_START_MONTH", "2023-01")
+    new_key = module_cache_key(pipeline_module)
+    assert AssetManifest(tmp_path / "manifest.json").get(pipeline_module.name, new_key) is None
+
+    specs = describe(pipeline_module)
+    assert partitions_start(specs[0]) == "2023-01"
+
+
+def test_env_values_are_not_stored(pipeline_module, tmp_path, monkeypatch):
+    monkeypatch.setenv("MANIFEST_TEST_START_MONTH", "2023-07")
+    manifest = AssetManifest(tmp_path / "manifest.json")
+    manifest.put(pipeline_module.name, module_cache_key(pipeline_module), describe(pipeline_module))
+    manifest.save()
+
+    assert "MANIFEST_TEST_START_MONTH" not in (tmp_path / "manifest.json").read_text()
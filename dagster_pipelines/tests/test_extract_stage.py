@@ -0,0 +1,78 @@
+"""Streaming extract stage: an artifact's records are passed on only once it has been read to the end"""
+
+import logging
+
+from components.base_extractor import BaseExtractor
+from components.streams import RecordSpool
+
+
+class PartialExtractor(BaseExtractor):
+    """Yields 'rows' records per artifact, raising after 'fail_after' of them"""
+
+    def extract(self, artifact):
+        return list(self.iter_extract(artifact))
+
+    def iter_extract(self, artifact):
+        for row in range(artifact['rows']):
+            if row == artifact.get('fail_after'):
+                raise ValueError(f"{artifact['filename']} truncated at row {row}")
+            yield {'filename': artifact['filename'], 'row': row, 'payload': 'x' * 100}
+
+
+def make_extractor(config=None):
+    extractor = PartialExtractor.__new__(PartialExtractor)
+    extractor.config = config or {}
+    extractor.logger = logging.getLogger(__name__)
+    extractor.processed = []
+    extractor._mark_processed = lambda artifact, count: extractor.processed.append((artifact['filename'], count))
+    return extractor
+
+
+def run_stage(extractor, artifacts):
+    stats = {'artifacts_processed': 0, 'artifacts_failed': 0, 'records_extracted': 0}
+    return list(extractor._extract_stage(iter(artifacts), stats)), stats
+
+
+def test_mid_artifact_failure_yields_nothing():
+    extractor = make_extractor()
+    records, stats = run_stage(extractor, [
+        {'filename': 'a.csv', 'rows': 3},
+        {'filename': 'b.csv', 'rows': 5, 'fail_after': 2},
+        {'filename': 'c.csv', 'rows': 2},
+    ])
+
+    assert [(r['filename'], r['row']) for r in records] == [
+        ('a.csv', 0), ('a.csv', 1), ('a.csv', 2), ('c.csv', 0), ('c.csv', 1),
+    ]
+    assert extractor.processed == [('a.csv', 3), ('c.csv', 2)]
+    assert stats == {'artifacts_processed': 3, 'artifacts_failed': 1, 'records_extracted': 5}
+
+
+def test_retry_after_failure_does_not_duplicate():
+    extractor = make_extractor()
+    failed, _ = run_stage(extractor, [{'filename': 'b.csv', 'rows': 5, 'fail_after': 4}])
+    retried, _ = run_stage(extractor, [{'filename': 'b.csv', 'rows': 5}])
+
+    assert failed == []
+    assert [r['row'] for r in retried] == [0, 1, 2, 3, 4]
+
+
+def test_large_artifact_spills_to_disk():
+    # ~100 bytes per record: 2 KB in memory, the rest on disk
+    extractor = make_extractor({'artifact_spool_bytes': 2048})
+    records, stats = run_stage(extractor, [
+        {'filename': 'big.csv', 'rows': 500},
+        {'filename': 'bad.csv', 'rows': 500, 'fail_after': 400},
+    ])
+
+    assert [r['row'] for r in records] == list(range(500))
+    assert extractor.processed == [('big.csv', 500)]
+    assert stats['artifacts_failed'] == 1
+
+
+def test_record_spool_replays_in_order():
+    with RecordSpool(max_bytes=256) as spool:
+        for row in range(50):
+            spool.append({'row': row})
+        assert spool.spilled
+        assert [r['row'] for r in spool] == list(range(50))
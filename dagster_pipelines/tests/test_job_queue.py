@@ -0,0 +1,212 @@
+"""Pipeline job queue claims and worker failure handling"""
+
+import json
+import threading
+
+import pytest
+
+from conftest import FakeSupabase, apply_migration
+from components.job_queue import PipelineJobQueue
+
+
+@pytest.fixture
+def jobs_table(pg_conn):
+    pg_conn.execute("DROP TABLE IF EXISTS pipeline_jobs")
+    apply_migration(pg_conn, "015_add_pipeline_job_queue_columns.sql")
+    apply_migration(pg_conn, "016_add_pipeline_job_leases.sql")
+    return pg_conn
+
+
+def insert_job(conn, artifact_type="csv", options=None, complete=True):
+    if complete:
+        row = conn.execute(
+            "INSERT INTO pipeline_jobs (entity_id, template_id, source_id, artifact_type, options)"
+            " VALUES (gen_random_uuid(), gen_random_uuid(), gen_random_uuid(), %s, %s) RETURNING id",
+            (artifact_type, json.dumps(options or {}))
+        ).fetchone()
+    else:
+        # Job created for a spawned run_extraction.py process
+        row = conn.execute(
+            "INSERT INTO pipeline_jobs (entity_id) VALUES (gen_random_uuid()) RETURNING id"
+        ).fetchone()
+    return str(row[0])
+
+
+def job_row(conn, job_id):
+    return conn.execute(
+        "SELECT status, worker_id, claim_count, error FROM pipeline_jobs WHERE id = %s", (job_id,)
+    ).fetchone()
+
+
+def expire_lease(conn, job_id, seconds=600):
+    conn.execute(
+        "UPDATE pipeline_jobs SET heartbeat_at = NOW() - make_interval(secs => %s) WHERE id = %s", (seconds, job_id)
+    )
+
+
+def test_claim_marks_oldest_job_running(jobs_table, pg_dsn):
+    first = insert_job(jobs_table, options={"streaming": True, "unknown": 1})
+    insert_job(jobs_table)
+
+    queue = PipelineJobQueue("worker-1", pg_dsn)
+    job = queue.claim()
+    queue.close()
+
+    assert job["id"] == first
+    assert job["artifact_type"] == "csv"
+    assert job["config"]["streaming"] is True
+    assert "unknown" not in job["config"]
+
+    status, worker_id, started_at = jobs_table.execute(
+        "SELECT status, worker_id, started_at FROM pipeline_jobs WHERE id = %s", (first,)
+    ).fetchone()
+    assert (status, worker_id) == ("running", "worker-1")
+    assert started_at is not None
+
+
+def test_claim_skips_incomplete_jobs(jobs_table, pg_dsn):
+    incomplete = insert_job(jobs_table, complete=False)
+
+    queue = PipelineJobQueue("worker-1", pg_dsn)
+    assert queue.claim() is None
+    queue.close()
+
+    status = jobs_table.execute("SELECT status FROM pipeline_jobs WHERE id = %s", (incomplete,)).fetchone()[0]
+    assert status == "queued"
+
+
+def test_concurrent_claims_never_share_a_job(jobs_table, pg_dsn):
+    expected = {insert_job(jobs_table) for _ in range(40)}
+    claimed = []
+    lock = threading.Lock()
+
+    def claim_all(worker_id):
+        queue = PipelineJobQueue(worker_id, pg_dsn)
+        while (job := queue.claim()) is not None:
+            with lock:
+                claimed.append(job["id"])
+        queue.close()
+
+    threads = [threading.Thread(target=claim_all, args=(f"worker-{n}",)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(expected)
+
+
+@pytest.mark.parametrize("artifact_type", ["pdf", None])
+def test_unsupported_artifact_type_fails_job(monkeypatch, artifact_type):
+    import run_extraction
+
+    supabase = FakeSupabase()
+    monkeypatch.setattr(run_extraction, "supabase", supabase)
+
+    with pytest.raises(ValueError, match="Unsupported artifact type"):
+        run_extraction.run_job({"entity_id": "e", "template_id": "t", "source_id": "s"}, artifact_type, "job-1")
+
+    statuses = [values.get("status") for _, values, _ in supabase.updates if "status" in values]
+    assert statuses[-1] == "failed"
+    assert any("Unsupported artifact type" in (values.get("error") or "") for _, values, _ in supabase.updates)
+
+
+def test_pdf_error_names_where_pdfs_are_extracted():
+    from components.registry import get_extractor_class
+
+    with pytest.raises(ValueError, match="Unsupported artifact type: pdf .*Dagster pipelines"):
+        get_extractor_class("pdf")
+
+
+def test_crashed_workers_job_is_reclaimed(jobs_table, pg_dsn):
+    job_id = insert_job(jobs_table)
+
+    crashed = PipelineJobQueue("worker-1", pg_dsn, lease_seconds=60)
+    assert crashed.claim()["id"] == job_id
+    crashed.close()
+
+    # Lease still live: nobody else may take the job
+    queue = PipelineJobQueue("worker-2", pg_dsn, lease_seconds=60)
+    assert queue.claim() is None
+
+    # worker-1 stopped heartbeating
+    expire_lease(jobs_table, job_id, 120)
+    job = queue.claim()
+    queue.close()
+
+    assert job["id"] == job_id
+    assert job["claim_count"] == 2
+    assert job_row(jobs_table, job_id)[:3] == ("running", "worker-2", 2)
+
+
+def test_heartbeat_keeps_the_lease(jobs_table, pg_dsn):
+    job_id = insert_job(jobs_table)
+    owner = PipelineJobQueue("worker-1", pg_dsn, lease_seconds=60)
+    owner.claim()
+
+    expire_lease(jobs_table, job_id, 50)
+    assert owner.heartbeat([job_id]) == [job_id]
+    expire_lease(jobs_table, job_id, 30)
+
+    other = PipelineJobQueue("worker-2", pg_dsn, lease_seconds=60)
+    assert other.claim() is None
+
+    # Once reclaimed, the old owner's heartbeat no longer holds it
+    expire_lease(jobs_table, job_id, 120)
+    assert other.claim()["id"] == job_id
+    assert owner.heartbeat([job_id]) == []
+    owner.close()
+    other.close()
+
+
+def test_job_fails_after_last_claim_expires(jobs_table, pg_dsn):
+    job_id = insert_job(jobs_table)
+    queue = PipelineJobQueue("worker-1", pg_dsn, lease_seconds=60, max_claims=2)
+
+    for _ in range(2):
+        assert queue.claim()["id"] == job_id
+        expire_lease(jobs_table, job_id)
+
+    # Out of claims: not handed out again, failed instead
+    assert queue.claim() is None
+    assert queue.fail_expired() == [job_id]
+    queue.close()
+
+    status, _, claim_count, error = job_row(jobs_table, job_id)
+    assert (status, claim_count) == ("failed", 2)
+    assert "Worker lost" in error
+
+
+def test_renew_leases_heartbeats_active_jobs(jobs_table, pg_dsn):
+    import run_extraction
+
+    job_id = insert_job(jobs_table)
+    queue = PipelineJobQueue("worker-1", pg_dsn, lease_seconds=60)
+    queue.claim()
+    expire_lease(jobs_table, job_id, 50)
+
+    state = run_extraction.WorkerState("worker-1", 1, 1.0)
+    state.active_jobs[job_id] = "csv"
+    run_extraction.renew_leases(queue, state)
+
+    heartbeat_age = jobs_table.execute(
+        "SELECT EXTRACT(EPOCH FROM NOW() - heartbeat_at) FROM pipeline_jobs WHERE id = %s", (job_id,)
+    ).fetchone()[0]
+    queue.close()
+    assert heartbeat_age < 5
+
+
+def test_health_server_binds_loopback_by_default():
+    import urllib.request
+
+    import run_extraction
+
+    state = run_extraction.WorkerState("worker-1", 1, 1.0)
+    server = run_extraction.start_health_server(state, 0)
+    try:
+        host, port = server.server_address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health") as response:
+            assert json.loads(response.read())["worker_id"] == "worker-1"
+    finally:
+        server.shutdown()
@@ -0,0 +1,150 @@
+"""PostgresCopyLoader against a real Postgres"""
+
+import logging
+
+import pytest
+
+from conftest import FakeSupabase
+from components.base_extractor import BaseExtractor
+from components.pg_loader import PostgresCopyLoader
+
+
+@pytest.fixture
+def sales_table(pg_conn):
+    pg_conn.execute("DROP TABLE IF EXISTS raw_sales")
+    pg_conn.execute(
+        "CREATE TABLE raw_sales ("
+        " id SERIAL PRIMARY KEY,"
+        " brand TEXT NOT NULL,"
+        " report_month TEXT,"
+        " report_year TEXT,"
+        " cases NUMERIC,"
+        " details JSONB,"
+        " UNIQUE (brand, report_month, report_year))"
+    )
+    return pg_conn
+
+
+def table_rows(conn):
+    return conn.execute(
+        "SELECT brand, report_month, report_year, cases FROM raw_sales ORDER BY brand, report_month"
+    ).fetchall()
+
+
+def test_replace_where_swaps_month_rows(sales_table, pg_dsn):
+    with PostgresCopyLoader(dsn=pg_dsn) as loader:
+        loader.load('raw_sales', [
+            {'brand': 'A', 'report_month': 'January', 'report_year': '2025', 'cases': 1},
+            {'brand': 'B', 'report_month': 'January', 'report_year': '2025', 'cases': 2},
+            {'brand': 'A', 'report_month': 'February', 'report_year': '2025', 'cases': 3},
+        ])
+
+        loaded = loader.load(
+            'raw_sales',
+            [{'brand': 'C', 'report_month': 'January', 'report_year': '2025', 'cases': 4}],
+            replace_where={'report_month': 'January', 'report_year': '2025'},
+        )
+
+    assert loaded == 1
+    assert [(brand, month) for brand, month, _, _ in table_rows(sales_table)] == [
+        ('A', 'February'), ('C', 'January'),
+    ]
+
+
+def test_replace_where_rolls_back_with_failed_insert(sales_table, pg_dsn):
+    with PostgresCopyLoader(dsn=pg_dsn) as loader:
+        loader.load('raw_sales', [{'brand': 'A', 'report_month': 'January', 'report_year': '2025', 'cases': 1}])
+
+        # brand is NOT NULL: the insert fails, so the delete must not be committed
+        with pytest.raises(Exception):
+            loader.load(
+                'raw_sales',
+                [{'brand': None, 'report_month': 'January', 'report_year': '2025', 'cases': 2}],
+                replace_where={'report_month': 'January', 'report_year': '2025'},
+            )
+
+    assert [brand for brand, _, _, _ in table_rows(sales_table)] == ['A']
+
+
+def test_copy_inserts_records(sales_table, pg_dsn):
+    with PostgresCopyLoader(dsn=pg_dsn) as loader:
+        loaded = loader.load('raw_sales', [
+            {'brand': 'A', 'report_month': 'January', 'report_year': '2025', 'cases': 1.5, 'details': {'rank': 1}},
+            # Columns missing from a record are loaded as NULL
+            {'brand': 'B', 'report_month': 'January'},
+        ])
+
+    assert loaded == 2
+    assert table_rows(sales_table) == [('A', 'January', '2025', 1.5), ('B', 'January', None, None)]
+    assert sales_table.execute("SELECT details FROM raw_sales WHERE brand = 'A'").fetchone()[0] == {'rank': 1}
+
+
+def test_conflict_columns_update_existing_rows(sales_table, pg_dsn):
+    key = ['brand', 'report_month', 'report_year']
+    with PostgresCopyLoader(dsn=pg_dsn) as loader:
+        loader.load('raw_sales', [
+            {'brand': 'A', 'report_month': 'January', 'report_year': '2025', 'cases': 1},
+            {'brand': 'B', 'report_month': 'January', 'report_year': '2025', 'cases': 2},
+        ], conflict_columns=key)
+
+        loaded = loader.load('raw_sales', [
+            {'brand': 'A', 'report_month': 'January', 'report_year': '2025', 'cases': 10},
+            {'brand': 'C', 'report_month': 'January', 'report_year': '2025', 'cases': 3},
+        ], conflict_columns=key)
+
+        # Only key columns: existing rows are left alone
+        loader.load('raw_sales', [{'brand': 'C', 'report_month': 'January', 'report_year': '2025'}], conflict_columns=key)
+
+    assert loaded == 2
+    assert [(brand, cases) for brand, _, _, cases in table_rows(sales_table)] == [('A', 10), ('B', 2), ('C', 3)]
+
+
+def test_empty_records_are_skipped_without_sql(pg_dsn):
+    loader = PostgresCopyLoader(dsn=pg_dsn)
+
+    assert loader.load('raw_sales', []) == 0
+    assert loader.load('raw_sales', [{}, {}]) == 0
+    # No statement was sent, so no connection was opened
+    assert loader._conn is None
+
+
+class FakeExtractor(BaseExtractor):
+    def extract(self, artifact):
+        return []
+
+
+def make_extractor(loader):
+    extractor = FakeExtractor.__new__(FakeExtractor)
+    extractor.config = {'load_batch_size': 2}
+    extractor.entity = {'name': 'raw_sales'}
+    extractor.logger = logging.getLogger(__name__)
+    extractor.supabase = FakeSupabase()
+    extractor._copy_loader = loader
+    return extractor
+
+
+def test_load_batch_uses_copy(sales_table, pg_dsn):
+    extractor = make_extractor(PostgresCopyLoader(dsn=pg_dsn))
+    try:
+        loaded = extractor._load_batch([{'brand': 'A'}, {'brand': 'B'}, {'brand': 'C'}], 1)
+    finally:
+        extractor._close_loader()
+
+    assert loaded == 3
+    assert extractor.supabase.inserts == []
+    assert [brand for brand, _, _, _ in table_rows(sales_table)] == ['A', 'B', 'C']
+
+
+def test_load_batch_falls_back_to_postgrest(pg_conn, pg_dsn):
+    pg_conn.execute("DROP TABLE IF EXISTS raw_sales")
+    batch = [{'brand': 'A'}, {'brand': 'B'}, {'brand': 'C'}]
+
+    # Missing table: COPY fails and the batch goes through PostgREST in load_batch_size chunks
+    extractor = make_extractor(PostgresCopyLoader(dsn=pg_dsn))
+    try:
+        loaded = extractor._load_batch(batch, 1)
+    finally:
+        extractor._close_loader()
+
+    assert loaded == 3
+    assert extractor.supabase.inserts == [('raw_sales', batch[:2]), ('raw_sales', batch[2:])]
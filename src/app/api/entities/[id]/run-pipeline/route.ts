@@ -12,6 +12,9 @@ import { createClient } from '@/lib/supabase/server';
 import { spawn } from 'child_process';
 import path from 'path';
 
+// Artifact types run_extraction.py can extract
+const SUPPORTED_ARTIFACT_TYPES = ['json', 'csv', 'html', 'email'];
+
 export async function POST(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
@@ -68,6 +71,14 @@ export async function POST(
       return NextResponse.json({ error: 'Template not found' }, { status: 404 });
     }
 
+    // Only artifact types with an extractor can run (see components/registry.py)
+    if (!SUPPORTED_ARTIFACT_TYPES.includes(template.artifact_type)) {
+      return NextResponse.json({
+        error: 'Unsupported artifact type',
+        message: `No extractor for artifact type: ${template.artifact_type || 'none'}`,
+      }, { status: 400 });
+    }
+
     // Get source from template's sample artifact
     let sourceId: string | null = null;
     if (template.sample_artifact_id) {
@@ -110,6 +121,10 @@ export async function POST(
       .eq('source_id', sourceId)
       .eq('artifact_type', template.artifact_type);
 
+    // With a persistent worker (run_extraction.py --worker), the job row carries
+    // everything needed to run it and is left queued for the worker to claim
+    const useWorker = process.env.PIPELINE_WORKER === 'true';
+
     // Create pipeline job record
     const { data: job, error: jobError } = await supabase
       .from('pipeline_jobs')
@@ -118,8 +133,14 @@ export async function POST(
         status: 'queued',
         progress_current: 0,
         progress_total: artifactCount || 0,
-        progress_message: 'Initializing pipeline...',
-        created_by: user.id
+        progress_message: useWorker ? 'Queued for extraction worker...' : 'Initializing pipeline...',
+        created_by: user.id,
+        ...(useWorker && {
+          template_id: template.id,
+          source_id: sourceId,
+          artifact_type: template.artifact_type,
+          options: {},
+        }),
       })
       .select()
       .single();
@@ -128,6 +149,16 @@ export async function POST(
       return NextResponse.json({ error: 'Failed to create pipeline job' }, { status: 500 });
     }
 
+    if (useWorker) {
+      console.log(`✅ Pipeline job ${job.id} queued for worker`);
+
+      return NextResponse.json({
+        success: true,
+        job_id: job.id,
+        message: 'Pipeline queued. Check progress in the Pipeline tab.',
+      });
+    }
+
     // Update job to running status immediately
     await supabase
       .from('pipeline_jobs')
@@ -214,16 +214,11 @@ import boto3
 import io
 from difflib import SequenceMatcher
 from PyPDF2 import PdfReader, PdfWriter
-from supabase import create_client
 ` : '';
 
-  return `"""
-Auto-generated Dagster pipeline for ${entity.display_name || entity.name}
-Generated by Inspector Dom
-Entity Type: ${entity.entity_type}
-"""
-
-from dagster import (
+  // Multi-entity NABCA templates get their own imports, constants and partition helpers
+  const multiEntity = isMultiEntityTemplate(template);
+  const imports = multiEntity ? generateMultiEntityImports() : `from dagster import (
     asset,
     AssetExecutionContext,
     MaterializeResult,
@@ -235,10 +230,20 @@ import logging
 import traceback
 import re
 from datetime import datetime
-${nabcaImports}
+from components.clients import get_supabase_client
+from components.resources import ClientsResource
+${nabcaImports}`;
+
+  return `"""
+Auto-generated Dagster pipeline for ${entity.display_name || entity.name}
+Generated by Inspector Dom
+Entity Type: ${entity.entity_type}
+"""
+
+${imports}
 # Configure logging
 logger = logging.getLogger(__name__)
-
+${multiEntity ? generateMultiEntityConstants() : ''}
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -288,7 +293,7 @@ def parse_report_date_from_filename(filename: str) -> tuple:
     except Exception as e:
         logger.warning(f"Failed to parse date from filename '{filename}': {e}")
         return (None, None)
-
+${multiEntity ? generateReportPartitionHelpers() : ''}
 # ============================================================================
 # EXTRACTION ASSETS
 # ============================================================================
@@ -346,7 +351,7 @@ function generateNabcaExtractionAsset(
     compute_kind="extraction:textract",
     retry_policy=RetryPolicy(max_retries=3),
 )
-def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
+def ${assetName}(context: AssetExecutionContext, clients: ClientsResource) -> Dict[str, Any]:
     """
     Extract ${entity.display_name || entity.name} data from NABCA PDF artifacts.
 
@@ -359,15 +364,10 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
         context.log.info(f"Starting NABCA extraction for ${entity.name}")
         context.log.info(f"Section: ${nabcaInfo.sectionName}, Pages: ${nabcaInfo.pageStart}-${nabcaInfo.pageEnd}")
 
-        # Initialize clients (imports are at module level)
-        supabase = create_client(
-            os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        )
-
-        # AWS clients
-        textract_client = boto3.client('textract', region_name=os.getenv("AWS_REGION", "us-east-1"))
-        s3_client = boto3.client('s3', region_name=os.getenv("AWS_REGION", "us-east-1"))
+        # Shared, pooled clients (reused across runs in this process)
+        supabase = clients.supabase()
+        textract_client = clients.textract()
+        s3_client = clients.s3()
 
         # Fetch PDF artifacts
         source_ids = ${JSON.stringify(config.source_ids)}
@@ -854,6 +854,12 @@ def similarity(a: str, b: str) -> float:
 
 /**
  * Generate multi-entity NABCA extraction asset (1 PDF → 8 tables)
+ *
+ * Emits the monthly-partitioned asset and its helpers: Textract result cache,
+ * concurrent Textract jobs, page-by-page block streaming, compact table
+ * parsing, indexed header matching, column-wise OCR cleanup and COPY/upsert
+ * loading. dagster_home/pipelines/nabca_all_tables_v1.py is this output, so
+ * changes to the deployed module belong here or a redeploy reverts them.
  */
 function generateMultiEntityExtractionAsset(
   entity: Entity,
@@ -869,48 +875,60 @@ function generateMultiEntityExtractionAsset(
     name="${assetName}",
     description="Extract all 8 NABCA tables from PDFs using AWS Textract with table identification",
     compute_kind="extraction:textract:multi-entity",
+    partitions_def=nabca_monthly_partitions,
     retry_policy=RetryPolicy(max_retries=3),
 )
-def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
+def ${assetName}(context: AssetExecutionContext, clients: ClientsResource) -> Dict[str, Any]:
     """
     Multi-entity NABCA extraction: ONE Textract call → 8 database tables.
 
     Uses table identification patterns to route data to correct entities.
     Cost-efficient: 1 Textract call instead of 8 separate calls.
+
+    Partitioned by report month: each run only extracts the PDFs whose
+    filename maps to its partition, and replaces that month's rows.
     """
     try:
-        context.log.info("🚀 Starting NABCA multi-entity extraction...")
+        partition_key = context.partition_key
+        partition_month, partition_year = report_date_from_partition_key(partition_key)
+        context.log.info(f"🚀 Starting NABCA multi-entity extraction for {partition_month} {partition_year} ({partition_key})...")
 
-        # Initialize clients
-        import os
-        import boto3
-        from supabase import create_client
+        # Shared, pooled clients (reused across runs in this process)
+        supabase = clients.supabase()
+        textract_client = clients.textract()
+        s3_client = clients.s3()
 
-        supabase = create_client(
-            os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        )
-
-        textract_client = boto3.client('textract', region_name=os.getenv("AWS_REGION", "us-east-1"))
-        s3_client = boto3.client('s3', region_name=os.getenv("AWS_REGION", "us-east-1"))
-
-        # Fetch PDF artifacts
+        # Fetch this partition's PDF artifacts (only the columns used below)
         source_ids = ${JSON.stringify(config.source_ids)}
-        query = supabase.table("artifacts").select("*").eq("artifact_type", "pdf")
+        query = supabase.table("artifacts") \\
+            .select(NABCA_ARTIFACT_COLUMNS) \\
+            .eq("artifact_type", "pdf") \\
+            .ilike("original_filename", report_filename_pattern(partition_key))
         if source_ids:
             query = query.in_("source_id", source_ids)
 
         artifacts_response = query.execute()
-        artifacts = artifacts_response.data
 
-        context.log.info(f"📄 Found {len(artifacts)} PDF artifacts to process")
+        # The filename pattern can over-match (e.g. the digits elsewhere in the name)
+        artifacts = [
+            artifact for artifact in artifacts_response.data
+            if report_partition_key(artifact.get("original_filename", "")) == partition_key
+        ]
+
+        context.log.info(f"📄 Found {len(artifacts)} PDF artifacts for {partition_key}")
 
         # Table identification patterns (from template)
         table_patterns = ${JSON.stringify(tablePatterns, null, 8)}
 
+        # Precompute per-pattern matchers once per run
+        table_patterns = compile_table_patterns(table_patterns)
+        header_matcher = HeaderMatcher(table_patterns)
+
         # Target entities (8 NABCA tables)
         target_entities = ${JSON.stringify(targetEntities)}
 
+        textract_cache = TextractResultCache(s3_client, context)
+
         context.log.info(f"🎯 Target entities: {len(target_entities)} tables")
         context.log.info(f"📋 Table patterns configured: {len(table_patterns)}")
 
@@ -918,141 +936,26 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
         all_entity_records = {entity_name: [] for entity_name in target_entities}
         failed_artifacts = 0
 
+        # Phase 1: locate each PDF and serve cached Textract results immediately
+        pending_documents = []
+
         for artifact in artifacts:
             try:
                 context.log.info(f"\\n{'='*60}")
                 context.log.info(f"📄 Processing artifact: {artifact['id']}")
                 context.log.info(f"   Filename: {artifact.get('original_filename', 'unknown')}")
 
-                # Parse report month/year from filename (format: 631_9L_1224.PDF)
-                filename = artifact.get("original_filename", "")
-                report_month, report_year = parse_report_date_from_filename(filename)
+                document = prepare_nabca_document(supabase, s3_client, artifact, context)
+                if not document:
+                    failed_artifacts += 1
+                    continue
 
-                if report_month and report_year:
-                    context.log.info(f"📅 Parsed date: {report_month} {report_year}")
+                cached_blocks = textract_cache.open(document['cache_key']) if document['cache_key'] else None
+                if cached_blocks is not None:
+                    context.log.info(f"♻️  Textract cache hit ({document['cache_key'][:12]})")
+                    extract_nabca_document(cached_blocks, document, table_patterns, header_matcher, all_entity_records, context)
                 else:
-                    context.log.warning(f"⚠️  Could not parse date from: {filename}")
-
-                # Check if artifact is already in S3
-                artifact_metadata = artifact.get("metadata", {})
-                if artifact_metadata.get("s3_bucket") and artifact_metadata.get("s3_key"):
-                    # Artifact already in S3 - use existing location
-                    s3_bucket = artifact_metadata["s3_bucket"]
-                    s3_key = artifact_metadata["s3_key"]
-                    context.log.info(f"✅ Using existing S3 location: s3://{s3_bucket}/{s3_key}")
-                else:
-                    # Artifact in Supabase storage - need to download and upload to S3
-                    context.log.info("📥 Downloading from Supabase storage...")
-                    pdf_data = get_artifact_pdf(supabase, s3_client, artifact, context)
-                    if not pdf_data:
-                        context.log.error(f"❌ Failed to retrieve PDF for {artifact['id']}")
-                        failed_artifacts += 1
-                        continue
-
-                    # Upload to S3 for Textract
-                    s3_bucket = os.getenv("TEXTRACT_S3_BUCKET") or os.getenv("AWS_S3_BUCKET")
-                    s3_key = f"textract-temp/nabca-multi/{artifact['id']}/full.pdf"
-
-                    context.log.info(f"☁️  Uploading to S3: s3://{s3_bucket}/{s3_key}")
-                    s3_client.put_object(Bucket=s3_bucket, Key=s3_key, Body=pdf_data)
-
-                # Start async Textract analysis (entire PDF)
-                context.log.info("🔍 Starting Textract async analysis...")
-                textract_response = textract_client.start_document_analysis(
-                    DocumentLocation={'S3Object': {'Bucket': s3_bucket, 'Name': s3_key}},
-                    FeatureTypes=['TABLES']
-                )
-
-                job_id = textract_response['JobId']
-                context.log.info(f"⏳ Textract job ID: {job_id}")
-
-                # Poll for completion (with extended timeout for large PDFs)
-                import time
-                max_wait = 7200  # 2 hours for large PDFs (718 pages)
-                wait_interval = 10
-                elapsed = 0
-
-                while elapsed < max_wait:
-                    time.sleep(wait_interval)
-                    elapsed += wait_interval
-
-                    status_response = textract_client.get_document_analysis(JobId=job_id)
-                    status = status_response['JobStatus']
-
-                    if status == 'SUCCEEDED':
-                        context.log.info(f"✅ Textract completed after {elapsed}s ({elapsed/60:.1f} min)")
-                        break
-                    elif status == 'FAILED':
-                        raise Exception(f"Textract job failed: {status_response.get('StatusMessage')}")
-
-                    if elapsed % 60 == 0:
-                        context.log.info(f"⏳ Textract still running... ({elapsed}s / {elapsed/60:.1f} min)")
-
-                if status != 'SUCCEEDED':
-                    raise Exception(f"Textract job timed out after {max_wait}s")
-
-                # Collect ALL blocks from all pages
-                context.log.info("📦 Retrieving Textract blocks...")
-                all_blocks = status_response.get('Blocks', [])
-                next_token = status_response.get('NextToken')
-                page_count = 1
-
-                while next_token:
-                    response = textract_client.get_document_analysis(JobId=job_id, NextToken=next_token)
-                    all_blocks.extend(response.get('Blocks', []))
-                    next_token = response.get('NextToken')
-                    page_count += 1
-                    if page_count % 10 == 0:
-                        context.log.info(f"   Retrieved {page_count} pages of blocks...")
-
-                context.log.info(f"✅ Retrieved {len(all_blocks)} total blocks from {page_count} result pages")
-
-                # Parse tables
-                tables = parse_textract_tables(all_blocks)
-                context.log.info(f"📊 Detected {len(tables)} tables in PDF")
-
-                # Track assigned entities for sequential matching (tables with identical headers)
-                assigned_entities = set()
-
-                # Identify and extract data from each table
-                for table_idx, table in enumerate(tables):
-                    table_data = table.get('data', [])
-                    page_number = table.get('page', 0)
-
-                    if len(table_data) < 2:
-                        context.log.debug(f"Skipping table {table_idx + 1} (too small: {len(table_data)} rows)")
-                        continue
-
-                    # Identify which NABCA table this is (with title-based and page-based matching)
-                    identified_pattern = identify_nabca_table(table_data, table_patterns, assigned_entities, page_number, all_blocks, context)
-
-                    if not identified_pattern:
-                        context.log.debug(f"Table {table_idx + 1} (page {page_number}): Could not identify (skipping)")
-                        continue
-
-                    entity_name = identified_pattern['entityName']
-                    table_name = identified_pattern['tableName']
-
-                    # Track assigned entity for sequential matching
-                    assigned_entities.add(entity_name)
-                    confidence = identified_pattern.get('confidence', 0)
-
-                    context.log.info(f"✅ Table {table_idx + 1} (page {page_number}): Identified as '{table_name}' → {entity_name} (confidence: {confidence:.2f})")
-
-                    # Extract data using pattern
-                    records = extract_table_data_multi_entity(
-                        table_data,
-                        identified_pattern,
-                        report_month,
-                        report_year,
-                        artifact,
-                        context
-                    )
-
-                    all_entity_records[entity_name].extend(records)
-                    context.log.info(f"   → Extracted {len(records)} records for {entity_name}")
-
-                context.log.info(f"✅ Completed artifact {artifact['id']}")
+                    pending_documents.append(document)
 
             except Exception as e:
                 context.log.error(f"❌ Failed to process artifact {artifact['id']}: {str(e)}")
@@ -1060,6 +963,54 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
                 failed_artifacts += 1
                 continue
 
+        # Phase 2: fan out Textract jobs for cache misses, parse each as it finishes
+        if pending_documents:
+            max_concurrent_jobs = int(os.getenv("TEXTRACT_MAX_CONCURRENT_JOBS", DEFAULT_TEXTRACT_MAX_CONCURRENT_JOBS))
+            context.log.info(f"\\n{'='*60}")
+            context.log.info(f"🔍 Running Textract for {len(pending_documents)} PDFs (max {max_concurrent_jobs} concurrent jobs)")
+
+            for document, job_id, error in run_textract_jobs(textract_client, pending_documents, max_concurrent_jobs, context):
+                artifact = document['artifact']
+
+                if error is not None:
+                    context.log.error(f"❌ Textract failed for artifact {artifact['id']}: {str(error)}")
+                    failed_artifacts += 1
+                    continue
+
+                try:
+                    # Stream result pages straight into the parser, caching them on the way through
+                    blocks = compact_textract_blocks(iter_textract_blocks(textract_client, job_id, context))
+                    if document['cache_key']:
+                        blocks = textract_cache.tee(document['cache_key'], blocks)
+                    extract_nabca_document(blocks, document, table_patterns, header_matcher, all_entity_records, context)
+                except Exception as e:
+                    context.log.error(f"❌ Failed to process artifact {artifact['id']}: {str(e)}")
+                    context.log.error(traceback.format_exc())
+                    failed_artifacts += 1
+
+        # Replacing the month with a failed PDF's rows missing would delete
+        # them: fail instead, so RetryPolicy re-runs the whole partition
+        if failed_artifacts:
+            raise Exception(
+                f"{failed_artifacts} of {len(artifacts)} PDFs failed for {partition_key}; "
+                f"not loading a partial month"
+            )
+
+        # Optional natural key per entity (pattern "naturalKey", backed by a unique constraint)
+        natural_keys = {pattern['entityName']: pattern.get('naturalKey') for pattern in table_patterns}
+
+        # Entities without a natural key replace the month's rows, which is
+        # only atomic through the COPY loader: check before loading anything
+        replaced_entities = [
+            entity_name for entity_name, records in all_entity_records.items()
+            if records and not natural_keys.get(entity_name)
+        ]
+        if replaced_entities and not copy_loader_available():
+            raise Exception(
+                f"Replacing {partition_key} rows needs DATABASE_URL (COPY loader) for "
+                f"{', '.join(replaced_entities)}; set it or give these patterns a naturalKey"
+            )
+
         # Load data into all 8 tables
         context.log.info(f"\\n{'='*60}")
         context.log.info("💾 Loading data into database tables...")
@@ -1074,8 +1025,15 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
 
             context.log.info(f"  {entity_name}: Loading {len(records)} records...")
 
-            # Batch insert
-            loaded, failed = batch_insert_records(supabase, entity_name, records, context)
+            # Upsert on the natural key if there is one; otherwise replace
+            # this month's rows so partition retries/re-runs don't duplicate data
+            natural_key = natural_keys.get(entity_name)
+            replace_month = None if natural_key else (partition_month, partition_year)
+
+            loaded, failed = batch_insert_records(
+                supabase, entity_name, records, context,
+                conflict_columns=natural_key, replace_month=replace_month
+            )
             load_summary[entity_name] = {"loaded": loaded, "failed": failed}
 
             context.log.info(f"    ✅ {loaded} loaded, ❌ {failed} failed")
@@ -1090,14 +1048,25 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
         context.log.info(f"   Total records loaded: {total_loaded}")
         context.log.info(f"   Total records failed: {total_failed}")
         context.log.info(f"   Entities populated: {len([k for k, v in load_summary.items() if v['loaded'] > 0])}/8")
+        context.log.info(f"   Textract cache: {textract_cache.hits} hits, {textract_cache.misses} misses")
+
+        context.add_output_metadata({
+            "partition": MetadataValue.text(partition_key),
+            "records_loaded": MetadataValue.int(total_loaded),
+            "textract_cache_hits": MetadataValue.int(textract_cache.hits),
+            "textract_cache_misses": MetadataValue.int(textract_cache.misses),
+        })
 
         return {
             "success": True,
+            "partition": partition_key,
             "artifacts_processed": len(artifacts),
             "artifacts_failed": failed_artifacts,
             "total_records_loaded": total_loaded,
             "total_records_failed": total_failed,
             "load_summary": load_summary,
+            "textract_cache_hits": textract_cache.hits,
+            "textract_cache_misses": textract_cache.misses,
         }
 
     except Exception as e:
@@ -1132,63 +1101,565 @@ def get_artifact_pdf(supabase, s3_client, artifact: Dict[str, Any], context) ->
         return None
 
 
+def prepare_nabca_document(supabase, s3_client, artifact: Dict[str, Any], context) -> Optional[Dict[str, Any]]:
+    """
+    Resolve report date, S3 location and Textract cache key for a PDF artifact.
+
+    PDFs held in Supabase storage are copied to S3 so Textract can read them.
+    The cache key is None (cache skipped) if the S3 object could not be
+    identified. Returns None if the PDF could not be retrieved.
+    """
+    # Parse report month/year from filename (format: 631_9L_1224.PDF)
+    filename = artifact.get("original_filename", "")
+    report_month, report_year = parse_report_date_from_filename(filename)
+
+    if report_month and report_year:
+        context.log.info(f"📅 Parsed date: {report_month} {report_year}")
+    else:
+        context.log.warning(f"⚠️  Could not parse date from: {filename}")
+
+    # Check if artifact is already in S3
+    artifact_metadata = artifact.get("metadata", {})
+    if artifact_metadata.get("s3_bucket") and artifact_metadata.get("s3_key"):
+        # Artifact already in S3 - use existing location
+        s3_bucket = artifact_metadata["s3_bucket"]
+        s3_key = artifact_metadata["s3_key"]
+        context.log.info(f"✅ Using existing S3 location: s3://{s3_bucket}/{s3_key}")
+        pdf_content_id = s3_object_content_id(s3_client, s3_bucket, s3_key, context)
+    else:
+        # Artifact in Supabase storage - need to download and upload to S3
+        context.log.info("📥 Downloading from Supabase storage...")
+        pdf_data = get_artifact_pdf(supabase, s3_client, artifact, context)
+        if not pdf_data:
+            context.log.error(f"❌ Failed to retrieve PDF for {artifact['id']}")
+            return None
+
+        # Upload to S3 for Textract
+        s3_bucket = os.getenv("TEXTRACT_S3_BUCKET") or os.getenv("AWS_S3_BUCKET")
+        s3_key = f"textract-temp/nabca-multi/{artifact['id']}/full.pdf"
+
+        # Bytes are already in hand for the upload, so hashing is free here;
+        # the digest is stored on the object for s3_object_content_id
+        pdf_content_id = hashlib.sha256(pdf_data).hexdigest()
+        context.log.info(f"☁️  Uploading to S3: s3://{s3_bucket}/{s3_key}")
+        s3_client.put_object(Bucket=s3_bucket, Key=s3_key, Body=pdf_data, Metadata={"sha256": pdf_content_id})
+
+    return {
+        "artifact": artifact,
+        "report_month": report_month,
+        "report_year": report_year,
+        "s3_bucket": s3_bucket,
+        "s3_key": s3_key,
+        "cache_key": textract_cache_key(pdf_content_id, TEXTRACT_FEATURE_TYPES) if pdf_content_id else None,
+    }
+
+
+def extract_nabca_document(
+    blocks: Iterable[Dict[str, Any]],
+    document: Dict[str, Any],
+    table_patterns: List[Dict],
+    header_matcher: 'HeaderMatcher',
+    all_entity_records: Dict[str, List[Dict[str, Any]]],
+    context
+):
+    """
+    Identify every table in one PDF's Textract output and route its records to entities.
+
+    Blocks are consumed as a stream and tables are finalized page by page,
+    so only one document page of blocks is held at a time.
+    """
+    artifact = document['artifact']
+
+    # Track assigned entities for sequential matching (tables with identical headers)
+    assigned_entities = set()
+    table_idx = -1
+    page_count = 0
+
+    # Page number -> uppercased LINE text, built once per page for title matching
+    page_text_index = {}
+
+    for page_number, page_blocks in iter_textract_pages(blocks):
+        page_count += 1
+        page_text_index[page_number] = page_line_text(page_blocks)
+
+        # Parse tables on this page
+        for table in parse_textract_tables(page_blocks):
+            table_idx += 1
+            extract_nabca_table(table, table_idx, page_text_index, document, table_patterns, header_matcher, assigned_entities, all_entity_records, context)
+
+    context.log.info(f"📊 Processed {table_idx + 1} tables across {page_count} pages")
+    context.log.info(f"✅ Completed artifact {artifact['id']}")
+
+
+def extract_nabca_table(
+    table: Dict[str, Any],
+    table_idx: int,
+    page_text_index: Dict[int, str],
+    document: Dict[str, Any],
+    table_patterns: List[Dict],
+    header_matcher: 'HeaderMatcher',
+    assigned_entities: set,
+    all_entity_records: Dict[str, List[Dict[str, Any]]],
+    context
+):
+    """Identify a single table and append its records to the matching entity."""
+    artifact = document['artifact']
+    table_data = table.get('data', [])
+    page_number = table.get('page', 0)
+
+    if len(table_data) < 2:
+        context.log.debug(f"Skipping table {table_idx + 1} (too small: {len(table_data)} rows)")
+        return
+
+    # Identify which NABCA table this is (with title-based and page-based matching)
+    identified_pattern = identify_nabca_table(table_data, table_patterns, assigned_entities, page_number, page_text_index, context, header_matcher)
+
+    if not identified_pattern:
+        context.log.debug(f"Table {table_idx + 1} (page {page_number}): Could not identify (skipping)")
+        return
+
+    entity_name = identified_pattern['entityName']
+    table_name = identified_pattern['tableName']
+
+    # Track assigned entity for sequential matching
+    assigned_entities.add(entity_name)
+    confidence = identified_pattern.get('confidence', 0)
+
+    context.log.info(f"✅ Table {table_idx + 1} (page {page_number}): Identified as '{table_name}' → {entity_name} (confidence: {confidence:.2f})")
+
+    # Extract data using pattern
+    records = extract_table_data_multi_entity(
+        table_data,
+        identified_pattern,
+        document['report_month'],
+        document['report_year'],
+        artifact,
+        context
+    )
+
+    all_entity_records[entity_name].extend(records)
+    context.log.info(f"   → Extracted {len(records)} records for {entity_name}")
+
+
+def run_textract_jobs(textract_client, documents: List[Dict[str, Any]], max_concurrent: int, context, max_wait: int = 7200):
+    """
+    Run Textract analyses for many PDFs concurrently.
+
+    Keeps up to max_concurrent jobs in flight and polls them all from one
+    loop, backing off while nothing finishes. Yields (document, job_id, error)
+    as soon as each job completes, so parsing overlaps with the remaining jobs.
+    """
+    import time
+    from collections import deque
+
+    queue = deque(documents)
+    in_flight = {}  # job_id -> (document, started_at)
+    poll_interval = TEXTRACT_POLL_MIN_SECONDS
+
+    while queue or in_flight:
+        # Top up to the concurrency cap
+        while queue and len(in_flight) < max(1, max_concurrent):
+            document = queue.popleft()
+            try:
+                job_id = start_textract_job(textract_client, document['s3_bucket'], document['s3_key'])
+            except Exception as e:
+                if is_textract_throttle(e) and in_flight:
+                    # Service-side limit reached: retry once a running job frees a slot
+                    queue.appendleft(document)
+                    break
+                yield (document, None, e)
+                continue
+
+            in_flight[job_id] = (document, time.monotonic())
+            context.log.info(f"⏳ Textract job {job_id} started for {document['artifact'].get('original_filename', document['artifact']['id'])}")
+
+        if not in_flight:
+            continue
+
+        time.sleep(poll_interval)
+        any_finished = False
+
+        for job_id, (document, started_at) in list(in_flight.items()):
+            try:
+                # MaxResults=1: status check only, blocks are paged afterwards
+                status_response = textract_client.get_document_analysis(JobId=job_id, MaxResults=1)
+            except Exception as e:
+                if is_textract_throttle(e):
+                    continue
+                del in_flight[job_id]
+                yield (document, None, e)
+                continue
+
+            status = status_response['JobStatus']
+            elapsed = time.monotonic() - started_at
+
+            if status == 'SUCCEEDED':
+                del in_flight[job_id]
+                any_finished = True
+                context.log.info(f"✅ Textract job {job_id} completed after {elapsed:.0f}s ({elapsed/60:.1f} min)")
+                yield (document, job_id, None)
+            elif status == 'FAILED':
+                del in_flight[job_id]
+                any_finished = True
+                yield (document, None, Exception(f"Textract job failed: {status_response.get('StatusMessage')}"))
+            elif elapsed > max_wait:
+                del in_flight[job_id]
+                any_finished = True
+                yield (document, None, Exception(f"Textract job timed out after {max_wait}s"))
+
+        # Poll quickly after progress, back off while everything is still running
+        if any_finished:
+            poll_interval = TEXTRACT_POLL_MIN_SECONDS
+        else:
+            poll_interval = min(poll_interval * 1.5, TEXTRACT_POLL_MAX_SECONDS)
+            context.log.info(f"⏳ {len(in_flight)} Textract jobs running, {len(queue)} queued")
+
+
+def start_textract_job(textract_client, s3_bucket: str, s3_key: str) -> str:
+    """Start an async Textract analysis (entire PDF) and return its job ID."""
+    textract_response = textract_client.start_document_analysis(
+        DocumentLocation={'S3Object': {'Bucket': s3_bucket, 'Name': s3_key}},
+        FeatureTypes=TEXTRACT_FEATURE_TYPES
+    )
+    return textract_response['JobId']
+
+
+def is_textract_throttle(error: Exception) -> bool:
+    """True for Textract rate/concurrency limit errors (safe to retry later)."""
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code', '')
+    return code in ('ThrottlingException', 'ProvisionedThroughputExceededException', 'LimitExceededException')
+
+
+def iter_textract_blocks(textract_client, job_id: str, context) -> Iterator[Dict[str, Any]]:
+    """Page through a completed Textract job, yielding blocks one result page at a time."""
+    context.log.info(f"📦 Streaming Textract blocks for job {job_id}...")
+    next_token = None
+    page_count = 0
+    block_count = 0
+
+    while True:
+        kwargs = {'JobId': job_id}
+        if next_token:
+            kwargs['NextToken'] = next_token
+
+        response = textract_client.get_document_analysis(**kwargs)
+        blocks = response.get('Blocks', [])
+        next_token = response.get('NextToken')
+        page_count += 1
+        block_count += len(blocks)
+
+        yield from blocks
+        del response, blocks
+
+        if page_count % 10 == 0:
+            context.log.info(f"   Retrieved {page_count} pages of blocks...")
+        if not next_token:
+            break
+
+    context.log.info(f"✅ Retrieved {block_count} total blocks from {page_count} result pages")
+
+
+def compact_textract_blocks(blocks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Strip Textract blocks down to what table reconstruction needs.
+
+    Drops geometry, confidence and block types other than TABLE/CELL/WORD/LINE,
+    and keeps only CHILD relationships.
+    """
+    for block in blocks:
+        if block.get('BlockType') not in TEXTRACT_KEPT_BLOCK_TYPES:
+            continue
+
+        compact = {field: block[field] for field in TEXTRACT_KEPT_BLOCK_FIELDS if field in block}
+
+        if 'Relationships' in compact:
+            compact['Relationships'] = [
+                {'Type': 'CHILD', 'Ids': rel['Ids']}
+                for rel in compact['Relationships'] if rel.get('Type') == 'CHILD'
+            ]
+
+        yield compact
+
+
+def iter_textract_pages(blocks: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Group a block stream into (page_number, blocks) per document page.
+
+    Textract returns blocks in page order, so a page is complete as soon as
+    a block from the next page arrives.
+    """
+    current_page = None
+    page_blocks = []
+
+    for block in blocks:
+        page = block.get('Page', 0)
+        if page != current_page and page_blocks:
+            yield (current_page, page_blocks)
+            page_blocks = []
+        current_page = page
+        page_blocks.append(block)
+
+    if page_blocks:
+        yield (current_page, page_blocks)
+
+
+def s3_object_content_id(s3_client, bucket: str, key: str, context) -> Optional[str]:
+    """
+    Content identifier of an S3 object for the Textract cache, without downloading it.
+
+    One HEAD request: the SHA-256 recorded in the object's metadata at upload
+    time if present, otherwise ETag + size + LastModified (a multipart ETag
+    is not a content hash, so it is never used alone). Returns None if HEAD
+    fails; the caller then bypasses the cache rather than guess.
+    """
+    try:
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+    except Exception as e:
+        context.log.warning(f"HEAD failed for s3://{bucket}/{key}, skipping Textract cache: {str(e)}")
+        return None
+
+    sha256 = (head.get('Metadata') or {}).get('sha256')
+    if sha256:
+        return sha256
+
+    etag = (head.get('ETag') or '').strip('"')
+    last_modified = head.get('LastModified')
+    if not etag or last_modified is None:
+        context.log.warning(f"No ETag/LastModified for s3://{bucket}/{key}, skipping Textract cache")
+        return None
+
+    # Prefixed so object-version keys never collide with SHA-256 keys
+    return f"s3-{etag}-{head.get('ContentLength', 0)}-{int(last_modified.timestamp())}"
+
+
+def textract_cache_key(pdf_content_id: str, feature_types: List[str]) -> str:
+    """Cache key for a Textract result: PDF content id (SHA-256 or S3 version) + analysis features."""
+    return f"{pdf_content_id}-{'_'.join(sorted(feature_types)).lower()}"
+
+
+class TextractResultCache:
+    """
+    Content-addressed cache of Textract block streams.
+
+    Stored as gzip-compressed JSON lines (one list of blocks per line) under
+    TEXTRACT_CACHE_S3_URI (s3://bucket/prefix) if set, otherwise on local
+    disk under TEXTRACT_CACHE_DIR (default: $DAGSTER_HOME/textract_cache).
+    """
+
+    BLOCKS_PER_LINE = 1000
+
+    def __init__(self, s3_client, context):
+        self.s3_client = s3_client
+        self.context = context
+        self.hits = 0
+        self.misses = 0
+
+        s3_uri = os.getenv("TEXTRACT_CACHE_S3_URI", "")
+        if s3_uri.startswith("s3://"):
+            bucket, _, prefix = s3_uri[len("s3://"):].partition("/")
+            self.s3_bucket = bucket
+            self.s3_prefix = prefix.strip("/")
+            self.cache_dir = None
+        else:
+            self.s3_bucket = None
+            self.s3_prefix = None
+            self.cache_dir = os.getenv("TEXTRACT_CACHE_DIR") or os.path.join(
+                os.getenv("DAGSTER_HOME", "."), "textract_cache"
+            )
+
+    def _s3_key(self, key: str) -> str:
+        return f"{self.s3_prefix}/{key}.jsonl.gz" if self.s3_prefix else f"{key}.jsonl.gz"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.jsonl.gz")
+
+    def open(self, key: str) -> Optional[Iterator[Dict[str, Any]]]:
+        """Return a lazy iterator over cached blocks, or None on a miss."""
+        try:
+            if self.s3_bucket:
+                response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self._s3_key(key))
+                stream = gzip.GzipFile(fileobj=response['Body'])
+            elif os.path.exists(self._path(key)):
+                stream = gzip.open(self._path(key), 'rb')
+            else:
+                self.misses += 1
+                return None
+        except Exception as e:
+            # NoSuchKey or unreadable entry: treat as a miss
+            self.context.log.debug(f"Textract cache miss for {key}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._read_lines(stream)
+
+    def _read_lines(self, stream) -> Iterator[Dict[str, Any]]:
+        with stream:
+            for line in stream:
+                yield from json.loads(line)
+
+    def tee(self, key: str, blocks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield blocks unchanged while writing them to the cache.
+
+        The entry is only published once the stream has been fully consumed,
+        so an interrupted run never leaves a truncated result behind.
+        """
+        import tempfile
+
+        tmp = None
+        try:
+            if not self.s3_bucket:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.jsonl.gz', dir=self.cache_dir)
+            os.close(fd)
+            tmp = gzip.open(tmp_path, 'wb')
+        except Exception as e:
+            self.context.log.warning(f"Failed to open Textract cache entry {key}: {str(e)}")
+            tmp = None
+
+        line = []
+        block_count = 0
+        try:
+            for block in blocks:
+                if tmp is not None:
+                    line.append(block)
+                    if len(line) >= self.BLOCKS_PER_LINE:
+                        tmp.write(json.dumps(line, separators=(',', ':')).encode('utf-8') + b'\\n')
+                        line = []
+                block_count += 1
+                yield block
+
+            if tmp is not None:
+                if line:
+                    tmp.write(json.dumps(line, separators=(',', ':')).encode('utf-8') + b'\\n')
+                tmp.close()
+                self._publish(key, tmp_path)
+                self.context.log.info(f"💾 Cached Textract result ({block_count} blocks) as {key}")
+                tmp = None
+        finally:
+            if tmp is not None:
+                tmp.close()
+                os.remove(tmp_path)
+
+    def _publish(self, key: str, tmp_path: str):
+        """Move a completed temp file into the cache; failures are logged, never raised."""
+        try:
+            if self.s3_bucket:
+                self.s3_client.upload_file(
+                    tmp_path, self.s3_bucket, self._s3_key(key),
+                    ExtraArgs={'ContentType': 'application/x-ndjson'}
+                )
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, self._path(key))  # atomic: no partial entries
+        except Exception as e:
+            self.context.log.warning(f"Failed to cache Textract result {key}: {str(e)}")
+
+
 def parse_textract_tables(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Parse Textract blocks into table structure with O(1) lookups. Includes page numbers for sequential matching."""
+    """
+    Parse Textract blocks into table structure with O(1) lookups. Includes page numbers for sequential matching.
+
+    One typed pass builds the WORD/CELL/TABLE lookups, grid bounds come from
+    the loop that collects each table's cells, each cell's words are joined
+    once, and repeated cell strings (blank cells, class names, "TOTAL") are
+    shared within the page instead of stored once per cell.
+    """
     tables = []
 
-    # PERFORMANCE: Build block ID lookup map once (O(n) instead of O(n²))
-    block_map = {b['Id']: b for b in blocks if 'Id' in b}
-
-    # Find all TABLE blocks
-    table_blocks = [b for b in blocks if b.get('BlockType') == 'TABLE']
+    # PERFORMANCE: One pass builds typed lookups (O(1) per id, no BlockType checks later)
+    word_text = {}
+    cell_map = {}
+    table_blocks = []
+    for block in blocks:
+        block_type = block.get('BlockType')
+        if block_type == 'WORD':
+            word_text[block['Id']] = block.get('Text', '')
+        elif block_type == 'CELL':
+            cell_map[block['Id']] = block
+        elif block_type == 'TABLE':
+            table_blocks.append(block)
+
+    get_cell = cell_map.get
+    get_word = word_text.get
+    shared_text = {}
 
     for table_block in table_blocks:
-        # Extract page number from table block
-        page_number = table_block.get('Page', 0)
+        # Find all CELL blocks for this table (with grid bounds in the same pass)
+        cells = []
+        max_row = 0
+        max_col = 0
+        for rel in table_block.get('Relationships', ()):
+            if rel['Type'] != 'CHILD':
+                continue
+            for cell_id in rel['Ids']:
+                cell_block = get_cell(cell_id)
+                if cell_block is not None:
+                    row = cell_block.get('RowIndex', 1)
+                    col = cell_block.get('ColumnIndex', 1)
+                    if row > max_row:
+                        max_row = row
+                    if col > max_col:
+                        max_col = col
+                    cells.append((row, col, cell_block.get('Relationships')))
+
+        if not cells:
+            continue
 
-        # Find all CELL blocks for this table
-        cell_blocks = []
-        if 'Relationships' in table_block:
-            for rel in table_block['Relationships']:
+        grid = [[''] * max_col for _ in range(max_row)]
+
+        for row, col, relationships in cells:
+            if not relationships:
+                continue
+
+            # Gather the cell's words and join once
+            words = []
+            for rel in relationships:
                 if rel['Type'] == 'CHILD':
-                    for cell_id in rel['Ids']:
-                        cell_block = block_map.get(cell_id)  # O(1) lookup
-                        if cell_block and cell_block.get('BlockType') == 'CELL':
-                            cell_blocks.append(cell_block)
+                    for word_id in rel['Ids']:
+                        word = get_word(word_id)
+                        if word is not None:
+                            words.append(word)
+            if words:
+                text = (words[0] if len(words) == 1 else ' '.join(words)).strip()
+                # Convert to 0-indexed
+                grid[row - 1][col - 1] = shared_text.setdefault(text, text)
 
-        # Build table grid
-        if not cell_blocks:
-            continue
+        tables.append({'data': grid, 'page': table_block.get('Page', 0)})
 
-        max_row = max(c.get('RowIndex', 0) for c in cell_blocks)
-        max_col = max(c.get('ColumnIndex', 0) for c in cell_blocks)
+    return tables
 
-        # Initialize grid
-        grid = [['' for _ in range(max_col)] for _ in range(max_row)]
 
-        # Fill grid
-        for cell in cell_blocks:
-            row = cell.get('RowIndex', 1) - 1  # Convert to 0-indexed
-            col = cell.get('ColumnIndex', 1) - 1
+def page_line_text(blocks: Iterable[Dict[str, Any]]) -> str:
+    """Uppercased text of all LINE blocks, in reading order (title matching input)."""
+    return ' '.join(
+        block.get('Text', '').upper()
+        for block in blocks
+        if block.get('BlockType') == 'LINE'
+    )
 
-            # Get cell text
-            cell_text = ''
-            if 'Relationships' in cell:
-                for rel in cell['Relationships']:
-                    if rel['Type'] == 'CHILD':
-                        for word_id in rel['Ids']:
-                            word_block = block_map.get(word_id)  # O(1) lookup
-                            if word_block and word_block.get('BlockType') == 'WORD':
-                                cell_text += word_block.get('Text', '') + ' '
 
-            grid[row][col] = cell_text.strip()
+def compile_table_patterns(patterns: List[Dict]) -> List[Dict]:
+    """
+    Attach precomputed matchers to each table pattern.
 
-        tables.append({'data': grid, 'page': page_number})
+    _titleKeywords: uppercased title keywords, so identification does no
+    per-table string normalization.
 
-    return tables
+    Patterns may also set "naturalKey" (list of columns with a unique
+    constraint); their records are then upserted instead of replaced.
+    """
+    compiled = []
+    for pattern in patterns:
+        compiled.append({
+            **pattern,
+            '_titleKeywords': tuple(keyword.upper() for keyword in pattern.get('titleKeywords', [])),
+        })
+    return compiled
 
 
-def identify_nabca_table(table_data: List[List[str]], patterns: List[Dict], assigned_entities: set, page_number: int, all_blocks: List[Dict], context) -> Optional[Dict]:
+def identify_nabca_table(table_data: List[List[str]], patterns: List[Dict], assigned_entities: set, page_number: int, page_text_index: Dict[int, str], context, matcher: Optional['HeaderMatcher'] = None) -> Optional[Dict]:
     """
     Identify which NABCA table this is based on header matching and title keywords.
     Uses title-based disambiguation for patterns with identical headers (Tables 2-4, 6-7).
@@ -1200,27 +1671,29 @@ def identify_nabca_table(table_data: List[List[str]], patterns: List[Dict], assi
     - Table 4: "ROLLING 12 MONTH" + "CASE SALES"
     - Table 6: "TOP 100" + "VENDORS"
     - Table 7: "TOP 20" + "VENDORS" + "BY CLASS"
-    """
-    from difflib import SequenceMatcher
-
-    # Extract LINE blocks for this page (for title matching)
-    page_lines = []
-    for block in all_blocks:
-        if block.get('BlockType') == 'LINE' and block.get('Page') == page_number:
-            line_text = block.get('Text', '').upper()
-            page_lines.append(line_text)
 
-    page_text = ' '.join(page_lines)
+    page_text_index maps page number -> uppercased LINE text (page_line_text),
+    built once per page by the caller rather than rescanned per table.
+    The returned match carries headerRowIndex so extraction can reuse it.
+    """
+    # Page text for title matching (precomputed once per page)
+    page_text = page_text_index.get(page_number, '')
     context.log.debug(f"Page {page_number} text preview: {page_text[:200]}...")
 
+    if matcher is None:
+        matcher = HeaderMatcher(patterns)
+
     best_match = None
     best_score = 0.0
 
-    for pattern in patterns:
-        # Find header row (position-agnostic)
-        header_row_idx = find_header_row(
+    # Patterns sharing no header tokens with the table are never fuzzy-scored
+    for pattern in matcher.candidate_patterns(table_data):
+        # Find header row (position-agnostic); the matched count from that
+        # row is the base confidence, so headers are only scored once
+        required_headers = pattern['requiredHeaders']
+        header_row_idx, matched_count = matcher.find_header_row(
             table_data,
-            pattern['requiredHeaders'],
+            required_headers,
             pattern.get('fuzzyThreshold', 0.75)
         )
 
@@ -1228,29 +1701,17 @@ def identify_nabca_table(table_data: List[List[str]], patterns: List[Dict], assi
             continue
 
         # Calculate base confidence score from header matching
-        headers = table_data[header_row_idx]
-        required_headers = pattern['requiredHeaders']
-
-        matched_count = 0
-        for required_header in required_headers:
-            for header in headers:
-                if not header:
-                    continue
-
-                similarity = SequenceMatcher(None, header.lower(), required_header.lower()).ratio()
-                if similarity >= pattern.get('fuzzyThreshold', 0.75):
-                    matched_count += 1
-                    break
-
         score = matched_count / len(required_headers) if required_headers else 0
 
         # TITLE-BASED DISAMBIGUATION: Check if title keywords match
-        title_keywords = pattern.get('titleKeywords', [])
+        title_keywords = pattern.get('_titleKeywords')
+        if title_keywords is None:
+            title_keywords = tuple(keyword.upper() for keyword in pattern.get('titleKeywords', []))
         title_match_boost = 0.0
 
         if title_keywords:
             # Check if ALL title keywords are present in page text
-            keywords_matched = sum(1 for keyword in title_keywords if keyword.upper() in page_text)
+            keywords_matched = sum(1 for keyword in title_keywords if keyword in page_text)
             if keywords_matched == len(title_keywords):
                 # All keywords matched - strong boost to confidence
                 title_match_boost = 0.3
@@ -1279,89 +1740,220 @@ def identify_nabca_table(table_data: List[List[str]], patterns: List[Dict], assi
     return None
 
 
-def find_header_row(table_data: List[List[str]], required_headers: List[str], fuzzy_threshold: float) -> int:
+def find_header_row(table_data: List[List[str]], required_headers: List[str], fuzzy_threshold: float, matcher: Optional['HeaderMatcher'] = None) -> int:
     """
     Find the row that contains the headers (position-agnostic).
     Port of TypeScript findHeaderRow() function.
     """
-    from difflib import SequenceMatcher
+    if matcher is None:
+        matcher = HeaderMatcher()
 
-    for row_idx, row in enumerate(table_data[:10]):  # Check first 10 rows only
-        matched_count = 0
+    header_row_idx, _ = matcher.find_header_row(table_data, required_headers, fuzzy_threshold)
+    return header_row_idx
 
-        for required_header in required_headers:
+
+class HeaderMatcher:
+    """
+    Fuzzy header matching engine for NABCA table identification.
+
+    - Header strings are normalized once (lowercase, single-spaced)
+    - SequenceMatcher scores are memoized per (cell, required header), with
+      the cheap real_quick_ratio/quick_ratio upper bounds tried first
+    - An inverted token index maps header tokens to patterns, so patterns
+      sharing no token with a table's candidate header rows are skipped
+      before any fuzzy scoring
+    """
+
+    HEADER_SCAN_ROWS = 10  # Check first 10 rows only
+    HEADER_MATCH_RATIO = 0.7  # 70% of required headers must match
+    MAX_CACHE_ENTRIES = 200000
+
+    def __init__(self, patterns: Optional[List[Dict]] = None):
+        self.patterns = patterns or []
+        # (cell, required header) -> (score, exact); inexact scores are upper bounds
+        self._similarity: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+        self._normalized: Dict[str, str] = {}
+
+        # token -> indexes of patterns with a required header containing it
+        self._token_index: Dict[str, set] = {}
+        for pattern_idx, pattern in enumerate(self.patterns):
+            for header in pattern.get('requiredHeaders', []):
+                for token in self.normalize(header).split():
+                    self._token_index.setdefault(token, set()).add(pattern_idx)
+
+    def normalize(self, text: str) -> str:
+        """Lowercase, whitespace-collapsed header text (memoized)."""
+        normalized = self._normalized.get(text)
+        if normalized is None:
+            normalized = ' '.join(text.lower().split())
+            self._normalized[text] = normalized
+        return normalized
+
+    def candidate_patterns(self, table_data: List[List[str]]) -> List[Dict]:
+        """Patterns with at least one required-header token in the header scan rows."""
+        if not self._token_index:
+            return list(self.patterns)
+
+        candidates = set()
+        for row in table_data[:self.HEADER_SCAN_ROWS]:
             for cell in row:
                 if not cell:
                     continue
+                for token in self.normalize(cell).split():
+                    candidates |= self._token_index.get(token, set())
+
+        return [pattern for idx, pattern in enumerate(self.patterns) if idx in candidates]
+
+    def is_match(self, cell: str, required_header: str, fuzzy_threshold: float) -> bool:
+        """True if normalized cell/header similarity reaches the threshold."""
+        key = (self.normalize(cell), self.normalize(required_header))
+        cached = self._similarity.get(key)
 
-                similarity = SequenceMatcher(None, cell.lower(), required_header.lower()).ratio()
-                if similarity >= fuzzy_threshold:
+        if cached is not None:
+            score, exact = cached
+            if exact or score < fuzzy_threshold:
+                return score >= fuzzy_threshold
+
+        if len(self._similarity) >= self.MAX_CACHE_ENTRIES:
+            self._similarity.clear()
+
+        matcher = SequenceMatcher(None, key[0], key[1])
+
+        # Upper bounds are cheap; skip the full ratio when they already fail
+        for bound in (matcher.real_quick_ratio(), matcher.quick_ratio()):
+            if bound < fuzzy_threshold:
+                self._similarity[key] = (bound, False)
+                return False
+
+        score = matcher.ratio()
+        self._similarity[key] = (score, True)
+        return score >= fuzzy_threshold
+
+    def row_match_count(self, row: List[str], required_headers: List[str], fuzzy_threshold: float) -> int:
+        """Number of required headers matched by some non-empty cell in the row."""
+        matched_count = 0
+        for required_header in required_headers:
+            for cell in row:
+                if cell and self.is_match(cell, required_header, fuzzy_threshold):
                     matched_count += 1
                     break
+        return matched_count
 
-        # If we matched most required headers, this is the header row
-        if matched_count >= len(required_headers) * 0.7:  # 70% threshold
-            return row_idx
+    def find_header_row(self, table_data: List[List[str]], required_headers: List[str], fuzzy_threshold: float) -> Tuple[int, int]:
+        """Return (header row index, matched header count), or (-1, 0) if not found."""
+        for row_idx, row in enumerate(table_data[:self.HEADER_SCAN_ROWS]):
+            matched_count = self.row_match_count(row, required_headers, fuzzy_threshold)
 
-    return -1  # Not found
+            # If we matched most required headers, this is the header row
+            if matched_count >= len(required_headers) * self.HEADER_MATCH_RATIO:
+                return (row_idx, matched_count)
 
+        return (-1, 0)  # Not found
 
-def clean_cell_value(value: Any, field_name: str, field_type: str, context) -> Any:
+
+# Precompiled OCR cleanup patterns for NUMBER fields
+NUMERIC_PART_RE = re.compile(r'^-?\\d+\\.?\\d*$')
+ALPHA_ONLY_RE = re.compile(r'^[A-Za-z]+$')
+BARE_DECIMAL_RE = re.compile(r'^\\.[0-9]+$')
+
+# Fix categories reported by clean_column
+FIX_SPACE_SEPARATED = 'space_separated'
+FIX_REJECTED_INVALID = 'rejected_invalid'
+FIX_REJECTED_TEXT = 'rejected_text'
+FIX_MALFORMED_DECIMAL = 'fixed_decimal'
+FIX_REJECTED_MALFORMED = 'rejected_malformed'
+
+
+def clean_number(value_str: str) -> tuple:
+    """
+    Clean one stripped, non-empty NUMBER value.
+
+    Returns:
+        tuple: (cleaned value or None, fix category or None if already clean)
+    """
+    # Fast path: starts like a number and has no spaces -> only strip commas
+    first = value_str[0]
+    if (first.isdigit() or first == '-') and ' ' not in value_str:
+        return (value_str.replace(',', '') if ',' in value_str else value_str, None)
+
+    # Check if value contains spaces (likely merged cells)
+    if ' ' in value_str:
+        # Extract first valid number
+        for part in value_str.split():
+            cleaned = part.replace(',', '')
+            if NUMERIC_PART_RE.match(cleaned):
+                return (cleaned, FIX_SPACE_SEPARATED)
+
+        # No valid number found
+        return (None, FIX_REJECTED_INVALID)
+
+    # Check if value is purely alphabetic (text in numeric field)
+    if ALPHA_ONLY_RE.match(value_str):
+        return (None, FIX_REJECTED_TEXT)
+
+    # Handle malformed decimals starting with . or :
+    if first == '.' or first == ':':
+        # Try to fix common patterns (.00, .25, etc.)
+        if BARE_DECIMAL_RE.match(value_str):
+            return ('0' + value_str, FIX_MALFORMED_DECIMAL)
+
+        # Can't fix - reject
+        return (None, FIX_REJECTED_MALFORMED)
+
+    # Valid numeric value - clean commas
+    return (value_str.replace(',', ''), None)
+
+
+def clean_column(values: Iterable[Any], field_type: str) -> tuple:
     """
-    Clean cell values to handle Textract OCR quality issues.
+    Clean a whole table column to handle Textract OCR quality issues.
 
-    Common issues:
+    Common issues (NUMBER fields):
     - Space-separated values: "1 1", "49 49" -> Extract first number
-    - Text in numeric fields: "VISA", "NON" -> Return None
-    - Malformed decimals: ".00 .00", ":00" -> Return None
+    - Text in numeric fields: "VISA", "NON" -> None
+    - Malformed decimals: ".00 .00", ":00" -> None; ".25" -> "0.25"
+
+    Returns:
+        tuple: (cleaned values, {fix category: count})
     """
-    import re
+    cleaned = []
+    fix_counts: Dict[str, int] = {}
+    is_number = field_type == 'NUMBER'
 
-    if value is None or (isinstance(value, str) and not value.strip()):
-        return None
+    for value in values:
+        if value is None:
+            cleaned.append(None)
+            continue
 
-    value_str = str(value).strip()
-
-    # For NUMBER type fields, apply numeric cleaning
-    if field_type == 'NUMBER':
-        # Check if value contains spaces (likely merged cells)
-        if ' ' in value_str:
-            # Extract first valid number
-            parts = value_str.split()
-            for part in parts:
-                # Try to extract numeric value
-                match = re.match(r'^-?\\d+\\.?\\d*$', part.replace(',', ''))
-                if match:
-                    cleaned = part.replace(',', '')
-                    context.log.warning(f"⚠️  Cleaned space-separated value '{value_str}' -> '{cleaned}' for field '{field_name}'")
-                    return cleaned
-
-            # No valid number found
-            context.log.warning(f"⚠️  Rejecting invalid numeric value '{value_str}' for field '{field_name}'")
-            return None
+        value_str = value.strip() if isinstance(value, str) else str(value).strip()
+        if not value_str:
+            cleaned.append(None)
+            continue
 
-        # Check if value is purely alphabetic (text in numeric field)
-        if re.match(r'^[A-Za-z]+$', value_str):
-            context.log.warning(f"⚠️  Rejecting text value '{value_str}' in numeric field '{field_name}'")
-            return None
+        if not is_number:
+            # For TEXT fields, return as-is
+            cleaned.append(value_str)
+            continue
+
+        result, fix = clean_number(value_str)
+        if fix is not None:
+            fix_counts[fix] = fix_counts.get(fix, 0) + 1
+        cleaned.append(result)
+
+    return (cleaned, fix_counts)
 
-        # Handle malformed decimals starting with . or :
-        if value_str.startswith('.') or value_str.startswith(':'):
-            # Try to fix common patterns
-            if re.match(r'^\\.[0-9]+$', value_str):  # .00, .25, etc.
-                fixed_value = '0' + value_str
-                context.log.warning(f"⚠️  Fixed malformed decimal '{value_str}' -> '{fixed_value}' for field '{field_name}'")
-                return fixed_value
-            else:
-                # Can't fix - reject
-                context.log.warning(f"⚠️  Rejecting malformed numeric value '{value_str}' for field '{field_name}'")
-                return None
 
-        # Valid numeric value - clean commas
-        return value_str.replace(',', '')
+def clean_cell_value(value: Any, field_name: str, field_type: str, context) -> Any:
+    """
+    Clean a single cell value (see clean_column for the rules).
 
-    # For TEXT fields, return as-is
-    return value_str
+    Prefer clean_column for whole tables: it reports fix counts instead of
+    logging every change.
+    """
+    cleaned, fix_counts = clean_column([value], field_type)
+    for fix in fix_counts:
+        context.log.warning(f"⚠️  {fix.replace('_', ' ').capitalize()}: '{value}' -> '{cleaned[0]}' for field '{field_name}'")
+    return cleaned[0]
 
 
 def extract_table_data_multi_entity(
@@ -1379,7 +1971,10 @@ def extract_table_data_multi_entity(
     required_headers = pattern.get('requiredHeaders', [])
     fuzzy_threshold = pattern.get('fuzzyThreshold', 0.75)
 
-    header_row_idx = find_header_row(table_data, required_headers, fuzzy_threshold)
+    # Reuse the header row found during identification when available
+    header_row_idx = pattern.get('headerRowIndex')
+    if header_row_idx is None:
+        header_row_idx = find_header_row(table_data, required_headers, fuzzy_threshold)
     if header_row_idx == -1:
         context.log.warning(f"Could not find header row for {pattern.get('tableName')}")
         return []
@@ -1398,8 +1993,9 @@ def extract_table_data_multi_entity(
 
     context.log.debug(f"   Using positional mapping: {len(data_fields)} data fields + {len(metadata_fields)} metadata fields = {len(field_schema)} total")
 
-    # Extract records using POSITIONAL MAPPING (no fuzzy matching needed)
-    records = []
+    # Keep rows that can be mapped positionally
+    rows = []
+    mismatched_rows = 0
     for row in data_rows:
         # Skip empty rows
         if all(not cell or not str(cell).strip() for cell in row):
@@ -1407,30 +2003,34 @@ def extract_table_data_multi_entity(
 
         # Validate row length matches data fields (not including metadata)
         if len(row) != len(data_fields):
-            context.log.warning(f"   Skipping row with mismatched column count: expected {len(data_fields)} data columns, got {len(row)}")
+            mismatched_rows += 1
             continue
 
-        # POSITIONAL MAPPING: Map data fields to row positions
-        record = {}
-        row_idx = 0  # Track position in the actual table row
+        rows.append(row)
 
-        for field in field_schema:
-            field_name = field['name']
-            field_type = field.get('type', 'TEXT')
+    if mismatched_rows:
+        context.log.warning(f"   Skipped {mismatched_rows} rows with mismatched column count (expected {len(data_fields)} data columns)")
 
-            # Skip metadata fields (populated separately)
-            if field_name in ['report_month', 'report_year']:
-                continue
+    # Apply Textract OCR cleaning column by column (POSITIONAL MAPPING: column i -> data field i)
+    columns = list(zip(*rows))
+    cleaned_columns = []
+    fix_totals: Dict[str, int] = {}
 
-            # Get value from table row at current position
-            if row_idx < len(row):
-                value = row[row_idx]
+    for col_idx, field in enumerate(data_fields):
+        cleaned, fix_counts = clean_column(columns[col_idx] if columns else (), field.get('type', 'TEXT'))
+        cleaned_columns.append(cleaned)
+        for fix, count in fix_counts.items():
+            fix_totals[fix] = fix_totals.get(fix, 0) + count
 
-                # Apply Textract OCR cleaning
-                cleaned_value = clean_cell_value(value, field_name, field_type, context)
-                record[field_name] = cleaned_value
+    if fix_totals:
+        summary = ', '.join(f"{fix}={count}" for fix, count in sorted(fix_totals.items()))
+        context.log.warning(f"⚠️  OCR cleanup for {pattern.get('entityName')}: {summary}")
 
-                row_idx += 1  # Move to next column in table
+    # Extract records using POSITIONAL MAPPING (no fuzzy matching needed)
+    field_names = [field['name'] for field in data_fields]
+    records = []
+    for values in zip(*cleaned_columns):
+        record = dict(zip(field_names, values))
 
         # Add metadata
         if len(record) >= len(data_fields) * 0.4:  # At least 40% of data fields populated
@@ -1443,8 +2043,25 @@ def extract_table_data_multi_entity(
     return records
 
 
-def batch_insert_records(supabase, table_name: str, records: List[Dict], context) -> tuple:
-    """Insert records in batches with error handling."""
+def batch_insert_records(
+    supabase,
+    table_name: str,
+    records: List[Dict],
+    context,
+    conflict_columns: Optional[List[str]] = None,
+    replace_month: Optional[Tuple[str, str]] = None,
+) -> tuple:
+    """
+    Insert records in batches with error handling.
+
+    If conflict_columns (a natural key with a unique constraint) is given,
+    records are upserted on it so re-runs and Dagster retries are idempotent.
+    If replace_month (report_month, report_year) is given, that month's
+    existing rows are deleted in the same transaction as the COPY load.
+    This needs the COPY loader: PostgREST can't delete and insert atomically,
+    so there is no fallback and the error is raised instead.
+    A failing batch is bisected to isolate the bad rows (see write_bisecting).
+    """
     batch_size = 100
     loaded_count = 0
     failed_count = 0
@@ -1455,25 +2072,181 @@ def batch_insert_records(supabase, table_name: str, records: List[Dict], context
         clean_record = {k: v for k, v in record.items() if not k.startswith('_')}
         clean_records.append(clean_record)
 
+    if conflict_columns:
+        # One row per key (last wins): ON CONFLICT can't touch the same row twice in a statement
+        deduped = {tuple(record.get(c) for c in conflict_columns): record for record in clean_records}
+        if len(deduped) < len(clean_records):
+            context.log.info(f"    Collapsed {len(clean_records) - len(deduped)} duplicate {', '.join(conflict_columns)} rows")
+        clean_records = list(deduped.values())
+
+    replace_where = None
+    if replace_month:
+        replace_where = {"report_month": replace_month[0], "report_year": replace_month[1]}
+
+    # Fast path: COPY straight into Postgres when DATABASE_URL is configured
+    if copy_loader_available():
+        try:
+            from components.pg_loader import PostgresCopyLoader
+
+            with PostgresCopyLoader(logger=context.log) as loader:
+                loaded_count = loader.load(
+                    table_name, clean_records,
+                    conflict_columns=conflict_columns, replace_where=replace_where
+                )
+            if replace_month:
+                context.log.info(f"    🧹 Replaced existing {replace_month[0]} {replace_month[1]} rows")
+            return (loaded_count, failed_count)
+        except Exception as e:
+            if replace_where:
+                # Rolled back, the month's previous rows are intact
+                raise
+            context.log.warning(f"COPY load failed for {table_name}, falling back to PostgREST: {str(e)}")
+    elif replace_where:
+        raise RuntimeError(f"Replacing {replace_month[0]} {replace_month[1]} rows in {table_name} needs DATABASE_URL (COPY loader)")
+
+    on_conflict = ','.join(conflict_columns) if conflict_columns else None
+
+    def write(batch: List[Dict]) -> None:
+        if on_conflict:
+            supabase.table(table_name).upsert(batch, on_conflict=on_conflict).execute()
+        else:
+            supabase.table(table_name).insert(batch).execute()
+
     for i in range(0, len(clean_records), batch_size):
         batch = clean_records[i:i + batch_size]
 
         try:
-            response = supabase.table(table_name).insert(batch).execute()
+            write(batch)
             loaded_count += len(batch)
         except Exception as e:
-            context.log.error(f"Batch insert failed: {str(e)}")
+            context.log.error(f"Batch insert failed, bisecting {len(batch)} records: {str(e)}")
 
-            # Try one by one
-            for record in batch:
-                try:
-                    supabase.table(table_name).insert(record).execute()
-                    loaded_count += 1
-                except Exception as record_error:
-                    context.log.error(f"Failed to insert record: {str(record_error)}")
-                    failed_count += 1
+            mid = len(batch) // 2
+            for half in (batch[:mid], batch[mid:]):
+                loaded, failed = write_bisecting(write, half, context)
+                loaded_count += loaded
+                failed_count += failed
 
     return (loaded_count, failed_count)
+
+
+def write_bisecting(write, batch: List[Dict], context) -> tuple:
+    """
+    Write a batch, splitting it in half on failure until the bad rows are
+    isolated: k bad rows cost O(k log n) round trips instead of n.
+
+    Returns:
+        tuple: (loaded_count, failed_count)
+    """
+    if not batch:
+        return (0, 0)
+
+    try:
+        write(batch)
+        return (len(batch), 0)
+    except Exception as e:
+        if len(batch) == 1:
+            context.log.error(f"Failed to insert record: {str(e)}")
+            return (0, 1)
+
+    mid = len(batch) // 2
+    loaded_left, failed_left = write_bisecting(write, batch[:mid], context)
+    loaded_right, failed_right = write_bisecting(write, batch[mid:], context)
+    return (loaded_left + loaded_right, failed_left + failed_right)
+`;
+}
+
+/**
+ * Imports for the multi-entity NABCA module
+ */
+function generateMultiEntityImports(): string {
+  return `from dagster import (
+    asset,
+    AssetExecutionContext,
+    MaterializeResult,
+    MetadataValue,
+    MonthlyPartitionsDefinition,
+    RetryPolicy,
+)
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+import logging
+import traceback
+import re
+import os
+import gzip
+import json
+import hashlib
+from difflib import SequenceMatcher
+from datetime import datetime
+from components.pg_loader import copy_loader_available
+from components.resources import ClientsResource
+`;
+}
+
+/**
+ * Module constants for the multi-entity NABCA module (Textract tuning, monthly partitions)
+ */
+function generateMultiEntityConstants(): string {
+  return `
+# Textract analysis features (part of the result cache key)
+TEXTRACT_FEATURE_TYPES = ['TABLES']
+
+# Block fields/types kept when streaming Textract results (everything else is dropped)
+TEXTRACT_KEPT_BLOCK_FIELDS = ('Id', 'BlockType', 'Relationships', 'Text', 'Page', 'RowIndex', 'ColumnIndex')
+TEXTRACT_KEPT_BLOCK_TYPES = {'TABLE', 'CELL', 'WORD', 'LINE'}
+
+# Concurrent Textract jobs (override with TEXTRACT_MAX_CONCURRENT_JOBS)
+DEFAULT_TEXTRACT_MAX_CONCURRENT_JOBS = 8
+TEXTRACT_POLL_MIN_SECONDS = 5
+TEXTRACT_POLL_MAX_SECONDS = 60
+
+# Artifact columns read by the extraction asset
+NABCA_ARTIFACT_COLUMNS = "id, source_id, original_filename, file_path, metadata"
+
+# One partition per report month (key "YYYY-MM"); earliest month is overridable
+# with NABCA_PARTITION_START_MONTH
+NABCA_PARTITION_FORMAT = "%Y-%m"
+nabca_monthly_partitions = MonthlyPartitionsDefinition(
+    start_date=os.getenv("NABCA_PARTITION_START_MONTH", "2024-01"),
+    fmt=NABCA_PARTITION_FORMAT,
+)
+`;
+}
+
+/**
+ * Report-month partition helpers for the multi-entity NABCA module
+ */
+function generateReportPartitionHelpers(): string {
+  return `
+
+def report_partition_key(filename: str) -> Optional[str]:
+    """
+    Monthly partition key ("YYYY-MM") for a NABCA filename, or None if the
+    report date cannot be parsed.
+    """
+    month_name, year = parse_report_date_from_filename(filename)
+    if not month_name:
+        return None
+
+    month = datetime.strptime(month_name, "%B").month
+    return f"{year}-{month:02d}"
+
+
+def report_filename_pattern(partition_key: str) -> str:
+    """
+    ILIKE pattern matching every filename report_partition_key maps to
+    partition_key: "2025-01" -> "%0125%" (MMYY appears in each of them).
+    """
+    partition_date = datetime.strptime(partition_key, NABCA_PARTITION_FORMAT)
+    return f"%{partition_date:%m%y}%"
+
+
+def report_date_from_partition_key(partition_key: str) -> tuple:
+    """
+    Inverse of report_partition_key: "2025-01" -> ("January", "2025")
+    """
+    partition_date = datetime.strptime(partition_key, NABCA_PARTITION_FORMAT)
+    return (partition_date.strftime("%B"), str(partition_date.year))
 `;
 }
 
@@ -1516,7 +2289,7 @@ function generateExtractionAsset(
     compute_kind="extraction",
     retry_policy=RetryPolicy(max_retries=3),
 )
-def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
+def ${assetName}(context: AssetExecutionContext, clients: ClientsResource) -> Dict[str, Any]:
     """
     Extract ${entity.display_name || entity.name} data from source artifacts.
 
@@ -1526,14 +2299,8 @@ def ${assetName}(context: AssetExecutionContext) -> Dict[str, Any]:
     try:
         context.log.info(f"Starting extraction for ${entity.name}")
 
-        # Initialize Supabase client
-        from supabase import create_client
-        import os
-
-        supabase = create_client(
-            os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        )
+        # Shared, pooled Supabase client
+        supabase = clients.supabase()
 
         # Fetch source artifacts
         source_ids = ${JSON.stringify(config.source_ids)}
@@ -1629,12 +2396,7 @@ def extract_from_artifact(
             template_selectors = None
             if template_id:
                 try:
-                    from supabase import create_client
-                    import os
-                    supabase = create_client(
-                        os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-                        os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-                    )
+                    supabase = get_supabase_client()
                     template_response = supabase.table("templates").select("selectors").eq("id", template_id).single().execute()
                     if template_response.data and template_response.data.get("selectors"):
                         template_selectors = template_response.data["selectors"]
@@ -1871,6 +2633,7 @@ function generateLoadAsset(entity: Entity, fields: EntityField[], template: Temp
 )
 def ${assetName}(
     context: AssetExecutionContext,
+    clients: ClientsResource,
     ${transformAssetName}: Dict[str, Any]
 ) -> MaterializeResult:
     """
@@ -1882,14 +2645,8 @@ def ${assetName}(
     try:
         context.log.info(f"Starting load for ${entity.name}")
 
-        # Initialize Supabase client
-        from supabase import create_client
-        import os
-
-        supabase = create_client(
-            os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        )
+        # Shared, pooled Supabase client
+        supabase = clients.supabase()
 
         records = ${transformAssetName}["records"]
 
@@ -0,0 +1,19 @@
+-- Migration: Create extraction ledger for incremental pipeline runs
+-- Records which source items (S3 objects / artifacts) have already been
+-- extracted for a given (entity, template, source) so re-runs skip them
+
+CREATE TABLE IF NOT EXISTS extraction_ledger (
+  entity_id UUID NOT NULL,
+  template_id UUID NOT NULL,
+  source_id UUID NOT NULL,
+  item_key TEXT NOT NULL, -- S3 object key or artifact id
+  item_version TEXT NOT NULL, -- S3 ETag + LastModified, or artifact updated_at
+  records_extracted INTEGER DEFAULT 0,
+  processed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (entity_id, template_id, source_id, item_key)
+);
+
+-- Comments
+COMMENT ON TABLE extraction_ledger IS 'Source items already processed per (entity, template, source), used for incremental extraction';
+COMMENT ON COLUMN extraction_ledger.item_key IS 'S3 object key (s3_bucket sources) or artifact id (manual_upload sources)';
+COMMENT ON COLUMN extraction_ledger.item_version IS 'Change marker: "<ETag>@<LastModified>" for S3, updated_at for artifacts';
@@ -0,0 +1,18 @@
+-- Migration: Create AI extraction result cache
+-- Stores AI extraction API results keyed by document + template hash so
+-- re-runs don't send the same document to the LLM again
+-- (used when pipelines run with ai_cache = 'postgres')
+
+CREATE TABLE IF NOT EXISTS ai_extraction_cache (
+  key TEXT PRIMARY KEY, -- "<template hash prefix>:<SHA-256 of normalized document>"
+  record JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_extraction_cache_created_at ON ai_extraction_cache(created_at);
+CREATE INDEX IF NOT EXISTS idx_ai_extraction_cache_last_used_at ON ai_extraction_cache(last_used_at);
+
+-- Comments
+COMMENT ON TABLE ai_extraction_cache IS 'Cached AI extraction records (HTML/email), evicted by TTL and size';
+COMMENT ON COLUMN ai_extraction_cache.key IS 'Template fingerprint (fields, prompt, selectors) prefix + SHA-256 of the normalized document';
@@ -0,0 +1,32 @@
+-- Migration: Pipeline job queue for the persistent extraction worker
+-- run_extraction.py --worker claims queued pipeline_jobs rows with
+-- FOR UPDATE SKIP LOCKED, so jobs must carry their full run parameters
+
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  entity_id UUID NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued', -- queued, running, completed, failed, cancelled
+  progress_current INTEGER DEFAULT 0,
+  progress_total INTEGER DEFAULT 0,
+  progress_message TEXT,
+  result JSONB,
+  error TEXT,
+  created_by UUID,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  completed_at TIMESTAMPTZ
+);
+
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS template_id UUID;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS source_id UUID;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS artifact_type TEXT;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS options JSONB DEFAULT '{}'::jsonb;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS worker_id TEXT;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS started_at TIMESTAMPTZ;
+
+-- Claim order: oldest queued job first
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_queued ON pipeline_jobs(created_at) WHERE status = 'queued';
+
+-- Comments
+COMMENT ON COLUMN pipeline_jobs.options IS 'Extractor options for worker runs (streaming, load_batch_size, full_refresh, ai_*)';
+COMMENT ON COLUMN pipeline_jobs.worker_id IS 'Extraction worker that claimed the job ("<host>:<pid>")';
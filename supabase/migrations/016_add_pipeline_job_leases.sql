@@ -0,0 +1,14 @@
+-- Migration: Leases for pipeline jobs claimed by the extraction worker
+-- A worker refreshes heartbeat_at on its running jobs; a running job whose
+-- heartbeat is older than the lease (the worker crashed or was killed) is
+-- claimed again, up to a maximum number of claims, then marked failed
+
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS claim_count INTEGER NOT NULL DEFAULT 0;
+
+-- Expired-lease scan: running worker jobs by heartbeat
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_heartbeat ON pipeline_jobs(heartbeat_at) WHERE status = 'running';
+
+-- Comments
+COMMENT ON COLUMN pipeline_jobs.heartbeat_at IS 'Last heartbeat from the worker running the job (NULL for jobs run by a spawned process)';
+COMMENT ON COLUMN pipeline_jobs.claim_count IS 'Times a worker has claimed the job (> 1 after lease expiry)';